@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Query
+from datetime import datetime
+from typing import Literal
 from app.domain.price_logs.services.price_log_service import PriceLogService
-from fastapi.responses import StreamingResponse
-import json
+from app.api.streaming import json_response, json_array_response, encoded_json_array_response
 
 
 router = APIRouter()
@@ -9,66 +10,60 @@ price_service = PriceLogService()
 
 
 @router.post("/batch")
-async def log_prices():
+def log_prices():
     return price_service.log_prices()
 
 
 @router.post("/")
-async def log_price(product_id: str):
+def log_price(product_id: str):
     return price_service.log_price(product_id)
 
 
+@router.get("/export")
+async def export_prices(product_id: str | None = Query(None, description="Only export this product's logs")):
+    return encoded_json_array_response(price_service.export_price_logs_async(product_id))
+
+
 @router.get("/{product_id}/history")
 async def get_price_history(
     product_id: str,
     page: int = Query(1, ge=1, description="Page number"),
-    per_page: int = Query(20, ge=1, le=100, description="Items per page")
+    per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    after: str | None = Query(None, description="Continuation token from the previous page")
 ):
-    generator = price_service.yield_and_paginate_product_price_history(product_id, page, per_page)
+    documents, next_cursor = await price_service.find_product_price_history_page_async(
+        product_id, page, per_page, after
+    )
 
-    def stream_json_array():
-        yield b"["
-        first = True
+    return json_array_response(documents, next_cursor)
 
-        for document in generator:
-            if not first:
-                yield b","
-            else:
-                first = False
-            yield json.dumps(document).encode()
 
-        yield b"]"
-    return StreamingResponse(stream_json_array(), media_type="application/json")
+@router.get("/{product_id}/history/summary")
+async def get_price_history_summary(
+    product_id: str,
+    interval: Literal["hour", "day", "week"] = Query("day", description="Bucket size"),
+    start: datetime | None = Query(None, description="Start of the range (defaults to 30 buckets before end)"),
+    end: datetime | None = Query(None, description="End of the range (defaults to now)")
+):
+    return json_response(await price_service.summarize_price_history_async(product_id, interval, start, end))
 
 
 @router.get("/")
 async def get_all_prices(page: int = Query(1, ge=1, description="Page number"),
-                         per_page: int = Query(20, ge=1, le=100, description="Items per page")
+                         per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+                         after: str | None = Query(None, description="Continuation token from the previous page")
 ):
-    generator = price_service.yield_and_paginate_all_prices(page, per_page)
-
-    def stream_json_array():
-        yield b"["
-        first = True
-
-        for document in generator:
-            if not first:
-                yield b","
-            else:
-                first = False
-            yield json.dumps(document).encode()
-
-        yield b"]"
+    documents, next_cursor = await price_service.find_all_prices_page_async(page, per_page, after)
 
-    return StreamingResponse(stream_json_array(), media_type="application/json")
+    return json_array_response(documents, next_cursor)
 
 
 @router.delete("/{price_id}")
 async def delete_price(price_id: str):
-    price_service.delete_price(price_id)
+    await price_service.delete_price_async(price_id)
     return {"message": "Price deleted successfully"}
 
 @router.delete("/")
-async def delete_old_prices():
+def delete_old_prices():
     deleted = price_service.delete_old_price_logs()
     return {"message": f"{deleted} Prices deleted successfully"}
\ No newline at end of file
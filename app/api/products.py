@@ -1,39 +1,49 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from app.domain.products.schema import ProductCreate, ProductsCreateBatch, ProductsUpdateBatch
 from app.domain.products.services.product_service import ProductService
+from app.api.streaming import json_response
 
 router = APIRouter()
 products_service = ProductService()
 
 @router.post("/")
-async def add_product(data: ProductCreate):
+def add_product(data: ProductCreate):
     return products_service.add_product(data)
 
 @router.post("/batch")
-async def add_products(data: ProductsCreateBatch):
+def add_products(data: ProductsCreateBatch):
     return products_service.add_products(data)
 
 @router.get("/search")
 async def search_products(term):
-    return products_service.search_products_by_name(term)
+    return json_response(await products_service.search_products_by_name_async(term))
+
+@router.get("/cache/stats")
+def get_product_cache_stats():
+    return products_service.cache_stats()
 
 @router.get("/{product_id}")
 async def get_product(product_id: str):
-    return products_service.find_product(product_id)
+    return json_response(await products_service.find_product_async(product_id))
 
 @router.get("/")
-async def get_all_products(per_page: int):
-    return products_service.find_all_products(per_page)
+async def get_all_products(
+    per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    page: int = Query(1, ge=1, description="Page number"),
+    after: str | None = Query(None, description="Continuation token from the previous page")
+):
+    products, next_cursor = await products_service.find_all_products_async(per_page, page, after)
+    return json_response(products, next_cursor)
 
 @router.put("/{product_id}")
-async def update_product(product_id: str):
+def update_product(product_id: str):
     return products_service.replace_product(product_id)
 
 @router.put("/")
-async def update_products(data: ProductsUpdateBatch):
+def update_products(data: ProductsUpdateBatch):
     return products_service.bulk_replace_products(data)
 
 @router.delete("/{product_id}")
-async def delete_product(product_id: str):
+def delete_product(product_id: str):
     products_service.delete_product(product_id)
     return {"message": "Product deleted successfully"}
@@ -0,0 +1,55 @@
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from fastapi.responses import Response, StreamingResponse
+
+from app.shared.serializer import Serializer
+
+
+def stream_json_array(documents: Iterable[dict]) -> Iterator[bytes]:
+    """Encode documents one at a time into a JSON array."""
+    yield b"["
+    first = True
+
+    for document in documents:
+        if not first:
+            yield b","
+        else:
+            first = False
+        yield Serializer.dumps(document)
+
+    yield b"]"
+
+
+def json_response(content: Any, next_cursor: str | None = None) -> Response:
+    """
+    Encode a whole response body with orjson. Returning a Response skips FastAPI's jsonable_encoder pass,
+    which walks every value of a returned dict before ORJSONResponse gets to encode it.
+    """
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(Serializer.dumps(content), media_type="application/json", headers=headers)
+
+
+def json_array_response(documents: Iterable[dict], next_cursor: str | None = None) -> StreamingResponse:
+    """Stream documents as a JSON array, with the continuation token for the next page in X-Next-Cursor."""
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return StreamingResponse(stream_json_array(documents), media_type="application/json", headers=headers)
+
+
+async def stream_encoded_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Join documents that are already encoded as JSON into a JSON array."""
+    yield b"["
+    first = True
+
+    async for chunk in chunks:
+        if not first:
+            yield b","
+        else:
+            first = False
+        yield chunk
+
+    yield b"]"
+
+
+def encoded_json_array_response(chunks: AsyncIterable[bytes]) -> StreamingResponse:
+    """Stream documents that are already encoded as JSON as one JSON array."""
+    return StreamingResponse(stream_encoded_json_array(chunks), media_type="application/json")
@@ -1,74 +1,52 @@
 from fastapi import APIRouter, Query
 from app.domain.subscribers.services.subscription_service import SubscriptionService
 from app.domain.subscribers.schemas import SubscriberData
-from fastapi.responses import StreamingResponse
-import json
+from app.api.streaming import json_response, json_array_response
 
 
 router = APIRouter()
 subscription_crud = SubscriptionService()
 
 @router.post("/products/{product_id}/subscribe")
-async def subscribe(product_id: str, data: SubscriberData):
+def subscribe(product_id: str, data: SubscriberData):
     subscription_crud.add_subscriber(product_id, data)
     return {"message": "Subscribed successfully. Please check your email for confirmation."}
 
 @router.post("/products/{product_id}/unsubscribe")
-async def unsubscribe(email_address: str, product_id: str):
+def unsubscribe(email_address: str, product_id: str):
     subscription_crud.remove_subscriber(email_address, product_id)
     return {"message": "Unsubscribed successfully. You will no longer receive updates."}
 
 
 @router.get("/subscribers/{email_address}")
 async def get_subscriber_by_email(email_address: str):
-    return subscription_crud.get_subscriber_by_email(email_address)
+    return json_response(await subscription_crud.get_subscriber_by_email_async(email_address))
 
 @router.get("/{subscriber_id}/subscribers")
 async def get_product_subscribers(
     product_id: str,
     page: int = Query(1, ge=1, description="Page number"),
-    per_page: int = Query(20, ge=1, le=100, description="Items per page")
+    per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    after: str | None = Query(None, description="Continuation token from the previous page")
 ):
-    generator = subscription_crud.yield_and_paginate_product_subscribers(product_id, page, per_page)
+    documents, next_cursor = await subscription_crud.find_product_subscribers_page_async(
+        product_id, page, per_page, after
+    )
 
-    def stream_json_array():
-        yield b"["
-        first = True
-
-        for document in generator:
-            if not first:
-                yield b","
-            else:
-                first = False
-            yield json.dumps(document).encode()
-
-        yield b"]"
-    return StreamingResponse(stream_json_array(), media_type="application/json")
+    return json_array_response(documents, next_cursor)
 
 
 @router.get("/")
 async def get_all_subscribers(page: int = Query(1, ge=1, description="Page number"),
-                         per_page: int = Query(20, ge=1, le=100, description="Items per page")
+                         per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+                         after: str | None = Query(None, description="Continuation token from the previous page")
 ):
-    generator = subscription_crud.yield_all_subscribers(page, per_page)
-
-    def stream_json_array():
-        yield b"["
-        first = True
-
-        for document in generator:
-            if not first:
-                yield b","
-            else:
-                first = False
-            yield json.dumps(document).encode()
-
-        yield b"]"
+    documents, next_cursor = await subscription_crud.find_all_subscribers_page_async(page, per_page, after)
 
-    return StreamingResponse(stream_json_array(), media_type="application/json")
+    return json_array_response(documents, next_cursor)
 
 
 @router.delete("/subscribers/{subscriber_id}")
-async def delete_subscriber(subscriber_id: str):
+def delete_subscriber(subscriber_id: str):
     subscription_crud.delete_subscriber(subscriber_id)
     return {"message": "Subscriber deleted successfully"}
\ No newline at end of file
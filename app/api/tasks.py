@@ -9,7 +9,7 @@ import json
 
 
 router = APIRouter()
-task_adapter = TaskAdapter()
+task_adapter = TaskAdapter.instance()
 task_monitor = TaskMonitoringService()
 
 
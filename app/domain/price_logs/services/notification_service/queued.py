@@ -1,4 +1,7 @@
-from app.infra.queues.enqueue import queue_price_change_notification
+from typing import Iterable, List
+from app.infra.queues.enqueue import queue_price_change_notification, queue_price_change_batches
+from app.infra.config import settings
+from app.shared.batching import chunked
 
 class NotificationDispatcher:
     @staticmethod
@@ -15,3 +18,7 @@ class NotificationDispatcher:
             product_link=price_change_data["product_link"]
         )
 
+    @staticmethod
+    def send_price_change_batches(change: dict, recipients: Iterable[dict]) -> List[str]:
+        """Queue one batch task per NOTIFICATION_BATCH_SIZE recipients of a price change, published in bulk."""
+        return queue_price_change_batches(chunked(recipients, settings.NOTIFICATION_BATCH_SIZE), **change)
@@ -48,4 +48,54 @@ def send_price_email_notification(self, notification_type, **kwargs):
 
     except Exception as exc:
         logger.error(f"Error sending {notification_type} notification: {str(exc)}")
-        raise
\ No newline at end of file
+        raise
+
+
+@celery_app.task(name="send_price_email_batch",
+                 bind=True,
+                 max_retries=2,
+                 default_retry_delay=60)
+
+def send_price_email_batch(self, recipients, sent_before=0, failed_before=None, **change):
+    """
+        Send one product's price change to a chunk of subscribers over pooled SMTP sessions.
+        Recipients the SMTP server could not be reached for are retried; the others are not resent.
+        If some are still unsent after the last retry, they are logged and the task fails,
+        so it shows up among the failed tasks that can be retried.
+        Args:
+            recipients (list): Dictionaries with each subscriber's 'to_email' and 'name'
+            sent_before (int): Messages sent by earlier attempts of this batch
+            failed_before (dict): Rejections recorded by earlier attempts, keyed by email address
+            **change: The price change fields of send_price_change_notification
+
+        Returns:
+            dict: Count of sent messages and rejections by email address
+        """
+    try:
+        outcomes, unsent = template.send_price_change_batch(recipients, **change)
+    except Exception as exc:
+        logger.error(f"Error sending price change batch for {change.get('product_name')}: {str(exc)}")
+        raise
+
+    failed = dict(failed_before or {})
+    failed.update({email: error for email, error in outcomes.items() if error})
+    sent = sent_before + sum(1 for error in outcomes.values() if error is None)
+
+    if unsent and self.request.retries < self.max_retries:
+        logger.warning(f"Retrying {len(unsent)} unsent price change emails for {change.get('product_name')}")
+        unsent_emails = set(unsent)
+        raise self.retry(kwargs={
+            **change,
+            "recipients": [recipient for recipient in recipients if recipient["to_email"] in unsent_emails],
+            "sent_before": sent,
+            "failed_before": failed
+        })
+
+    if unsent:
+        logger.error(
+            f"Dropping {len(unsent)} price change emails for {change.get('product_name')} "
+            f"after {self.request.retries} retries: {', '.join(unsent)}"
+        )
+        raise ConnectionError(f"Could not reach the SMTP server for {len(unsent)} price change emails, {sent} sent")
+
+    return {"sent": sent, "failed": failed}
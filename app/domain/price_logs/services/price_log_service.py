@@ -3,13 +3,19 @@ from bson import ObjectId
 
 from app.domain.price_logs.services.notification_service.queued import NotificationDispatcher
 from app.infra.db.adapters.price_log_adapter import PriceLogAdapter
-from app.shared.exceptions import URLNotFoundError
-from app.infra.scraping.kitchenaid_scraper import Scraper
+from app.infra.db.adapters.async_price_log_adapter import AsyncPriceLogAdapter
+from app.shared.exceptions import URLNotFoundError, InvalidDateRangeError
+from app.infra.db.price_aggregation import INTERVALS, to_utc, utc_now
+from app.infra.scraping.factory import build_scraper
+from app.infra.scraping.validator_cache import ValidatorCache
+from app.infra.cache.subscriber_index import get_subscriber_index
 from app.domain.products.services.product_service import ProductService
 from app.domain.price_logs.utils import PriceUtils
-from typing import Iterator
+from typing import Iterator, AsyncIterator, List, Dict, Tuple
 from app.infra.log_service import logger
+from app.infra.config import settings
 from app.shared.serializer import Serializer
+from app.shared.batching import chunked
 
 
 class PriceLogService:
@@ -17,12 +23,18 @@ class PriceLogService:
         """
         Initialize PriceLogService with database access, product CRUD operations, and scraper service.
         """
-        self.db = PriceLogAdapter()
+        self.db = PriceLogAdapter.instance()
         self.products = ProductService()
-        self.scraper = Scraper()
+        self.scraper = build_scraper(
+            validator_cache=ValidatorCache(
+                path=settings.SCRAPER_VALIDATOR_CACHE_PATH,
+                max_entries=settings.SCRAPER_VALIDATOR_CACHE_SIZE
+            )
+        )
         self.util = PriceUtils()
         self.serializer = Serializer()
         self.notifier = NotificationDispatcher()
+        self.subscribers = get_subscriber_index()
 
 
 
@@ -32,10 +44,22 @@ class PriceLogService:
         new= self.scraper.scrape_product({
                     "name": existing["name"],
                     "url": existing["url"]
-                })
+                }, conditional=True)
         if not new:
             raise URLNotFoundError(url=existing['url'])
 
+        if new["status"] == "not_modified":
+            data = {
+                "product_id": str(ObjectId(product_id)),
+                "previous_price": existing["price"],
+                "current_price": existing["price"],
+                "price_diff": 0.0,
+                "change_type": "No change",
+                "date_checked": new["date_checked"]
+            }
+            self.db.insert_price_log(data)
+            return self.serializer.json_serialize_doc(data)
+
         try:
             previous_price = self.util.parse_price(existing["price"])
             cleaned_new_price = self.util.validate_price_format(new["price"])
@@ -54,7 +78,13 @@ class PriceLogService:
 
             self.db.insert_price_log(data)
 
-            if not change["trigger"]:#event
+            if change["trigger"]:
+                self.products.update_prices([{
+                    "_id": ObjectId(product_id), "price": cleaned_new_price, "date_checked": data["date_checked"]
+                }])
+            self.scraper.confirm_validators(existing["url"])
+
+            if change["trigger"]:
                 date_str = data["date_checked"].strftime('%Y-%m-%d')
                 self.notify_subscribers(
                     product_id, previous_price, new_price, change["price_diff"], change["change_type"],
@@ -69,77 +99,216 @@ class PriceLogService:
 
     def notify_subscribers(
         self, product_id: str, previous_price: float, new_price: float, price_diff: float,
-        change_type: str, date_checked: str
+        change_type: str, date_checked: str, product: dict | None = None
             ):
+        """
+        Fan a price change out to every subscriber of the product in one streaming pass over the index.
+        Subscribers are sent the change in batch tasks of NOTIFICATION_BATCH_SIZE recipients.
+        """
+        if product is None:
+            product = self.products.find_product(product_id)
 
-        from app.domain.subscribers.services.subscription_service import SubscriptionService
-        subscribers = SubscriptionService()
+        change = {
+            "product_name": product['product_name'], "previous_price": previous_price,
+            "new_price": new_price, "price_diff": price_diff, "change_type": change_type,
+            "date_checked": date_checked, "product_link": product['url']
+        }
+        recipients = (
+            {"to_email": subscriber['email_address'], "name": subscriber['name']}
+            for subscriber in self.subscribers.yield_subscribers(product_id)
+        )
 
-        subscribers = list(subscribers.yield_product_subscribers(product_id))
-        logger.info(f"Found {len(subscribers)} subscribers for product {product_id}")
-        product = self.products.find_product(product_id)
+        task_ids = self.notifier.send_price_change_batches(change, recipients)
+        logger.info(f"Queued {len(task_ids)} notification batches for product {product_id}")
 
-        for subscriber in subscribers:
-            logger.info(f"Found {len(subscribers)} subscribers for product {product_id}")
 
-            price_change_data = {
-                "to_email": subscriber['email_address'], "name": subscriber['name'],
-                "product_name": product['product_name'], "previous_price": previous_price,
-                "new_price": new_price, "price_diff": price_diff, "change_type": change_type,
-                "date_checked": date_checked, "product_link": product['url']
-            }
+    def log_prices(self) -> dict:
+        """
+        Log prices for all products in one batch pipeline and return a summary.
+        Products are loaded in one query and scraped concurrently. Each chunk of results
+        is compared in memory, then written with one insert_many and one bulk price update.
+        """
+        products = self.products.find_products_for_pricing()
+        if not products:
+            return {"total_products": 0, "updated": 0, "errors": 0}
 
-            self.notifier.send_price_change_notification(price_change_data)
+        products_by_url = {product["url"]: product for product in products}
+        stats_before = self.scraper.connection_stats()
 
+        scraped_products = self.scraper.iter_scrape_products(
+            ({"name": product["name"], "url": product["url"]} for product in products),
+            conditional=True
+        )
 
-    def log_prices(self) -> dict:
-        """Log prices for all products and return a summary."""
         updated_count = 0
-        error_count = 0
-
-        product_ids = self.products.compile_product_ids()
-
-        for product_id in product_ids:
+        for chunk in chunked(scraped_products, settings.WRITE_BATCH_SIZE):
             try:
-                self.log_price(product_id)
-                updated_count += 1
+                updated_count += self.log_price_batch(chunk, products_by_url)
             except Exception as e:
-                logger.error(f"Failed to log price for product {product_id}: {str(e)}")
-                error_count += 1
+                logger.error(f"Failed to log a batch of {len(chunk)} prices: {str(e)}")
+
+        self.scraper.validators.save()
+        stats_after = self.scraper.connection_stats()
+        connections = {key: stats_after[key] - stats_before[key] for key in stats_after}
+        logger.info(
+            f"Price logging used {connections['connections_opened']} connections "
+            f"for {connections['requests']} requests"
+        )
 
         return {
-            "total_products": len(product_ids),
+            "total_products": len(products),
             "updated": updated_count,
-            "errors": error_count
+            "errors": len(products) - updated_count,
+            "connections": connections
         }
 
 
+    def log_price_batch(self, scraped_products: List[dict], products_by_url: Dict[str, dict]) -> int:
+        """
+        Compare a chunk of scraped products with their stored prices and write the results in bulk.
+        Page validators are only confirmed once the chunk's logs and prices are written.
+        Args:
+            scraped_products: Scraper results for the chunk
+            products_by_url: Stored products keyed by URL
+        Returns:
+            Number of price logs written
+        """
+        rows = [(new, products_by_url[new["url"]]) for new in scraped_products]
+
+        previous_prices = self.util.parse_prices([existing["price"] for _, existing in rows])
+        cleaned_new_prices = self.util.validate_price_formats([
+            existing["price"] if new["status"] == "not_modified" else new["price"]
+            for new, existing in rows
+        ])
+        new_prices = self.util.parse_prices(cleaned_new_prices)
+        changes = self.util.detect_changes(previous_prices, new_prices)
+
+        price_logs, price_updates, notifications, fetched_urls = [], [], [], []
+
+        for index, (new, existing) in enumerate(rows):
+            if not changes["valid"][index]:
+                logger.error(f"Failed to log price for product {existing['_id']}: unparseable price {new['price']}")
+                continue
+
+            data = {
+                "product_id": str(existing["_id"]),
+                "previous_price": existing["price"],
+                "current_price": cleaned_new_prices[index],
+                "price_diff": float(changes["price_diff"][index]),
+                "change_type": str(changes["change_type"][index]),
+                "date_checked": new["date_checked"]
+            }
+            price_logs.append(data)
+            if new["status"] != "not_modified":
+                fetched_urls.append(new["url"])
+
+            if changes["trigger"][index]:
+                price_updates.append({
+                    "_id": existing["_id"], "price": data["current_price"], "date_checked": data["date_checked"]
+                })
+                notifications.append((
+                    existing, float(previous_prices[index]), float(new_prices[index]),
+                    data["price_diff"], data["change_type"], data["date_checked"]
+                ))
+
+        inserted = self.db.insert_price_logs(price_logs)
+        self.products.update_prices(price_updates)
+        for url in fetched_urls:
+            self.scraper.confirm_validators(url)
+
+        for existing, previous_price, new_price, price_diff, change_type, date_checked in notifications:
+            try:
+                self.notify_subscribers(
+                    str(existing["_id"]), previous_price, new_price, price_diff,
+                    change_type, date_checked.strftime('%Y-%m-%d'), product=existing
+                )
+            except Exception as e:
+                logger.error(f"Failed to notify subscribers of product {existing['_id']}: {str(e)}")
+
+        return inserted
+
+
     def yield_product_price_history(self, product_id: str) -> Iterator[dict]:
         """Yield the price history for a specific product one by one."""
         return self.db.yield_product_price_history(product_id)
 
-    def yield_and_paginate_product_price_history(self, product_id: str, page: int, per_page: int) -> Iterator[dict]:
+    def yield_and_paginate_product_price_history(
+        self, product_id: str, page: int, per_page: int, after: str | None = None
+    ) -> Iterator[dict]:
         """Yield the price history for a specific product one by one."""
-        return self.db.yield_and_paginate_product_price_history(product_id, page, per_page)
+        return self.db.yield_and_paginate_product_price_history(product_id, page, per_page, after)
 
-    def yield_and_paginate_all_prices(self, page: int, per_page: int) -> Iterator[dict]:
+    def yield_and_paginate_all_prices(self, page: int, per_page: int, after: str | None = None) -> Iterator[dict]:
         """Yield all price logs across all products."""
-        return self.db.yield_and_paginate_all_price_logs(page, per_page)
+        return self.db.yield_and_paginate_all_price_logs(page, per_page, after)
 
     def delete_price(self, price_id: str) -> None:
         """Delete a price log entry by its ID."""
         self.db.delete_price(price_id)
 
+    @property
+    def async_db(self) -> AsyncPriceLogAdapter:
+        """Async adapter, created on first use so it binds to the running event loop."""
+        return AsyncPriceLogAdapter.instance()
+
+    async def find_product_price_history_page_async(
+        self, product_id: str, page: int, per_page: int, after: str | None = None
+    ) -> Tuple[List[dict], str | None]:
+        """Return a page of a product's price history and the next page token without blocking the event loop."""
+        return await self.async_db.find_product_price_history_page(product_id, page, per_page, after)
+
+    async def find_all_prices_page_async(
+        self, page: int, per_page: int, after: str | None = None
+    ) -> Tuple[List[dict], str | None]:
+        """Return a page of all price logs and the next page token without blocking the event loop."""
+        return await self.async_db.find_all_price_logs_page(page, per_page, after)
+
+    def export_price_logs_async(self, product_id: str | None = None) -> AsyncIterator[bytes]:
+        """Stream all price logs, or one product's, as encoded JSON documents."""
+        return self.async_db.export_price_logs(product_id)
+
+    async def summarize_price_history_async(
+        self, product_id: str, interval: str = "day", start: datetime | None = None, end: datetime | None = None
+    ) -> List[dict]:
+        """
+        Summarise a product's price history into hour, day or week buckets for charting.
+        Args:
+            product_id: The product to summarise.
+            interval: Bucket size, one of hour, day or week.
+            start: Start of the range. Defaults to 30 buckets before end.
+            end: End of the range. Defaults to now.
+        Returns:
+            One document per non-empty bucket with min, max, avg, first, last and count.
+        """
+        self.products.db.validate_obj_id(product_id, "Product")
+        end = to_utc(end) if end else utc_now()
+        start = to_utc(start) if start else end - 30 * INTERVALS[interval]
+        if start >= end:
+            raise InvalidDateRangeError(start=start.isoformat(), end=end.isoformat())
+
+        return await self.async_db.summarize_price_history(product_id, interval, start, end)
+
+    async def delete_price_async(self, price_id: str) -> None:
+        """Delete a price log entry by its ID without blocking the event loop."""
+        await self.async_db.delete_price(price_id)
+
+    def rollup_daily_prices(self) -> dict:
+        """Roll the price logs of closed days up into per-product daily summaries."""
+        rolled_up = self.db.rollup_daily_prices()
+        return self.serializer.json_serialize_doc(rolled_up)
+
     def delete_old_price_logs(self) -> str:
-        """Delete all price log entries older than 1 year ago."""
-        cutoff_date = datetime.now(timezone.utc) - timedelta(minutes=1)
-        # cutoff_date = datetime.now(timezone.utc) - timedelta(days=365)
-
-        result = self.db.price_logs.delete_many({
-            "date_checked": {"$lt": cutoff_date}
-        })
-        deleted_count = result.deleted_count
-        logger.info(f"{deleted_count} price logs deleted")
+        """
+        Delete price log entries older than the retention window (PRICE_LOG_RETENTION_DAYS).
+        Only logs already rolled up into price_daily are deleted, so long-term trends are kept.
+        """
+        rolled_up_until = self.db.rollup_watermark()
+        if rolled_up_until is None:
+            logger.warning("Skipping price log retention: daily prices have not been rolled up yet")
+            return "Deleted 0 prices"
+
+        cutoff_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=settings.PRICE_LOG_RETENTION_DAYS)
+        deleted_count = self.db.delete_price_logs_before(min(cutoff_date, rolled_up_until))
         return f"Deleted {deleted_count} prices"
 
 
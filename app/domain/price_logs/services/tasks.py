@@ -0,0 +1,28 @@
+from app.infra.queues.celery_app import celery_app
+from app.infra.log_service import logger
+
+
+@celery_app.task(name="rollup_daily_prices")
+def rollup_daily_prices():
+    """
+    Merge the price logs of every day closed since the last run into price_daily.
+    Returns:
+        dict: The range that was rolled up
+    """
+    from app.domain.price_logs.services.price_log_service import PriceLogService
+
+    rolled_up = PriceLogService().rollup_daily_prices()
+    logger.info(f"Daily price rollup finished: {rolled_up}")
+    return rolled_up
+
+
+@celery_app.task(name="delete_old_price_logs")
+def delete_old_price_logs():
+    """
+    Delete raw price logs that are past the retention window and already rolled up.
+    Returns:
+        str: Summary of the deletion
+    """
+    from app.domain.price_logs.services.price_log_service import PriceLogService
+
+    return PriceLogService().delete_old_price_logs()
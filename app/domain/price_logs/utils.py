@@ -1,4 +1,10 @@
 import re
+from typing import Sequence, Dict, List
+
+import numpy as np
+
+PRICE_PATTERN = re.compile(r'£\s*(\d+(?:\.\d{2})?)')
+
 
 class PriceUtils:
     def __init__(self):
@@ -15,7 +21,7 @@ class PriceUtils:
         if not value.strip().startswith("£"):
             raise ValueError("Price must start with '£'")
 
-        matches = re.findall(r'£\s*(\d+(?:\.\d{2})?)', value)
+        matches = PRICE_PATTERN.findall(value)
         if not matches:
             return value
 
@@ -44,3 +50,62 @@ class PriceUtils:
             "price_diff": price_diff,
             "change_type": change_type
         }
+
+    @staticmethod
+    def parse_prices(price_strs: Sequence[str | None]) -> np.ndarray:
+        """Parse many price strings into a float array, with NaN where a price is missing or malformed."""
+        if not len(price_strs):
+            return np.empty(0, dtype=np.float64)
+
+        cleaned = np.char.strip(np.char.replace(np.char.replace(
+            np.array([price or "" for price in price_strs], dtype=str), "£", ""), ",", ""))
+        try:
+            return np.where(cleaned == "", "nan", cleaned).astype(np.float64)
+        except ValueError:
+            parsed = np.full(len(cleaned), np.nan)
+            for index, price in enumerate(cleaned):
+                try:
+                    parsed[index] = float(price)
+                except ValueError:
+                    continue
+            return parsed
+
+    @staticmethod
+    def validate_price_formats(values: Sequence[str | None]) -> List[str | None]:
+        """Format many scraped prices like validate_price_format, with None where a price is invalid."""
+        formatted = []
+        for value in values:
+            try:
+                formatted.append(PriceUtils.validate_price_format(value))
+            except (AttributeError, ValueError):
+                formatted.append(None)
+        return formatted
+
+    @staticmethod
+    def detect_changes(previous_prices: np.ndarray, new_prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Compare arrays of previous and new prices in one pass.
+        Returns:
+            Columnar result with one entry per product:
+                valid: both prices parsed
+                trigger: the price moved
+                price_diff: absolute difference
+                percent_change: signed change relative to the previous price
+                change_type: "Rise", "Drop" or "No change"
+        """
+        previous_prices = np.asarray(previous_prices, dtype=np.float64)
+        new_prices = np.asarray(new_prices, dtype=np.float64)
+
+        valid = ~(np.isnan(previous_prices) | np.isnan(new_prices))
+        diff = np.round(np.where(valid, new_prices - previous_prices, 0.0), 2)
+
+        percent_change = np.full(diff.shape, np.nan)
+        np.divide(diff * 100, previous_prices, out=percent_change, where=valid & (previous_prices != 0))
+
+        return {
+            "valid": valid,
+            "trigger": diff != 0,
+            "price_diff": np.abs(diff),
+            "percent_change": percent_change,
+            "change_type": np.where(diff > 0, "Rise", np.where(diff < 0, "Drop", "No change"))
+        }
@@ -1,5 +1,6 @@
 
-from app.infra.queues.enqueue import queue_product_removed_notification
+from typing import Iterable, List
+from app.infra.queues.enqueue import queue_product_removed_notification, queue_product_removed_notifications
 
 
 class NotificationDispatcher:
@@ -9,4 +10,9 @@ class NotificationDispatcher:
             to_email=deleted_product_data["to_email"],
             name=deleted_product_data["name"],
             product_name=deleted_product_data["product_name"]
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def send_product_removed_notifications(deleted_products: Iterable[dict]) -> List[str]:
+        """Queue product removed notifications for many subscribers, published and audited in bulk."""
+        return queue_product_removed_notifications(deleted_products)
@@ -1,10 +1,14 @@
 from app.domain.products.services.notification_service.queued import NotificationDispatcher
 from app.infra.db.adapters.product_adapter import ProductAdapter
+from app.infra.db.adapters.async_product_adapter import AsyncProductAdapter
 from app.domain.products.schema import ProductCreate, ProductData, ProductsCreateBatch, ProductsUpdateBatch
-from app.shared.exceptions import DocsNotFoundError, FailedRequestError
-from app.infra.scraping.kitchenaid_scraper import Scraper
+from app.shared.exceptions import DocNotFoundError, DocsNotFoundError
+from app.infra.scraping.factory import build_scraper
+from app.infra.cache.product_cache import get_product_cache
+from app.infra.config import settings
 from app.shared.serializer import Serializer
-from typing import List, Dict
+from app.shared.batching import chunked
+from typing import List, Dict, Tuple
 
 from app.infra.log_service import logger
 
@@ -14,16 +18,17 @@ class ProductService:
         """
         Initialize ProductService with database access, scraping, and utility methods.
         """
-        self.db = ProductAdapter()
-        self.scraper = Scraper(timeout=30, max_retries=3)
+        self.db = ProductAdapter.instance()
+        self.scraper = build_scraper(timeout=30, max_retries=3)
         self.serializer = Serializer()
         self.notifier = NotificationDispatcher()
+        self.cache = get_product_cache()
 
 
 
     def find_product(self, product_id: str) -> Dict | None:
-        """Find a single product in the database by its ID."""
-        product = self.db.find_product(product_id)
+        """Find a single product by its ID, served from the product cache when possible."""
+        product = self.cache.find_product(product_id)
         return self.serializer.json_serialize_doc(product)
 
 
@@ -32,14 +37,38 @@ class ProductService:
         return self.db.search_products_by_name(search_term)
 
 
-    def find_all_products(self, per_page) -> List[Dict]:
+    def find_all_products(self, per_page, page: int = 1, after: str | None = None) -> List[Dict]:
         """Find all products in the database, sorted by product name."""
-        products = self.db.find_products_paginated(per_page)
+        products = self.db.find_products_paginated(per_page, page, after)
         if products:
             return self.serializer.json_serialize_docs(products)
         return []
 
 
+    @property
+    def async_db(self) -> AsyncProductAdapter:
+        """Async adapter, created on first use so it binds to the running event loop."""
+        return AsyncProductAdapter.instance()
+
+
+    async def find_product_async(self, product_id: str) -> Dict | None:
+        """Find a single product by its ID without blocking the event loop, served from the product cache when possible."""
+        product = await self.cache.find_product_async(product_id, lambda: self.async_db.find_product(product_id))
+        return self.serializer.json_serialize_doc(product)
+
+
+    async def search_products_by_name_async(self, search_term: str) -> List[Dict]:
+        """Search products by name without blocking the event loop."""
+        return await self.async_db.search_products_by_name(search_term)
+
+
+    async def find_all_products_async(
+        self, per_page, page: int = 1, after: str | None = None
+    ) -> Tuple[List[Dict], str | None]:
+        """Find a page of products, sorted by product name, and the next page token without blocking the event loop."""
+        return await self.async_db.find_products_paginated(per_page, page, after)
+
+
     def add_product(self, data: ProductCreate) -> dict:
         """Scrape a product from the given name and URL and insert it into the database."""
 
@@ -55,17 +84,22 @@ class ProductService:
 
 
     def add_products(self, data: ProductsCreateBatch) -> str:
-        """Scrape multiple products from a list and insert them into the database."""
+        """
+        Scrape multiple products from a list and insert them into the database.
+        Products are inserted in chunks as they are scraped rather than after the whole batch.
+        """
         products = data.products
         product_dicts = [product.model_dump() for product in products]
-        scraped_products = self.scraper.scrape_products(product_dicts)
+        scraped_products = self.scraper.iter_scrape_products(product_dicts)
 
-        validated_products = [
-            ProductData.model_validate(product).model_dump()
-            for product in scraped_products
-        ]
+        inserted = 0
+        for chunk in chunked(scraped_products, settings.WRITE_BATCH_SIZE):
+            validated_products = [
+                ProductData.model_validate(product).model_dump()
+                for product in chunk
+            ]
+            inserted += self.db.insert_products(validated_products)
 
-        inserted = self.db.insert_products(validated_products)
         return f"Inserted {inserted} products"
 
 
@@ -74,10 +108,28 @@ class ProductService:
         return self.db.compile_product_ids()
 
 
+    def find_products_for_pricing(self) -> List[Dict]:
+        """Load every product's name, URL and stored price in one query."""
+        return self.db.find_products_for_pricing()
+
+
+    def update_prices(self, updates: List[Dict]) -> int:
+        """Set the current price of many products in one bulk write."""
+        modified = self.db.bulk_update_prices(updates)
+        for update in updates:
+            self.cache.invalidate(str(update["_id"]))
+        return modified
+
+
+    def cache_stats(self) -> Dict:
+        """Return the product cache hit/miss counters for this process."""
+        return self.cache.stats()
+
+
     def replace_product(self, product_id: str) -> Dict:
         """Update or replace an existing product by re-scraping its data."""
 
-        existing = self.db.find_product(product_id)
+        existing = self.cache.find_product(product_id)
         new_document = self.scraper.scrape_product({
             "name": existing["name"],
             "url": existing["url"]
@@ -86,59 +138,80 @@ class ProductService:
         validated_update = ProductData.model_validate(new_document).model_dump()
 
         updated_data = self.db.replace_product(product_id, validated_update)
+        self.cache.invalidate(product_id, existing["url"])
         return self.serializer.json_serialize_doc(updated_data)
 
 
     def bulk_replace_products(self, data: ProductsUpdateBatch) -> str:
         """Bulk update fields for existing product documents."""
-        operations = []
+        existing_by_url = {}
 
         for product in data.products:
             try:
-                existing = self.db.find_product_by_url(product.url)
-                new_document = self.scraper.scrape_product({
-                    "name": existing["name"],
-                    "url": existing["url"]
-                })
+                existing = self.cache.find_product_by_url(product.url)
+                existing_by_url[existing["url"]] = existing
+
+            except (DocNotFoundError, DocsNotFoundError) as e:
+                logger.info(f"Skipping URL {product.url}: {e}")
+                continue
+
+        scraped_products = self.scraper.iter_scrape_products(
+            {"name": existing["name"], "url": existing["url"]}
+            for existing in existing_by_url.values()
+        )
 
+        updated_count = 0
+        for chunk in chunked(scraped_products, settings.WRITE_BATCH_SIZE):
+            operations = []
+            for new_document in chunk:
+                existing = existing_by_url[new_document["url"]]
                 validated = ProductData.model_validate(new_document).model_dump()
                 operations.append({
                     "filter": {"_id": existing["_id"]},
                     "replacement": validated
                 })
 
+            updated_count += self.db.bulk_replace_products(operations)
+            for operation in operations:
+                self.cache.invalidate(str(operation["filter"]["_id"]))
 
-            except (DocsNotFoundError, FailedRequestError) as e:
-                logger.info(f"Skipping URL {product.url}: {e}")
-                continue
-
-        updated_count = self.db.bulk_replace_products(operations)
         return f"Updated {updated_count} products" if updated_count > 0 else "Updated 0 products"
 
 
 
     def delete_product(self, product_id: str) -> None:
-        """Delete a product from the database, including its price history and subscriptions."""
+        """
+        Delete a product from the database, including its price history and subscriptions.
+        Subscribers are notified and removed one group at a time. If a group fails, the delete stops
+        before the product goes, so no subscriber is left pointing at a missing product and it can be retried.
+        """
         from app.domain.subscribers.services.subscription_service import SubscriptionService
         subscription_crud = SubscriptionService()
 
         obj_id = self.db.validate_obj_id(product_id, "Product")
-        self.db.price_logs.delete_many({"product_id": obj_id})
-        logger.info(f"Deleted price logs for product {product_id}")
 
         subscribers = subscription_crud.yield_product_subscribers(product_id)
-        for subscriber in subscribers:
+        for batch in chunked(subscribers, settings.WRITE_BATCH_SIZE):
             try:
-                deleted_product_data = {
-                    "to_email": subscriber['email_address'],
-                    "name": subscriber['name'],
-                    "product_name": subscriber['product_name']
-            }
-                self.notifier.send_product_removed_notification(deleted_product_data)
-
-
-                subscription_crud.delete_subscriber(subscriber["_id"])
+                self.notifier.send_product_removed_notifications(
+                    {
+                        "to_email": subscriber['email_address'],
+                        "name": subscriber['name'],
+                        "product_name": subscriber['product_name']
+                    }
+                    for subscriber in batch
+                )
+                subscription_crud.db.delete_subscribers([subscriber["_id"] for subscriber in batch])
             except Exception as e:
-                logger.error(f"Failed to notify or delete subscriber {subscriber['_id']}: {str(e)}")
+                logger.error(
+                    f"Stopped deleting product {product_id}, "
+                    f"could not notify or remove {len(batch)} of its subscribers: {str(e)}"
+                )
+                raise
+
+        self.db.price_logs.delete_many({"product_id": obj_id})
+        logger.info(f"Deleted price logs for product {product_id}")
 
         self.db.delete_product(product_id)
+        self.cache.invalidate(product_id)
+        subscription_crud.index.drop_product(product_id)
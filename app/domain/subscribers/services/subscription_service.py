@@ -1,6 +1,8 @@
 from app.domain.subscribers.services.notification_service.queued import\
     NotificationDispatcher
 from app.infra.db.adapters.subscriber_adapter import SubscriberAdapter
+from app.infra.db.adapters.async_subscriber_adapter import AsyncSubscriberAdapter
+from app.infra.cache.subscriber_index import get_subscriber_index
 from app.shared.exceptions import NotSubscribedError
 from app.shared.serializer import Serializer
 from app.domain.products.services.product_service import ProductService
@@ -12,10 +14,11 @@ class SubscriptionService:
         """
         Initialize SubscriptionCrud with database access, product management, and notification services.
         """
-        self.db = SubscriberAdapter()
+        self.db = SubscriberAdapter.instance()
         self.products = ProductService()
         self.notifier = NotificationDispatcher()
         self.util = Serializer()
+        self.index = get_subscriber_index()
 
 
     def serialize_document(self, document: dict | None) -> dict | None:
@@ -41,6 +44,7 @@ class SubscriptionService:
         subscriber_data["product_url"] = product["url"]
 
         self.db.insert_subscriber(subscriber_data)
+        self.index.add(product_id, subscriber_data)
         self.notifier.send_subscription_email(subscriber_data)
 
 
@@ -64,6 +68,28 @@ class SubscriptionService:
         return self.db.yield_and_paginate_all_subscribers(page, per_page)
 
 
+    @property
+    def async_db(self) -> AsyncSubscriberAdapter:
+        """Async adapter, created on first use so it binds to the running event loop."""
+        return AsyncSubscriberAdapter.instance()
+
+
+    async def get_subscriber_by_email_async(self, value: str):
+        """Find every subscription held by an email address without blocking the event loop."""
+        subscriber = await self.async_db.find_subscriber_by_email(value)
+        return self.serialize_documents(subscriber)
+
+
+    async def find_product_subscribers_page_async(self, product_id: str, page, per_page, after: str | None = None):
+        """Return a page of a product's subscribers and the next page token without blocking the event loop."""
+        return await self.async_db.find_product_subscribers_page(product_id, page, per_page, after)
+
+
+    async def find_all_subscribers_page_async(self, page, per_page, after: str | None = None):
+        """Return a page of all subscribers and the next page token without blocking the event loop."""
+        return await self.async_db.find_all_subscribers_page(page, per_page, after)
+
+
     def remove_subscriber(self, email_address: str, product_id: str) -> bool:
         """Remove a subscriber and send them an un-subscription confirmation email."""
 
@@ -74,9 +100,13 @@ class SubscriptionService:
             raise NotSubscribedError(email_address = email_address)
 
         self.db.delete_subscriber(subscriber_data['_id'])
+        self.index.remove(product_id, subscriber_data['email_address'])
         return self.notifier.send_unsubscribed_email(subscriber_data)
 
 
     def delete_subscriber(self, subscriber_id: str) -> None:
         """Delete a subscriber by their ID"""
-        self.db.delete_subscriber(subscriber_id)
\ No newline at end of file
+        subscriber = self.db.find_subscriber(subscriber_id)
+        self.db.delete_subscriber(subscriber_id)
+        if subscriber:
+            self.index.remove(subscriber["product_id"], subscriber["email_address"])
\ No newline at end of file
@@ -0,0 +1,284 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Awaitable, Dict, Tuple
+
+import bson
+import redis
+import redis.asyncio as async_redis
+
+from app.infra.config import settings
+from app.infra.db.adapters.product_adapter import ProductAdapter
+from app.infra.log_service import logger
+
+
+class ProductCache:
+    """
+    Read-through cache for product lookups by ID and by URL.
+    A small in-process LRU with a short TTL sits in front of Redis, which in turn sits in front of Mongo.
+    Documents are stored as BSON so ObjectIds and datetimes come back exactly as Mongo returned them.
+    Other processes may serve a stale product for up to the local TTL after an invalidation.
+    Every invalidation bumps a generation counter, and a document loaded while the counter moved
+    is not cached, so a reader racing a write cannot put the old document back.
+    """
+    KEY_PREFIX = "kitchnspy:products"
+    GENERATION_KEY = f"{KEY_PREFIX}:generation"
+
+    def __init__(
+        self, db: ProductAdapter, redis_url: str, ttl_seconds: int = 60 * 60,
+        local_size: int = 1024, local_ttl_seconds: float = 30.0
+    ):
+        self.db = db
+        self.redis_url = redis_url
+        self.redis = redis.Redis.from_url(redis_url)
+        self.async_redis = None
+        self.ttl_seconds = ttl_seconds
+        self.local_size = max(1, local_size)
+        self.local_ttl_seconds = local_ttl_seconds
+        self.local: OrderedDict[str, Tuple[float, dict]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.local_generation = 0
+        self.metrics = {
+            "local_hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0, "redis_errors": 0, "stale_loads": 0
+        }
+
+
+    def id_key(self, product_id: str) -> str:
+        return f"{self.KEY_PREFIX}:id:{product_id}"
+
+
+    def url_key(self, url: str) -> str:
+        return f"{self.KEY_PREFIX}:url:{url}"
+
+
+    def count(self, metric: str) -> None:
+        with self.lock:
+            self.metrics[metric] += 1
+
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters for this process and the overall hit ratio."""
+        with self.lock:
+            stats = dict(self.metrics)
+            stats["local_entries"] = len(self.local)
+
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["local_hits"] + stats["redis_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+    def local_get(self, key: str) -> dict | None:
+        with self.lock:
+            entry = self.local.get(key)
+            if entry is None:
+                return None
+            expires_at, document = entry
+            if expires_at < time.monotonic():
+                del self.local[key]
+                return None
+            self.local.move_to_end(key)
+            self.metrics["local_hits"] += 1
+            return dict(document)
+
+
+    def local_put(self, key: str, document: dict, local_generation: int) -> None:
+        """Keep a document locally, unless this process invalidated a product since it was read."""
+        with self.lock:
+            if local_generation != self.local_generation:
+                return
+            self.local[key] = (time.monotonic() + self.local_ttl_seconds, dict(document))
+            self.local.move_to_end(key)
+            while len(self.local) > self.local_size:
+                self.local.popitem(last=False)
+
+
+    def generation(self) -> bytes | None:
+        """Read the invalidation counter before loading, so store can tell whether the load raced a write."""
+        try:
+            return self.redis.get(self.GENERATION_KEY)
+        except redis.RedisError:
+            return None
+
+
+    async def generation_async(self) -> bytes | None:
+        try:
+            return await self.async_redis.get(self.GENERATION_KEY)
+        except redis.RedisError:
+            return None
+
+
+    def keys_for(self, document: dict) -> list[str]:
+        """Every key a product is cached under."""
+        return [self.id_key(str(document["_id"])), self.url_key(document["url"])]
+
+
+    def store(self, document: dict, generation: bytes | None, local_generation: int) -> None:
+        """
+        Cache a product under both its ID and URL keys in every tier.
+        Args:
+            document: Product loaded from Mongo.
+            generation: Invalidation counter read before the document was loaded.
+            local_generation: This process's invalidation counter read before the document was loaded.
+        """
+        keys = self.keys_for(document)
+        try:
+            encoded = bson.encode(document)
+            with self.redis.pipeline() as pipe:
+                pipe.watch(self.GENERATION_KEY)
+                if pipe.get(self.GENERATION_KEY) != generation:
+                    raise redis.WatchError(self.GENERATION_KEY)
+                pipe.multi()
+                for key in keys:
+                    pipe.set(key, encoded, ex=self.ttl_seconds)
+                pipe.execute()
+        except redis.WatchError:
+            self.count("stale_loads")
+            return
+        except redis.RedisError as e:
+            self.count("redis_errors")
+            logger.warning(f"Could not cache product {document['_id']}: {e}")
+
+        for key in keys:
+            self.local_put(key, document, local_generation)
+
+
+    async def store_async(self, document: dict, generation: bytes | None, local_generation: int) -> None:
+        """Async variant of store."""
+        keys = self.keys_for(document)
+        try:
+            encoded = bson.encode(document)
+            async with self.async_redis.pipeline() as pipe:
+                await pipe.watch(self.GENERATION_KEY)
+                if await pipe.get(self.GENERATION_KEY) != generation:
+                    raise redis.WatchError(self.GENERATION_KEY)
+                pipe.multi()
+                for key in keys:
+                    pipe.set(key, encoded, ex=self.ttl_seconds)
+                await pipe.execute()
+        except redis.WatchError:
+            self.count("stale_loads")
+            return
+        except redis.RedisError as e:
+            self.count("redis_errors")
+            logger.warning(f"Could not cache product {document['_id']}: {e}")
+
+        for key in keys:
+            self.local_put(key, document, local_generation)
+
+
+    def lookup(self, key: str, loader: Callable[[], dict]) -> dict:
+        """Return the document cached under key, falling through to Redis and then to the loader."""
+        document = self.local_get(key)
+        if document is not None:
+            return document
+
+        local_generation = self.local_generation
+        generation = self.generation()
+        try:
+            cached = self.redis.get(key)
+        except redis.RedisError as e:
+            self.count("redis_errors")
+            logger.warning(f"Product cache unavailable, reading from Mongo: {e}")
+            cached = None
+
+        if cached is not None:
+            self.count("redis_hits")
+            document = bson.decode(cached)
+            self.local_put(key, document, local_generation)
+            return document
+
+        self.count("misses")
+        document = loader()
+        self.store(document, generation, local_generation)
+        return document
+
+
+    async def lookup_async(self, key: str, loader: Callable[[], Awaitable[dict]]) -> dict:
+        """Async variant of lookup, for routes running on the event loop."""
+        document = self.local_get(key)
+        if document is not None:
+            return document
+
+        if self.async_redis is None:
+            self.async_redis = async_redis.Redis.from_url(self.redis_url)
+
+        local_generation = self.local_generation
+        generation = await self.generation_async()
+        try:
+            cached = await self.async_redis.get(key)
+        except redis.RedisError as e:
+            self.count("redis_errors")
+            logger.warning(f"Product cache unavailable, reading from Mongo: {e}")
+            cached = None
+
+        if cached is not None:
+            self.count("redis_hits")
+            document = bson.decode(cached)
+            self.local_put(key, document, local_generation)
+            return document
+
+        self.count("misses")
+        document = await loader()
+        await self.store_async(document, generation, local_generation)
+        return document
+
+
+    def find_product(self, product_id: str) -> dict:
+        return self.lookup(self.id_key(product_id), lambda: self.db.find_product(product_id))
+
+
+    def find_product_by_url(self, url: str) -> dict:
+        return self.lookup(self.url_key(url), lambda: self.db.find_product_by_url(url))
+
+
+    async def find_product_async(self, product_id: str, loader: Callable[[], Awaitable[dict]]) -> dict:
+        return await self.lookup_async(self.id_key(product_id), loader)
+
+
+    def invalidate(self, product_id: str, url: str | None = None) -> None:
+        """Drop a product from every tier, under its ID and its URL."""
+        id_key = self.id_key(str(product_id))
+        urls = {url} if url else set()
+
+        with self.lock:
+            entry = self.local.pop(id_key, None)
+            if entry is not None:
+                urls.add(entry[1].get("url"))
+            self.local_generation += 1
+            self.metrics["invalidations"] += 1
+
+        try:
+            cached = self.redis.get(id_key)
+            if cached is not None:
+                urls.add(bson.decode(cached).get("url"))
+            keys = [id_key] + [self.url_key(cached_url) for cached_url in urls if cached_url]
+            pipe = self.redis.pipeline()
+            pipe.incr(self.GENERATION_KEY)
+            pipe.delete(*keys)
+            pipe.execute()
+        except redis.RedisError as e:
+            self.count("redis_errors")
+            logger.warning(f"Could not invalidate cached product {product_id}: {e}")
+            keys = [self.url_key(cached_url) for cached_url in urls if cached_url]
+
+        with self.lock:
+            for key in keys:
+                self.local.pop(key, None)
+
+
+product_cache: ProductCache | None = None
+product_cache_lock = threading.Lock()
+
+
+def get_product_cache() -> ProductCache:
+    """Return the process-wide product cache."""
+    global product_cache
+    with product_cache_lock:
+        if product_cache is None:
+            product_cache = ProductCache(
+                ProductAdapter.instance(), settings.REDIS_URL,
+                ttl_seconds=settings.PRODUCT_CACHE_TTL_SECONDS,
+                local_size=settings.PRODUCT_CACHE_LOCAL_SIZE,
+                local_ttl_seconds=settings.PRODUCT_CACHE_LOCAL_TTL_SECONDS
+            )
+        return product_cache
@@ -0,0 +1,160 @@
+import threading
+import uuid
+from typing import Dict, Iterator
+
+import orjson
+import redis
+
+from app.infra.config import settings
+from app.infra.db.adapters.subscriber_adapter import SubscriberAdapter
+from app.infra.log_service import logger
+
+
+class SubscriberIndex:
+    """
+    Redis-backed index of product_id -> subscribers, used to fan out price-change notifications
+    without querying Mongo. Each product is a hash of email_address -> subscriber entry, loaded
+    from Mongo on first use and kept current on subscribe and unsubscribe.
+    Every change bumps the product's version, so a load that raced with a change is thrown away
+    instead of bringing back a subscriber who just left.
+    Falls back to reading Mongo directly whenever Redis is unavailable.
+    """
+    KEY_PREFIX = "kitchnspy:subscribers"
+
+    def __init__(self, db: SubscriberAdapter, redis_url: str, ttl_seconds: int = 24 * 60 * 60, load_attempts: int = 3):
+        self.db = db
+        self.redis = redis.Redis.from_url(redis_url)
+        self.ttl_seconds = ttl_seconds
+        self.load_attempts = max(1, load_attempts)
+
+
+    def key(self, product_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{product_id}"
+
+
+    def loaded_key(self, product_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{product_id}:loaded"
+
+
+    def version_key(self, product_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{product_id}:version"
+
+
+    def bump_version(self, pipe: redis.client.Pipeline, product_id: str) -> None:
+        pipe.incr(self.version_key(product_id))
+        pipe.expire(self.version_key(product_id), self.ttl_seconds)
+
+
+    @staticmethod
+    def entry(subscriber: dict) -> Dict[str, str]:
+        """Keep only the subscriber fields a notification needs."""
+        return {"name": subscriber["name"], "email_address": subscriber["email_address"]}
+
+
+    def add(self, product_id: str, subscriber: dict) -> None:
+        """Add or refresh a subscriber in a product's index."""
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(self.key(product_id), subscriber["email_address"], orjson.dumps(self.entry(subscriber)))
+            self.bump_version(pipe, product_id)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not index subscriber for product {product_id}: {e}")
+
+
+    def remove(self, product_id: str, email_address: str) -> None:
+        """Remove a subscriber from a product's index."""
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hdel(self.key(product_id), email_address)
+            self.bump_version(pipe, product_id)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not unindex subscriber for product {product_id}: {e}")
+
+
+    def drop_product(self, product_id: str) -> None:
+        """Forget every subscriber of a product."""
+        try:
+            pipe = self.redis.pipeline()
+            pipe.delete(self.key(product_id), self.loaded_key(product_id))
+            self.bump_version(pipe, product_id)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not drop subscriber index for product {product_id}: {e}")
+
+
+    def load(self, product_id: str) -> bool:
+        """
+        Populate a product's index from Mongo in one pass.
+        The entries are written to a scratch key and renamed into place only if no subscriber
+        was added or removed meanwhile; otherwise the load is retried.
+        Returns:
+            Whether the index was loaded
+        """
+        key = self.key(product_id)
+        version_key = self.version_key(product_id)
+
+        for _ in range(self.load_attempts):
+            version = self.redis.get(version_key)
+            scratch_key = f"{key}:loading:{uuid.uuid4().hex}"
+            pipe = self.redis.pipeline(transaction=False)
+
+            count = 0
+            for subscriber in self.db.yield_product_subscribers(product_id):
+                pipe.hset(scratch_key, subscriber["email_address"], orjson.dumps(self.entry(subscriber)))
+                count += 1
+
+            pipe.expire(scratch_key, self.ttl_seconds)
+            pipe.execute()
+
+            with self.redis.pipeline() as pipe:
+                try:
+                    pipe.watch(version_key)
+                    if pipe.get(version_key) != version:
+                        raise redis.WatchError(version_key)
+                    pipe.multi()
+                    if count:
+                        pipe.rename(scratch_key, key)
+                    else:
+                        pipe.delete(key)
+                    pipe.set(self.loaded_key(product_id), 1, ex=self.ttl_seconds)
+                    pipe.execute()
+                    logger.info(f"Indexed {count} subscribers for product {product_id}")
+                    return True
+                except redis.WatchError:
+                    self.redis.delete(scratch_key)
+                    logger.info(f"Subscribers of product {product_id} changed while indexing, reloading")
+
+        logger.warning(f"Could not index subscribers for product {product_id}: they kept changing")
+        return False
+
+
+    def yield_subscribers(self, product_id: str) -> Iterator[Dict[str, str]]:
+        """Stream a product's subscribers from the index, loading it from Mongo if needed."""
+        try:
+            loaded = self.redis.exists(self.loaded_key(product_id)) or self.load(product_id)
+            entries = self.redis.hscan_iter(self.key(product_id), count=500) if loaded else None
+        except redis.RedisError as e:
+            logger.warning(f"Subscriber index unavailable, reading product {product_id} from Mongo: {e}")
+            entries = None
+
+        if entries is None:
+            yield from (self.entry(subscriber) for subscriber in self.db.yield_product_subscribers(product_id))
+            return
+
+        for _, value in entries:
+            yield orjson.loads(value)
+
+
+subscriber_index: SubscriberIndex | None = None
+subscriber_index_lock = threading.Lock()
+
+
+def get_subscriber_index() -> SubscriberIndex:
+    """Return the process-wide subscriber index."""
+    global subscriber_index
+    with subscriber_index_lock:
+        if subscriber_index is None:
+            subscriber_index = SubscriberIndex(SubscriberAdapter.instance(), settings.REDIS_URL)
+        return subscriber_index
@@ -15,6 +15,28 @@ class Settings(BaseSettings):
     MAIL_SSL: bool = False
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
+    SCRAPER_CONCURRENCY: int = 8
+    SCRAPER_PER_HOST_LIMIT: int = 4
+    SCRAPER_VALIDATOR_CACHE_PATH: str | None = None
+    SCRAPER_VALIDATOR_CACHE_SIZE: int = 5000
+    SCRAPER_PARSER: str = "html.parser"
+    SCRAPER_PARSE_PROCESSES: int = 0
+    SCRAPER_RATE_PER_HOST: float = 10.0
+    SCRAPER_BURST_PER_HOST: int = 10
+    SCRAPER_CIRCUIT_THRESHOLD: int = 5
+    SCRAPER_CIRCUIT_RESET_SECONDS: float = 60.0
+    SCRAPER_MAX_RETRY_WAIT: float = 30.0
+    WRITE_BATCH_SIZE: int = 100
+    PRICE_LOG_RETENTION_DAYS: int = 365
+    PRODUCT_CACHE_TTL_SECONDS: int = 3600
+    PRODUCT_CACHE_LOCAL_SIZE: int = 1024
+    PRODUCT_CACHE_LOCAL_TTL_SECONDS: float = 30.0
+    SMTP_POOL_SIZE: int = 2
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+    SMTP_MAX_IDLE_SECONDS: float = 60.0
+    SMTP_SENDER_MODE: str = "sync"
+    SMTP_MAX_IN_FLIGHT: int = 10
+    NOTIFICATION_BATCH_SIZE: int = 100
 
     class Config:
         env_file = ".env"
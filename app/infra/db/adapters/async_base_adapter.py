@@ -0,0 +1,113 @@
+from app.infra.db.adapters.shared_imports import *
+from app.infra.db.adapters.base_adapter import BaseAdapter
+from app.infra.db.client import get_async_database
+from app.infra.db.price_log_storage import price_log_collection_name
+from app.infra.db.price_aggregation import BUCKET_COLLECTION
+from bson import decode as decode_bson
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from typing import AsyncGenerator, Tuple
+
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+
+class AsyncBaseAdapter:
+    """
+    Async counterpart of BaseAdapter, backed by the shared AsyncMongoClient.
+    Index management stays with the sync adapters.
+    """
+    registry: Dict[tuple, "AsyncBaseAdapter"] = {}
+    registry_lock = threading.Lock()
+
+    validate_obj_id = staticmethod(BaseAdapter.validate_obj_id)
+
+    def __init__(self):
+        """Bind core collections from the shared async MongoDB client."""
+        db = get_async_database()
+        self.meta = db["schema_meta"]
+        self.products = db["products"]
+        self.price_logs = db[price_log_collection_name()]
+        self.price_buckets = db[BUCKET_COLLECTION]
+        self.subscribers = db["subscribers"]
+        self.tasks = db["task_audit"]
+        self.celery_results = db["celery_results"]
+        self.serializer = Serializer()
+
+
+    @classmethod
+    def instance(cls):
+        """Return the process-wide instance of this adapter."""
+        key = (cls, os.getpid())
+        with AsyncBaseAdapter.registry_lock:
+            if key not in AsyncBaseAdapter.registry:
+                AsyncBaseAdapter.registry[key] = cls()
+            return AsyncBaseAdapter.registry[key]
+
+
+    async def find_by_id(self, collection, doc_id: str, entity_name: str, projection: dict | None = None) -> dict:
+        """Retrieve a document by ID from the specified collection."""
+        obj_id = self.validate_obj_id(doc_id, entity_name)
+        document = await collection.find_one({"_id": obj_id}, projection)
+        if not document:
+            raise DocNotFoundError(identifier=doc_id, entity=entity_name)
+
+        return document
+
+
+    def decode_document(self, document: dict) -> dict:
+        """Convert a stored document to the form callers expect. Adapters with their own storage format override this."""
+        return document
+
+
+    @staticmethod
+    def raw(collection):
+        """Return a view of a collection whose cursors yield undecoded RawBSONDocuments."""
+        return collection.with_options(codec_options=RAW_CODEC_OPTIONS)
+
+
+    async def yield_json(self, cursor) -> AsyncGenerator[bytes, None]:
+        """
+        Yield each document of a raw cursor (see raw()) as JSON bytes.
+        Documents stay as BSON bytes until their turn to be written, then are decoded
+        and encoded straight to JSON, without the serialize-copy step of yield_documents.
+        """
+        async for document in cursor:
+            yield self.serializer.dumps(self.decode_document(decode_bson(document.raw)))
+
+
+    async def yield_documents(self, cursor) -> AsyncGenerator[Dict, None]:
+        """Yield documents from an async MongoDB cursor one at a time, serialized as dictionaries"""
+        async for document in cursor:
+            yield self.serializer.json_serialize_doc(self.decode_document(document))
+
+
+    @staticmethod
+    async def paginate_results(cursor, per_page, page: int = 1) -> List[Dict]:
+        """Return a paginated list of documents from an async cursor."""
+        skip = (page - 1) * per_page if page > 0 else 0
+        return await cursor.skip(skip).limit(per_page).to_list(per_page)
+
+
+    async def keyset_page(
+        self, collection, query: dict, sort_field: str, page: int, per_page: int, after: str | None,
+        projection: dict | None = None
+    ) -> Tuple[List[Dict], str | None]:
+        """
+        Return one page of documents ordered by (sort_field, _id) and the token for the next page.
+        Args:
+            collection: Collection to read from.
+            query: Filter for the listing.
+            sort_field: Field the listing is ordered by.
+            page: Page number (1-based), used only when no continuation token is given.
+            per_page: Number of documents per page.
+            after: Continuation token from the previous page.
+            projection: Fields to include or exclude.
+        Returns:
+            The documents, decoded but not serialized, and the continuation token, or None on the last page.
+        """
+        cursor = collection.find(apply_keyset(query, sort_field, after), projection).sort(sort_order(sort_field))
+        if not after:
+            cursor = cursor.skip((page - 1) * per_page if page > 0 else 0)
+
+        documents = await cursor.limit(per_page).to_list(per_page)
+        return [self.decode_document(document) for document in documents], next_cursor(documents, sort_field, per_page)
@@ -0,0 +1,167 @@
+from app.infra.db.adapters.shared_imports import *
+from app.infra.db.adapters.async_base_adapter import AsyncBaseAdapter
+from app.infra.db.price_log_storage import get_storage_mode, decode_price_log
+from app.infra.db.price_aggregation import (
+    BUCKET_COLLECTION, BUCKET_FIELDS, bucket_start, bucket_state_id, settled_until, summary_pipeline
+)
+from typing import AsyncGenerator, Tuple
+
+EXPORT_PROJECTION = {
+    "product_id": 1, "previous_price": 1, "current_price": 1,
+    "price_diff": 1, "change_type": 1, "date_checked": 1
+}
+EXPORT_BATCH_SIZE = 1000
+
+
+class AsyncPriceLogAdapter(AsyncBaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.timeseries = get_storage_mode() == "timeseries"
+
+
+    def decode_document(self, document: dict) -> dict:
+        return decode_price_log(document) if self.timeseries else document
+
+
+    async def yield_product_price_history(self, product_id: str) -> AsyncGenerator[Dict, None]:
+        """Yield serialized price history documents for a specific product."""
+        try:
+            cursor = self.price_logs.find({"product_id": product_id})
+            async for document in self.yield_documents(cursor):
+                yield document
+
+        except Exception as e:
+            logger.error(f"Error yielding price history for product {product_id}: {str(e)}")
+            raise
+
+
+    async def find_product_price_history_page(
+        self, product_id: str, page: int = 1, per_page: int = 20, after: str | None = None
+    ) -> Tuple[List[Dict], str | None]:
+        """Return a page of price history documents for a product and the next page token."""
+        try:
+            return await self.keyset_page(
+                self.price_logs, {"product_id": product_id}, "date_checked", page, per_page, after
+            )
+        except Exception as e:
+            logger.error(f"Error yielding price history for product {product_id}: {str(e)}")
+            raise
+
+
+    async def export_price_logs(self, product_id: str | None = None) -> AsyncGenerator[bytes, None]:
+        """
+        Stream every price log, or every log of one product, as JSON bytes in date order.
+        Only the exported fields are fetched and documents are read as raw BSON.
+        """
+        query = {"product_id": product_id} if product_id else {}
+        try:
+            cursor = self.raw(self.price_logs).find(query, EXPORT_PROJECTION) \
+                .sort(sort_order("date_checked")).batch_size(EXPORT_BATCH_SIZE)
+
+            async for document in self.yield_json(cursor):
+                yield document
+        except Exception as e:
+            logger.error(f"Error exporting price logs: {str(e)}")
+            raise
+
+
+    async def find_all_price_logs_page(
+        self, page: int = 1, per_page: int = 20, after: str | None = None
+    ) -> Tuple[List[Dict], str | None]:
+        """Return a page of price history documents for all products and the next page token."""
+        try:
+            return await self.keyset_page(self.price_logs, {}, "date_checked", page, per_page, after)
+        except Exception as e:
+            logger.error(f"Error yielding price history for products: {str(e)}")
+            raise
+
+
+    async def summarize_price_history(
+        self, product_id: str, interval: str, start: datetime, end: datetime
+    ) -> List[Dict]:
+        """
+        Return min/max/avg/first/last/count of a product's prices per bucket between start and end.
+        Closed buckets come from the price_buckets cache; buckets still open, or closed less than
+        SETTLE_LAG ago, are aggregated live.
+        Args:
+            product_id: Product whose history is summarised.
+            interval: Bucket size: hour, day or week.
+            start: Start of the range. The bucket containing it is returned whole.
+            end: End of the range (exclusive).
+        Returns:
+            Serialized bucket documents in time order.
+        """
+        try:
+            closed_until = settled_until(interval)
+            await self.refresh_price_buckets(product_id, interval, closed_until)
+
+            buckets = []
+            if start < closed_until:
+                cursor = self.price_buckets.find(
+                    {
+                        "product_id": product_id, "interval": interval,
+                        "bucket": {"$gte": bucket_start(start, interval), "$lt": min(end, closed_until)}
+                    },
+                    {field: 1 for field in BUCKET_FIELDS} | {"_id": 0}
+                ).sort("bucket", pymongo.ASCENDING)
+                buckets = await cursor.to_list(None)
+
+            if end > closed_until:
+                live = await self.price_logs.aggregate(
+                    summary_pipeline(product_id, interval, max(start, closed_until), end)
+                )
+                buckets.extend(await live.to_list(None))
+
+            return self.serializer.json_serialize_docs(buckets)
+
+        except Exception as e:
+            logger.error(f"Error summarising price history for product {product_id}: {str(e)}")
+            raise
+
+
+    async def refresh_price_buckets(self, product_id: str, interval: str, closed_until: datetime) -> None:
+        """Aggregate and store the buckets closed since the last refresh, then move the watermark up to closed_until."""
+        state_id = bucket_state_id(product_id, interval)
+        state = await self.meta.find_one({"_id": state_id})
+        computed_until = state.get("computed_until") if state else None
+        if computed_until is not None and computed_until >= closed_until:
+            return
+
+        results = await self.price_logs.aggregate(
+            summary_pipeline(product_id, interval, computed_until, closed_until)
+        )
+        operations = [
+            UpdateOne(
+                {"product_id": product_id, "interval": interval, "bucket": bucket["bucket"]},
+                {"$set": bucket},
+                upsert=True
+            )
+            async for bucket in results
+        ]
+        if operations:
+            await self.price_buckets.bulk_write(operations, ordered=False)
+
+        await self.meta.update_one({"_id": state_id}, {"$set": {"computed_until": closed_until}}, upsert=True)
+
+
+    async def invalidate_price_buckets(self, product_id: str) -> None:
+        """Drop a product's cached history buckets so they are recomputed from the logs on the next request."""
+        await self.price_buckets.delete_many({"product_id": product_id})
+        await self.meta.delete_many({"_id": {"$regex": f"^{BUCKET_COLLECTION}:{re.escape(product_id)}:"}})
+
+
+    async def delete_price(self, price_id: str) -> None:
+        """Delete a price log document by its ID"""
+        obj_id = self.validate_obj_id(price_id, "Price log")
+
+        try:
+            price_log = await self.price_logs.find_one({"_id": obj_id}, {"product_id": 1})
+            if not price_log:
+                raise DocNotFoundError(identifier=price_id, entity="Price")
+
+            await self.price_logs.delete_one({"_id": obj_id})
+            await self.invalidate_price_buckets(price_log["product_id"])
+            logger.info(f"Deleted price log {price_id}")
+        except Exception as e:
+            logger.error(f"Error deleting price log {price_id}: {str(e)}")
+            raise
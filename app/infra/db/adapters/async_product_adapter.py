@@ -0,0 +1,64 @@
+from app.infra.db.adapters.shared_imports import *
+from app.infra.db.adapters.async_base_adapter import AsyncBaseAdapter
+from app.infra.db.search_index import (
+    PRODUCT_PROJECTION, query_grams, search_pipeline, load_gram_frequencies_async
+)
+from typing import Tuple
+
+
+class AsyncProductAdapter(AsyncBaseAdapter):
+
+    async def find_product(self, product_id: str) -> dict:
+        """Retrieve a product document by its ID."""
+        return await self.find_by_id(self.products, product_id, "Product", PRODUCT_PROJECTION)
+
+
+    async def find_product_by_url(self, url: str) -> dict:
+        """Retrieve a product document by its URL."""
+        prod = await self.products.find_one({"url": url}, PRODUCT_PROJECTION)
+        if not prod:
+            raise DocNotFoundError(identifier=url, entity="Product")
+        return prod
+
+
+    async def find_products_paginated(
+        self, per_page, page: int = 1, after: str | None = None
+    ) -> Tuple[List[dict], str | None]:
+        """Retrieve a page of serialized products ordered by name and the next page token."""
+        try:
+            products, cursor = await self.keyset_page(
+                self.products, {}, "product_name", page, per_page, after, PRODUCT_PROJECTION
+            )
+
+            if not products:
+                raise DocsNotFoundError(entities="Products", page=page)
+            return self.serializer.json_serialize_docs(products), cursor
+
+        except Exception as e:
+            if not isinstance(e, DocsNotFoundError):
+                logger.error(f"Error retrieving products: {str(e)}")
+            raise
+
+
+    async def search_products_by_name(self, search_term: str, page: int = 1, per_page: int = 10) -> List[dict]:
+        """Search products by name and return a page of serialized results, best match first."""
+        search_term = search_term.strip()
+        grams = query_grams(search_term)
+        if len(search_term) == 0 or not grams:
+            raise EmptySearchError(entry=search_term)
+
+        try:
+            frequencies = await load_gram_frequencies_async(self.products)
+            skip = (page - 1) * per_page if page > 0 else 0
+            cursor = await self.products.aggregate(
+                search_pipeline(frequencies.prune(grams), skip, per_page, frequencies)
+            )
+            products = await cursor.to_list(per_page)
+            if not products:
+                raise DocsNotFoundError(entities="Products", page=page)
+
+            return self.serializer.json_serialize_docs(products)
+
+        except Exception as e:
+            logger.error(f"Error searching products: {str(e)}")
+            raise
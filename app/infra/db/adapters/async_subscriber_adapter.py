@@ -0,0 +1,55 @@
+from app.infra.db.adapters.shared_imports import *
+from app.infra.db.adapters.async_base_adapter import AsyncBaseAdapter
+from typing import AsyncGenerator, Tuple
+
+
+class AsyncSubscriberAdapter(AsyncBaseAdapter):
+
+    async def yield_product_subscribers(self, product_id: str) -> AsyncGenerator[Dict, None]:
+        """Yield subscriber documents for a specific product one at a time"""
+        try:
+            cursor = self.subscribers.find({"product_id": product_id})
+            async for document in self.yield_documents(cursor):
+                yield document
+
+        except Exception as e:
+            logger.error(f"Error yielding subscribers for product {product_id}: {str(e)}")
+            raise
+
+
+    async def find_product_subscribers_page(
+            self, product_id: str, page: int = 1, per_page: int = 20, after: str | None = None
+    ) -> Tuple[List[Dict], str | None]:
+        """Return a page of subscriber documents for a specific product and the next page token."""
+        try:
+            return await self.keyset_page(
+                self.subscribers, {"product_id": product_id}, "subscribed_on", page, per_page, after
+            )
+
+        except Exception as e:
+            logger.error(f"Error yielding subscribers for product {product_id}: {str(e)}")
+            raise
+
+
+    async def find_all_subscribers_page(
+            self, page: int = 1, per_page: int = 20, after: str | None = None
+    ) -> Tuple[List[Dict], str | None]:
+        """Return a page of subscriber documents across all products and the next page token."""
+        try:
+            return await self.keyset_page(self.subscribers, {}, "subscribed_on", page, per_page, after)
+
+        except Exception as e:
+            logger.error(f"Error yielding all subscribers: {str(e)}")
+            raise
+
+
+    async def find_subscriber_by_email(self, email_address: str) -> list[dict]:
+        """Retrieve every subscription held by an email address."""
+        return await self.subscribers.find({"email_address": email_address}).to_list(None)
+
+
+    async def find_product_subscriber(self, email_address: str, product_id: str) -> dict:
+        """Retrieve a single subscriber by email and product ID."""
+        return await self.subscribers.find_one(
+            {"email_address": email_address.lower(), "product_id": product_id}
+        )
@@ -1,37 +1,68 @@
 from app.infra.db.adapters.shared_imports import *
+from app.infra.db.client import get_database
+from app.infra.db.price_log_storage import price_log_collection
+from app.infra.db.price_aggregation import BUCKET_COLLECTION, DAILY_COLLECTION
+from app.infra.db.search_index import SEARCH_FIELD, backfill_search_grams
 load_dotenv()
 
+INDEX_VERSION = 5
+
 
 class BaseAdapter:
     """
     Base MongoDB adapter for initializing collections and providing shared utilities.
     """
+    registry: Dict[tuple, "BaseAdapter"] = {}
+    registry_lock = threading.Lock()
+    indexes_lock = threading.Lock()
+    indexes_checked = False
 
     def __init__(self):
-        """Establish MongoDB connection and initialize core collections."""
-
-        uri = os.getenv('DB_URI')
-        if not uri:
-            raise URIConnectionError()
+        """Bind core collections from the shared MongoDB client."""
         try:
-            client = MongoClient(uri)
-            db = client['kitchnspy']
+            db = get_database()
+            self.meta = db["schema_meta"]
             self.products = db["products"]
-            self.price_logs = db["price_log"]
+            self.price_logs = price_log_collection(db)
+            self.price_buckets = db[BUCKET_COLLECTION]
+            self.price_daily = db[DAILY_COLLECTION]
             self.subscribers = db["subscribers"]
             self.tasks = db["task_audit"]
             self.celery_results = db["celery_results"]
             self.serializer = Serializer()
             self.ensure_indexes()
 
-            logger.info("MongoDB connection established successfully")
-
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
             raise
 
 
+    @classmethod
+    def instance(cls):
+        """Return the process-wide instance of this adapter."""
+        key = (cls, os.getpid())
+        with BaseAdapter.registry_lock:
+            if key not in BaseAdapter.registry:
+                BaseAdapter.registry[key] = cls()
+            return BaseAdapter.registry[key]
+
+
     def ensure_indexes(self) -> None:
+        """Create indexes once per deployment, tracked by INDEX_VERSION in the schema_meta collection."""
+        with BaseAdapter.indexes_lock:
+            if BaseAdapter.indexes_checked:
+                return
+
+            current = self.meta.find_one({"_id": "indexes"})
+            if not current or current.get("version", 0) < INDEX_VERSION:
+                self.create_indexes()
+                self.meta.update_one({"_id": "indexes"}, {"$set": {"version": INDEX_VERSION}}, upsert=True)
+                logger.info(f"MongoDB indexes created at version {INDEX_VERSION}")
+
+            BaseAdapter.indexes_checked = True
+
+
+    def create_indexes(self) -> None:
         """Create indexes on collections"""
         self.products.create_index([("product_name", pymongo.ASCENDING)])
 
@@ -40,16 +71,40 @@ class BaseAdapter:
             unique=True
         )
 
+        self.products.create_index(sort_order("product_name"))
+
+        self.products.create_index([(SEARCH_FIELD, pymongo.ASCENDING)])
+        backfilled = backfill_search_grams(self.products)
+        if backfilled:
+            logger.info(f"Indexed {backfilled} existing products for search")
+
         self.price_logs.create_index([
             ("product_id", pymongo.ASCENDING),
             ("date_checked", pymongo.ASCENDING)
         ])
 
+        self.price_logs.create_index(sort_order("date_checked"))
+        self.price_logs.create_index([("product_id", pymongo.ASCENDING)] + sort_order("date_checked"))
+
+        self.price_buckets.create_index([
+            ("product_id", pymongo.ASCENDING),
+            ("interval", pymongo.ASCENDING),
+            ("bucket", pymongo.ASCENDING)
+        ], unique=True)
+
+        self.price_daily.create_index([
+            ("product_id", pymongo.ASCENDING),
+            ("day", pymongo.ASCENDING)
+        ], unique=True)
+
         self.subscribers.create_index([
             ("email_address", pymongo.ASCENDING),
             ("product_id", pymongo.ASCENDING)
         ], unique=True)
 
+        self.subscribers.create_index(sort_order("subscribed_on"))
+        self.subscribers.create_index([("product_id", pymongo.ASCENDING)] + sort_order("subscribed_on"))
+
         self.tasks.create_index([
             ("task_id", pymongo.ASCENDING)],
             unique=True
@@ -64,20 +119,25 @@ class BaseAdapter:
             raise InvalidIdError(entity=entity_name, detail=str(e))
 
 
-    def find_by_id(self, collection, doc_id: str, entity_name: str) -> dict:
+    def find_by_id(self, collection, doc_id: str, entity_name: str, projection: dict | None = None) -> dict:
         """Retrieve a document by ID from the specified collection."""
         obj_id = self.validate_obj_id(doc_id, entity_name)
-        document = collection.find_one({"_id": obj_id})
+        document = collection.find_one({"_id": obj_id}, projection)
         if not document:
             raise DocNotFoundError(identifier=doc_id, entity=entity_name)
 
         return document
 
 
+    def decode_document(self, document: dict) -> dict:
+        """Convert a stored document to the form callers expect. Adapters with their own storage format override this."""
+        return document
+
+
     def yield_documents(self, cursor) -> Generator[Dict, None, None]:
         """Yield documents from a MongoDB cursor one at a time, serialized as dictionaries"""
         for document in cursor:
-            yield self.serializer.json_serialize_doc(document)
+            yield self.serializer.json_serialize_doc(self.decode_document(document))
 
     @staticmethod
     def paginate_results(cursor, per_page, page: int = 1) -> List[Dict]:
@@ -93,3 +153,25 @@ class BaseAdapter:
         """
         skip = (page - 1) * per_page if page > 0 else 0
         return list(cursor.skip(skip).limit(per_page))
+
+
+    @staticmethod
+    def keyset_cursor(
+        collection, query: dict, sort_field: str, page: int, per_page: int, after: str | None,
+        projection: dict | None = None
+    ):
+        """
+        Return a cursor over one page of documents ordered by (sort_field, _id).
+        Args:
+            collection: Collection to read from.
+            query: Filter for the listing.
+            sort_field: Field the listing is ordered by.
+            page: Page number (1-based), used only when no continuation token is given.
+            per_page: Number of documents per page.
+            after: Continuation token from the previous page.
+            projection: Fields to include or exclude.
+        """
+        cursor = collection.find(apply_keyset(query, sort_field, after), projection).sort(sort_order(sort_field))
+        if not after:
+            cursor = cursor.skip((page - 1) * per_page if page > 0 else 0)
+        return cursor.limit(per_page)
@@ -1,20 +1,58 @@
 from app.infra.db.adapters.shared_imports import *
 from app.infra.db.adapters.base_adapter import BaseAdapter
+from app.infra.db.price_log_storage import get_storage_mode, encode_price_log, decode_price_log
+from app.infra.db.price_aggregation import (
+    BUCKET_COLLECTION, ROLLUP_STATE_ID, daily_rollup_pipeline, settled_until
+)
 
 load_dotenv()
 
 class PriceLogAdapter(BaseAdapter):
+    """
+    Reads and writes price logs in the configured storage mode (see PRICE_LOG_STORAGE).
+    In time-series mode prices are stored as numbers and formatted back to strings on read,
+    so callers see the same documents in either mode.
+    """
+    def __init__(self):
+        super().__init__()
+        self.timeseries = get_storage_mode() == "timeseries"
+
+
+    def encode_document(self, document: dict) -> dict:
+        return encode_price_log(document) if self.timeseries else document
+
+
+    def decode_document(self, document: dict) -> dict:
+        return decode_price_log(document) if self.timeseries else document
+
+
     def insert_price_log(self, data: dict) -> None:
         """Insert a single price log document into the price_logs collection."""
 
         try:
-            result = self.price_logs.insert_one(data)
+            result = self.price_logs.insert_one(self.encode_document(data))
+            data["_id"] = result.inserted_id
             logger.info(f"Inserted price log with ID: {result.inserted_id}")
         except Exception as e:
             logger.error(f"Failed to insert price log: {str(e)}")
             raise
 
 
+    def insert_price_logs(self, data: List[dict]) -> int:
+        """Insert many price log documents in a single round trip."""
+        if not data:
+            return 0
+
+        try:
+            result = self.price_logs.insert_many([self.encode_document(doc) for doc in data], ordered=False)
+            inserted_count = len(result.inserted_ids)
+            logger.info(f"Inserted {inserted_count} price logs")
+            return inserted_count
+        except Exception as e:
+            logger.error(f"Failed to insert price logs: {str(e)}")
+            raise
+
+
     def yield_product_price_history(self, product_id: str) -> Generator[Dict, None, None]:
         """Yield serialized price history documents for a specific product."""
         try:
@@ -27,22 +65,22 @@ class PriceLogAdapter(BaseAdapter):
 
 
     def yield_and_paginate_product_price_history(
-        self, product_id: str, page: int = 1, per_page: int = 20
+        self, product_id: str, page: int = 1, per_page: int = 20, after: str | None = None
     ) -> Generator[Dict, None, None]:
         """
         Yield serialized price history documents for a specific product, paginated.
         Args:
             product_id: The ID of the product to fetch price logs for.
-            page: Page number (1-based).
+            page: Page number (1-based), used when no continuation token is given.
             per_page: Number of documents per page.
+            after: Continuation token from the previous page.
         Yields:
             Serialized price log documents as dictionaries.
         """
         try:
-            skip = (page - 1) * per_page if page > 0 else 0
-            cursor = self.price_logs.find({"product_id": product_id}) \
-                .sort("date_checked", pymongo.ASCENDING) \
-                .skip(skip).limit(per_page)
+            cursor = self.keyset_cursor(
+                self.price_logs, {"product_id": product_id}, "date_checked", page, per_page, after
+            )
 
             yield from self.yield_documents(cursor)
         except Exception as e:
@@ -51,21 +89,19 @@ class PriceLogAdapter(BaseAdapter):
 
 
     def yield_and_paginate_all_price_logs(
-        self, page: int = 1, per_page: int = 20
+        self, page: int = 1, per_page: int = 20, after: str | None = None
     ) -> Generator[Dict, None, None]:
         """
         Yield serialized price history documents for all products, paginated.
         Args:
-            page: Page number (1-based).
+            page: Page number (1-based), used when no continuation token is given.
             per_page: Number of documents per page.
+            after: Continuation token from the previous page.
         Yields:
             Serialized price log documents as dictionaries.
         """
         try:
-            skip = (page - 1) * per_page if page > 0 else 0
-            cursor = self.price_logs.find({}) \
-                .sort("date_checked", pymongo.ASCENDING) \
-                .skip(skip).limit(per_page)
+            cursor = self.keyset_cursor(self.price_logs, {}, "date_checked", page, per_page, after)
 
             yield from self.yield_documents(cursor)
         except Exception as e:
@@ -73,17 +109,68 @@ class PriceLogAdapter(BaseAdapter):
             raise
 
 
+    def rollup_watermark(self) -> datetime | None:
+        """Return the day up to which price logs have been rolled up into price_daily, or None if never."""
+        state = self.meta.find_one({"_id": ROLLUP_STATE_ID})
+        return state.get("rolled_up_until") if state else None
+
+
+    def rollup_daily_prices(self) -> Dict:
+        """
+        Merge the price logs of every day closed since the last run into the price_daily collection.
+        Only logs between the watermark and the start of today are read, then the watermark moves to today.
+        A day only counts as closed SETTLE_LAG after midnight, so logs written late are not left out.
+        Returns:
+            The range that was rolled up.
+        """
+        rolled_up_until = self.rollup_watermark()
+        today = settled_until("day")
+        if rolled_up_until is not None and rolled_up_until >= today:
+            return {"from": rolled_up_until, "to": today}
+
+        try:
+            self.price_logs.aggregate(daily_rollup_pipeline(rolled_up_until, today))
+            self.meta.update_one({"_id": ROLLUP_STATE_ID}, {"$set": {"rolled_up_until": today}}, upsert=True)
+            logger.info(f"Rolled up daily prices from {rolled_up_until or 'the first log'} to {today}")
+            return {"from": rolled_up_until, "to": today}
+
+        except Exception as e:
+            logger.error(f"Error rolling up daily prices: {str(e)}")
+            raise
+
+
+    def delete_price_logs_before(self, cutoff: datetime) -> int:
+        """
+        Delete every price log checked before the cutoff and return how many were removed.
+        In time-series mode this needs MongoDB 7.0+, since date_checked is not the metaField.
+        """
+        try:
+            result = self.price_logs.delete_many({"date_checked": {"$lt": cutoff}})
+            logger.info(f"{result.deleted_count} price logs deleted")
+            return result.deleted_count
+        except Exception as e:
+            logger.error(f"Error deleting price logs before {cutoff}: {str(e)}")
+            raise
+
+
+    def invalidate_price_buckets(self, product_id: str) -> None:
+        """Drop a product's cached history buckets so they are recomputed from the logs on the next request."""
+        self.price_buckets.delete_many({"product_id": product_id})
+        self.meta.delete_many({"_id": {"$regex": f"^{BUCKET_COLLECTION}:{re.escape(product_id)}:"}})
+
+
     def delete_price(self, price_id: str) -> None:
         """Delete a price log document by its ID"""
         obj_id = self.validate_obj_id(price_id, "Price log")
 
         try:
-            result = self.price_logs.delete_one({"_id": obj_id})
-
-            if result.deleted_count > 0:
-                logger.info(f"Deleted price log {price_id}")
-            else:
+            price_log = self.price_logs.find_one({"_id": obj_id}, {"product_id": 1})
+            if not price_log:
                 raise DocNotFoundError(identifier=price_id, entity="Price")
+
+            self.price_logs.delete_one({"_id": obj_id})
+            self.invalidate_price_buckets(price_log["product_id"])
+            logger.info(f"Deleted price log {price_id}")
         except Exception as e:
             logger.error(f"Error deleting price log {price_id}: {str(e)}")
             raise
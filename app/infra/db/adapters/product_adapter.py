@@ -1,5 +1,8 @@
 from app.infra.db.adapters.shared_imports import *
 from app.infra.db.adapters.base_adapter import BaseAdapter
+from app.infra.db.search_index import (
+    PRODUCT_PROJECTION, with_search_grams, query_grams, search_pipeline, load_gram_frequencies
+)
 
 
 class ProductAdapter(BaseAdapter):
@@ -10,10 +13,16 @@ class ProductAdapter(BaseAdapter):
         return product_ids
 
 
+    def find_products_for_pricing(self) -> List[dict]:
+        """Retrieve every product with only the fields needed to check its price, in one query."""
+        return list(self.products.find({}, {"name": 1, "product_name": 1, "url": 1, "price": 1}))
+
+
     def insert_product(self, data: dict) -> InsertOneResult:
         """Insert a single product document into the database."""
         try:
-            result = self.products.insert_one(data)
+            result = self.products.insert_one(with_search_grams(data))
+            data["_id"] = result.inserted_id
             logger.info(f"Inserted product with ID: {result.inserted_id}")
             return result
 
@@ -27,7 +36,7 @@ class ProductAdapter(BaseAdapter):
     def insert_products(self, data: List[dict]) -> int:
         """Insert multiple product documents into the database."""
         try:
-            result = self.products.insert_many(data, ordered=False)
+            result = self.products.insert_many([with_search_grams(doc) for doc in data], ordered=False)
             inserted_count = len(result.inserted_ids)
             logger.info(f"Inserted {inserted_count} products")
             return inserted_count
@@ -38,26 +47,24 @@ class ProductAdapter(BaseAdapter):
 
     def find_product(self, product_id: str) -> dict:
         """Retrieve a product document by its ID."""
-        return self.find_by_id(self.products, product_id, "Product")
+        return self.find_by_id(self.products, product_id, "Product", PRODUCT_PROJECTION)
 
 
     def find_product_by_url(self, url: str) -> dict:
         """Retrieve a product document by its URL."""
-        prod =  self.products.find_one({"url": url})
+        prod =  self.products.find_one({"url": url}, PRODUCT_PROJECTION)
         if not prod:
             raise DocNotFoundError(identifier=url, entity="Product")
         return prod
 
 
-    def find_products_paginated(self, per_page, page: int = 0) -> List[dict]:
+    def find_products_paginated(self, per_page, page: int = 1, after: str | None = None) -> List[dict]:
         """Retrieve all products with pagination."""
 
         try:
-            cursor = self.products.find({}).sort("product_name", pymongo.ASCENDING)
-            cursor2 = self.products.find({}).sort("product_name", pymongo.ASCENDING)
-
-            logger.info(f"cursor returned {list(cursor2)}")
-            products = self.paginate_results(cursor, per_page)
+            products = list(self.keyset_cursor(
+                self.products, {}, "product_name", page, per_page, after, PRODUCT_PROJECTION
+            ))
 
             if not products:
                 raise DocsNotFoundError(entities="Products", page = page)
@@ -70,22 +77,19 @@ class ProductAdapter(BaseAdapter):
 
 
     def search_products_by_name(self, search_term: str, page: int = 1, per_page: int=10):
-        """Search products by name using a regex query and yield paginated results."""
+        """
+        Search products by name and yield paginated results, best match first.
+        Matching uses the indexed search terms, so it tolerates typos and matches partly typed words.
+        """
         search_term = search_term.strip()
-        if len(search_term) == 0:
+        grams = query_grams(search_term)
+        if len(search_term) == 0 or not grams:
             raise EmptySearchError(entry=search_term)
 
         try:
-            safe_search = re.escape(search_term)
-            cursor = self.products.find({
-            "$or": [
-                {"name": {"$regex": safe_search,"$options": "i"}},
-                {"product_name": {"$regex": safe_search, "$options": "i"}}
-            ]
-            }).sort("product_name", pymongo.ASCENDING)
-
+            frequencies = load_gram_frequencies(self.products)
             skip = (page - 1) * per_page if page > 0 else 0
-            cursor = cursor.skip(skip).limit(per_page)
+            cursor = self.products.aggregate(search_pipeline(frequencies.prune(grams), skip, per_page, frequencies))
 
             first_doc = next(cursor, None)
             if not first_doc:
@@ -106,7 +110,7 @@ class ProductAdapter(BaseAdapter):
             if not self.products.find_one({"_id": obj_id}):
                 raise DocNotFoundError(identifier=product_id, entity="Product")
 
-            result = self.products.replace_one({"_id": obj_id}, new_document)
+            result = self.products.replace_one({"_id": obj_id}, with_search_grams(new_document))
 
             if result.modified_count == 0:
                 logger.info(f"No changes made when updating product {product_id}")
@@ -128,7 +132,7 @@ class ProductAdapter(BaseAdapter):
             return 0
 
         mongo_ops = [
-            ReplaceOne(op["filter"], op["replacement"])
+            ReplaceOne(op["filter"], with_search_grams(op["replacement"]))
             for op in operations
         ]
 
@@ -137,6 +141,30 @@ class ProductAdapter(BaseAdapter):
         return result.modified_count
 
 
+    def bulk_update_prices(self, updates: List[dict]) -> int:
+        """
+        Set the current price of many products in one bulk write.
+        Args:
+            updates: Dictionaries with the product '_id', new 'price' and 'date_checked'
+        Returns:
+            Number of products modified
+        """
+        if not updates:
+            return 0
+
+        mongo_ops = [
+            UpdateOne(
+                {"_id": update["_id"]},
+                {"$set": {"price": update["price"], "date_checked": update["date_checked"]}}
+            )
+            for update in updates
+        ]
+
+        result = self.products.bulk_write(mongo_ops, ordered=False)
+        logger.info(f"Bulk updated prices for {result.modified_count} products")
+        return result.modified_count
+
+
     def delete_product(self, product_id: str) -> None:
         """ Delete a product document from the database by its ID."""
         obj_id = self.validate_obj_id(product_id, "Product")
@@ -1,7 +1,9 @@
 import os
+import threading
 import itertools
 import pymongo
 import re
+from datetime import datetime
 from dotenv import load_dotenv
 from pymongo import MongoClient
 from bson import ObjectId
@@ -12,6 +14,7 @@ from app.shared.exceptions import (
     EmptySearchError, ExistingSubscriptionError, DuplicateEntityError
 )
 from app.shared.serializer import Serializer
+from app.infra.db.pagination import sort_order, apply_keyset, next_cursor
 from pymongo.errors import DuplicateKeyError, BulkWriteError
 from pymongo.results import InsertOneResult, InsertManyResult
 from pymongo.cursor import Cursor
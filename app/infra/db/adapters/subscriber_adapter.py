@@ -33,15 +33,13 @@ class SubscriberAdapter(BaseAdapter):
 
 
     def yield_and_paginate_product_subscribers(
-            self, product_id: str, page: int = 1, per_page: int = 20
+            self, product_id: str, page: int = 1, per_page: int = 20, after: str | None = None
     ) -> Generator[Dict, None, None]:
         """Yield paginated subscriber documents for a specific product."""
         try:
-            skip = (page - 1) * per_page if page > 0 else 0
-
-            cursor = self.subscribers.find({"product_id": product_id})
-            cursor.sort("subscribed_on", pymongo.ASCENDING) \
-                .skip(skip).limit(per_page)
+            cursor = self.keyset_cursor(
+                self.subscribers, {"product_id": product_id}, "subscribed_on", page, per_page, after
+            )
             yield from self.yield_documents(cursor)
 
         except Exception as e:
@@ -49,14 +47,12 @@ class SubscriberAdapter(BaseAdapter):
             raise
 
 
-    def yield_and_paginate_all_subscribers(self, page: int = 1, per_page: int = 20) -> Generator[Dict, None, None]:
+    def yield_and_paginate_all_subscribers(
+            self, page: int = 1, per_page: int = 20, after: str | None = None
+    ) -> Generator[Dict, None, None]:
         """Yield all subscriber documents across all products, paginated."""
         try:
-            skip = (page - 1) * per_page if page > 0 else 0
-
-            cursor = self.subscribers.find({}) \
-                .sort("subscribed_on", pymongo.ASCENDING) \
-                .skip(skip).limit(per_page)
+            cursor = self.keyset_cursor(self.subscribers, {}, "subscribed_on", page, per_page, after)
 
             yield from self.yield_documents(cursor)
 
@@ -76,6 +72,11 @@ class SubscriberAdapter(BaseAdapter):
         except Exception:
             raise
 
+    def find_subscriber(self, subscriber_id: str) -> dict | None:
+        """Retrieve a single subscriber by their ID."""
+        obj_id = self.validate_obj_id(subscriber_id, "Subscriber")
+        return self.subscribers.find_one({"_id": obj_id})
+
     def find_product_subscriber(self, email_address: str, product_id: str) -> dict:
         """Retrieve a single subscriber by email and product ID."""
         return self.subscribers.find_one(
@@ -98,4 +99,18 @@ class SubscriberAdapter(BaseAdapter):
 
         except Exception as e:
             logger.error(f"Error deleting subscriber {subscriber_id}: {str(e)}")
+            raise
+
+
+    def delete_subscribers(self, subscriber_ids: List[str]) -> int:
+        """Delete many subscribers by their IDs in one round trip."""
+        obj_ids = [self.validate_obj_id(subscriber_id, "Subscriber") for subscriber_id in subscriber_ids]
+
+        try:
+            result = self.subscribers.delete_many({"_id": {"$in": obj_ids}})
+            logger.info(f"Deleted {result.deleted_count} subscribers")
+            return result.deleted_count
+
+        except Exception as e:
+            logger.error(f"Error deleting {len(obj_ids)} subscribers: {str(e)}")
             raise
\ No newline at end of file
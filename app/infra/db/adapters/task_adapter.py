@@ -8,6 +8,11 @@ class TaskAdapter(BaseAdapter):
     def insert_task_audit(self, data: dict):
         self.tasks.insert_one(data)
 
+    def insert_task_audits(self, records: List[dict]) -> None:
+        """Write the audit records of a group of queued tasks in one round trip."""
+        if records:
+            self.tasks.insert_many(records, ordered=False)
+
     def find_task_by_id(self, _id: str):
         return self.find_by_id(self.tasks, _id, "Task")
 
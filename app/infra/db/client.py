@@ -0,0 +1,78 @@
+import os
+import threading
+from dotenv import load_dotenv
+from pymongo import MongoClient, AsyncMongoClient
+from pymongo.database import Database
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.infra.log_service import logger
+from app.shared.exceptions import URIConnectionError
+
+load_dotenv()
+
+DB_NAME = "kitchnspy"
+
+shared_client: MongoClient | None = None
+shared_client_pid: int | None = None
+shared_client_lock = threading.Lock()
+
+shared_async_client: AsyncMongoClient | None = None
+shared_async_client_pid: int | None = None
+
+
+def get_uri() -> str:
+    uri = os.getenv('DB_URI')
+    if not uri:
+        raise URIConnectionError()
+    return uri
+
+
+def pool_options() -> dict:
+    return {
+        "maxPoolSize": int(os.getenv('DB_MAX_POOL_SIZE', 50)),
+        "minPoolSize": int(os.getenv('DB_MIN_POOL_SIZE', 0))
+    }
+
+
+def get_client() -> MongoClient:
+    """
+    Return the process-wide MongoClient, creating it on first use.
+    Pool sizing comes from DB_MAX_POOL_SIZE / DB_MIN_POOL_SIZE. A forked worker gets its own client.
+    """
+    global shared_client, shared_client_pid
+
+    with shared_client_lock:
+        if shared_client is not None and shared_client_pid == os.getpid():
+            return shared_client
+
+        shared_client = MongoClient(get_uri(), connect=False, **pool_options())
+        shared_client_pid = os.getpid()
+        logger.info("MongoDB client created")
+        return shared_client
+
+
+def get_database() -> Database:
+    """Return the shared KitchnSpy database handle."""
+    return get_client()[DB_NAME]
+
+
+def get_async_client() -> AsyncMongoClient:
+    """
+    Return the process-wide AsyncMongoClient used by the async adapters.
+    It is created lazily so that it binds to the running event loop.
+    """
+    global shared_async_client, shared_async_client_pid
+
+    with shared_client_lock:
+        if shared_async_client is not None and shared_async_client_pid == os.getpid():
+            return shared_async_client
+
+        shared_async_client = AsyncMongoClient(get_uri(), **pool_options())
+        shared_async_client_pid = os.getpid()
+        logger.info("Async MongoDB client created")
+        return shared_async_client
+
+
+def get_async_database() -> AsyncDatabase:
+    """Return the shared async KitchnSpy database handle."""
+    return get_async_client()[DB_NAME]
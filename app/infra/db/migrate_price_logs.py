@@ -0,0 +1,88 @@
+"""
+Copy existing price logs from the document collection into the time-series collection.
+
+Run with `python -m app.infra.db.migrate_price_logs`, then set PRICE_LOG_STORAGE=timeseries.
+Time-series storage needs MongoDB 7.0 or later, which is the first release that deletes
+time-series documents by fields other than the metaField (see get_storage_mode).
+The run is resumable: progress is kept in schema_meta, and documents already copied are skipped.
+"""
+import argparse
+
+from app.infra.db.client import get_database
+from app.infra.db.pagination import sort_order, apply_keyset, encode_cursor
+from app.infra.db.price_log_storage import (
+    DOCUMENT_COLLECTION, TIMESERIES_COLLECTION, ensure_timeseries_collection, encode_price_log
+)
+from app.infra.db.price_aggregation import BUCKET_COLLECTION
+from app.infra.log_service import logger
+
+MIGRATION_ID = "price_log_timeseries_migration"
+
+
+def migrate_price_logs(batch_size: int = 1000, drop_source: bool = False) -> int:
+    """
+    Copy every price log into the time-series collection in (date_checked, _id) order.
+    Args:
+        batch_size: Number of documents copied per round trip.
+        drop_source: Drop the document collection once every log has been copied.
+    Returns:
+        Number of documents copied by this run.
+    """
+    db = get_database()
+    ensure_timeseries_collection(db)
+    source = db[DOCUMENT_COLLECTION]
+    target = db[TIMESERIES_COLLECTION]
+    meta = db["schema_meta"]
+
+    progress = meta.find_one({"_id": MIGRATION_ID}) or {}
+    after = progress.get("after")
+    copied = 0
+
+    while True:
+        batch = list(
+            source.find(apply_keyset({}, "date_checked", after))
+            .sort(sort_order("date_checked"))
+            .limit(batch_size)
+        )
+        if not batch:
+            break
+
+        existing_ids = {
+            document["_id"] for document in
+            target.find({"_id": {"$in": [document["_id"] for document in batch]}}, {"_id": 1})
+        }
+        documents = [encode_price_log(document) for document in batch if document["_id"] not in existing_ids]
+        if documents:
+            target.insert_many(documents, ordered=False)
+            copied += len(documents)
+
+        last = batch[-1]
+        after = encode_cursor(last.get("date_checked"), last["_id"])
+        meta.update_one({"_id": MIGRATION_ID}, {"$set": {"after": after}}, upsert=True)
+        logger.info(f"Copied {copied} price logs to {TIMESERIES_COLLECTION}")
+
+    if copied:
+        db[BUCKET_COLLECTION].delete_many({})
+        meta.delete_many({"_id": {"$regex": f"^{BUCKET_COLLECTION}:"}})
+
+    source_count = source.count_documents({})
+    target_count = target.count_documents({})
+    logger.info(f"Price log migration finished: {source_count} source documents, {target_count} time-series documents")
+
+    if drop_source:
+        if target_count < source_count:
+            logger.error("Not dropping the source collection: the time-series collection is missing documents")
+        else:
+            source.drop()
+            meta.delete_one({"_id": MIGRATION_ID})
+            logger.info(f"Dropped {DOCUMENT_COLLECTION}")
+
+    return copied
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy price logs into the time-series collection.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--drop-source", action="store_true")
+    args = parser.parse_args()
+    migrate_price_logs(batch_size=args.batch_size, drop_source=args.drop_source)
@@ -0,0 +1,56 @@
+import base64
+from typing import Any, Dict, List, Tuple
+
+import pymongo
+from bson import ObjectId, json_util
+
+from app.shared.exceptions import InvalidCursorError
+
+
+def sort_order(sort_field: str) -> List[Tuple[str, int]]:
+    """Sort on the keyset field with _id as the tie-breaker."""
+    return [(sort_field, pymongo.ASCENDING), ("_id", pymongo.ASCENDING)]
+
+
+def encode_cursor(sort_value: Any, doc_id: ObjectId) -> str:
+    """Encode the position after a document as an opaque continuation token."""
+    payload = json_util.dumps({"v": sort_value, "id": doc_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Any, ObjectId]:
+    """Decode a continuation token back into its sort value and _id."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return payload["v"], payload["id"]
+    except Exception as e:
+        raise InvalidCursorError(token=token, detail=str(e))
+
+
+def apply_keyset(query: Dict, sort_field: str, after: str | None) -> Dict:
+    """Restrict a query to documents strictly after the position encoded in a continuation token."""
+    if not after:
+        return query
+
+    sort_value, last_id = decode_cursor(after)
+    if sort_value is None:
+        # Null and missing values sort before every other value, and $gt null matches nothing
+        position = {"$or": [
+            {sort_field: {"$ne": None}},
+            {sort_field: None, "_id": {"$gt": last_id}}
+        ]}
+    else:
+        position = {"$or": [
+            {sort_field: {"$gt": sort_value}},
+            {sort_field: sort_value, "_id": {"$gt": last_id}}
+        ]}
+    return {"$and": [query, position]} if query else position
+
+
+def next_cursor(documents: List[Dict], sort_field: str, per_page: int) -> str | None:
+    """Return the token for the page after these raw documents, or None on the last page."""
+    if len(documents) < per_page:
+        return None
+    last = documents[-1]
+    return encode_cursor(last.get(sort_field), last["_id"])
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+INTERVALS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1)
+}
+BUCKET_COLLECTION = "price_buckets"
+DAILY_COLLECTION = "price_daily"
+ROLLUP_STATE_ID = "price_daily_rollup"
+BUCKET_FIELDS = ("bucket", "min", "max", "avg", "first", "last", "count")
+# Price logs are stamped with their scrape time but written in chunks later on,
+# so a bucket only counts as closed once this long has passed since it ended
+SETTLE_LAG = timedelta(minutes=15)
+
+
+def to_utc(moment: datetime) -> datetime:
+    """Return a naive UTC datetime, the form pymongo hands back for stored dates."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def settled_until(interval: str) -> datetime:
+    """Start of the earliest bucket that may still receive logs; every bucket before it is closed."""
+    return bucket_start(utc_now() - SETTLE_LAG, interval)
+
+
+def bucket_start(moment: datetime, interval: str) -> datetime:
+    """Truncate a moment to the start of its hour, day or week (weeks start on Monday), matching $dateTrunc."""
+    moment = to_utc(moment)
+    if interval == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def bucket_state_id(product_id: str, interval: str) -> str:
+    """schema_meta key recording up to when a product's closed buckets have been computed."""
+    return f"{BUCKET_COLLECTION}:{product_id}:{interval}"
+
+
+def numeric_price_expression(field: str) -> Dict:
+    """Aggregation expression reading a price as a double, whether it is stored as a number or as '£ 449.00'."""
+    stripped = {"$replaceAll": {
+        "input": {"$replaceAll": {"input": {"$toString": f"${field}"}, "find": "£", "replacement": ""}},
+        "find": ",", "replacement": ""
+    }}
+    return {"$cond": [
+        {"$isNumber": f"${field}"},
+        f"${field}",
+        {"$convert": {"input": {"$trim": {"input": stripped}}, "to": "double", "onError": None, "onNull": None}}
+    ]}
+
+
+def summary_pipeline(product_id: str, interval: str, start: datetime | None, end: datetime) -> List[Dict]:
+    """
+    Build the pipeline that groups a product's price logs into buckets.
+    Args:
+        product_id: Product whose logs are summarised.
+        interval: Bucket size, one of INTERVALS.
+        start: Inclusive lower bound on date_checked, or None for the first log.
+        end: Exclusive upper bound on date_checked.
+    Returns:
+        Pipeline stages yielding one document per non-empty bucket, in bucket order.
+    """
+    date_range = {"$lt": end}
+    if start is not None:
+        date_range["$gte"] = start
+
+    truncate = {"date": "$date_checked", "unit": interval}
+    if interval == "week":
+        truncate["startOfWeek"] = "monday"
+
+    return [
+        {"$match": {"product_id": product_id, "date_checked": date_range}},
+        {"$sort": {"date_checked": 1}},
+        {"$addFields": {"numeric_price": numeric_price_expression("current_price")}},
+        {"$group": {
+            "_id": {"$dateTrunc": truncate},
+            "min": {"$min": "$numeric_price"},
+            "max": {"$max": "$numeric_price"},
+            "avg": {"$avg": "$numeric_price"},
+            "first": {"$first": "$numeric_price"},
+            "last": {"$last": "$numeric_price"},
+            "count": {"$sum": 1}
+        }},
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "bucket": "$_id", "min": 1, "max": 1, "avg": 1, "first": 1, "last": 1, "count": 1}}
+    ]
+
+
+def daily_rollup_pipeline(start: datetime | None, end: datetime) -> List[Dict]:
+    """
+    Build the pipeline that merges per-product daily summaries of the logs in [start, end) into price_daily.
+    Args:
+        start: Inclusive lower bound on date_checked, or None to roll up from the first log.
+        end: Exclusive upper bound on date_checked.
+    Returns:
+        Pipeline stages ending in a $merge, so the rollup runs entirely on the server.
+    """
+    date_range = {"$lt": end}
+    if start is not None:
+        date_range["$gte"] = start
+
+    return [
+        {"$match": {"date_checked": date_range}},
+        {"$sort": {"date_checked": 1}},
+        {"$addFields": {"numeric_price": numeric_price_expression("current_price")}},
+        {"$group": {
+            "_id": {"product_id": "$product_id", "day": {"$dateTrunc": {"date": "$date_checked", "unit": "day"}}},
+            "open": {"$first": "$numeric_price"},
+            "high": {"$max": "$numeric_price"},
+            "low": {"$min": "$numeric_price"},
+            "close": {"$last": "$numeric_price"},
+            "avg": {"$avg": "$numeric_price"},
+            "count": {"$sum": 1}
+        }},
+        {"$project": {
+            "_id": 0, "product_id": "$_id.product_id", "day": "$_id.day",
+            "open": 1, "high": 1, "low": 1, "close": 1, "avg": 1, "count": 1
+        }},
+        {"$merge": {
+            "into": DAILY_COLLECTION, "on": ["product_id", "day"],
+            "whenMatched": "replace", "whenNotMatched": "insert"
+        }}
+    ]
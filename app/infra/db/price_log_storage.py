@@ -0,0 +1,108 @@
+import os
+from typing import Dict
+
+import pymongo
+from pymongo.database import Database
+from pymongo.errors import CollectionInvalid
+
+from app.infra.log_service import logger
+
+DOCUMENT_COLLECTION = "price_log"
+TIMESERIES_COLLECTION = "price_log_ts"
+STORAGE_MODES = ("document", "timeseries")
+PRICE_FIELDS = ("previous_price", "current_price")
+CURRENCY_SYMBOL = "£"
+TIMESERIES_MIN_SERVER_VERSION = (7, 0)
+
+
+def get_storage_mode() -> str:
+    """
+    Return the configured price log storage mode.
+    PRICE_LOG_STORAGE=document keeps one plain document per check in price_log (the default);
+    PRICE_LOG_STORAGE=timeseries stores checks in a MongoDB time-series collection with numeric prices.
+    Time-series mode needs MongoDB 7.0 or later: earlier servers only delete time-series documents
+    by their metaField, so retention (by date_checked) and deleting a single log (by _id) fail there.
+    """
+    mode = os.getenv('PRICE_LOG_STORAGE', 'document').strip().lower()
+    if mode not in STORAGE_MODES:
+        logger.warning(f"Unknown PRICE_LOG_STORAGE '{mode}', falling back to document storage")
+        return "document"
+    return mode
+
+
+def price_log_collection_name() -> str:
+    """Return the name of the collection price logs are read from and written to."""
+    return TIMESERIES_COLLECTION if get_storage_mode() == "timeseries" else DOCUMENT_COLLECTION
+
+
+def price_log_collection(db: Database):
+    """Return the price log collection for the configured storage mode, creating the time-series collection if needed."""
+    if get_storage_mode() == "timeseries":
+        ensure_timeseries_collection(db)
+    return db[price_log_collection_name()]
+
+
+def ensure_timeseries_collection(db: Database) -> None:
+    """
+    Create the time-series collection and its secondary indexes if they do not exist yet.
+    Readings are bucketed by product_id (the metaField) so the product id is stored once per bucket.
+    """
+    if TIMESERIES_COLLECTION in db.list_collection_names(filter={"name": TIMESERIES_COLLECTION}):
+        return
+
+    server_version = tuple(db.client.server_info().get("versionArray", [])[:2])
+    if server_version and server_version < TIMESERIES_MIN_SERVER_VERSION:
+        logger.warning(
+            f"MongoDB {'.'.join(map(str, server_version))} cannot delete time-series price logs by date or _id; "
+            f"price log retention and deletes need MongoDB {'.'.join(map(str, TIMESERIES_MIN_SERVER_VERSION))}+"
+        )
+
+    try:
+        db.create_collection(
+            TIMESERIES_COLLECTION,
+            timeseries={"timeField": "date_checked", "metaField": "product_id", "granularity": "hours"}
+        )
+    except CollectionInvalid:
+        return
+
+    collection = db[TIMESERIES_COLLECTION]
+    collection.create_index([("date_checked", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)])
+    collection.create_index([
+        ("product_id", pymongo.ASCENDING), ("date_checked", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)
+    ])
+    logger.info(f"Created time-series collection {TIMESERIES_COLLECTION}")
+
+
+def parse_stored_price(value) -> float | None:
+    """Convert a price string like '£ 449.00' to a float, leaving numbers and missing values alone."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        return float(str(value).replace(CURRENCY_SYMBOL, "").replace(",", "").strip())
+    except ValueError:
+        return None
+
+
+def format_stored_price(value) -> str | None:
+    """Convert a stored numeric price back to the '£ 449.00' form the API returns."""
+    if value is None or isinstance(value, str):
+        return value
+    return f"{CURRENCY_SYMBOL} {value:.2f}"
+
+
+def encode_price_log(document: Dict) -> Dict:
+    """Convert a price log to its time-series form, with numeric prices."""
+    encoded = dict(document)
+    for field in PRICE_FIELDS:
+        if field in encoded:
+            encoded[field] = parse_stored_price(encoded[field])
+    return encoded
+
+
+def decode_price_log(document: Dict) -> Dict:
+    """Convert a time-series price log back to the document form, with formatted price strings."""
+    decoded = dict(document)
+    for field in PRICE_FIELDS:
+        if field in decoded:
+            decoded[field] = format_stored_price(decoded[field])
+    return decoded
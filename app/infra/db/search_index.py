@@ -0,0 +1,175 @@
+import math
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Set
+
+from pymongo import UpdateOne
+
+from app.infra.log_service import logger
+
+SEARCH_FIELD = "search_grams"
+SEARCHABLE_FIELDS = ("name", "product_name")
+MIN_SCORE = 0.4
+BACKFILL_BATCH_SIZE = 500
+COMMON_GRAM_SHARE = 0.5
+GRAM_FREQUENCY_TTL_SECONDS = 10 * 60
+GRAM_FREQUENCY_PIPELINE = [
+    {"$project": {SEARCH_FIELD: 1}},
+    {"$unwind": f"${SEARCH_FIELD}"},
+    {"$group": {"_id": f"${SEARCH_FIELD}", "count": {"$sum": 1}}}
+]
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+PRODUCT_PROJECTION = {SEARCH_FIELD: 0}
+
+
+def words(text: str | None) -> List[str]:
+    """Lower-case, accent-folded words of a piece of text."""
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    return WORD_PATTERN.findall(folded)
+
+
+def trigrams(word: str) -> Set[str]:
+    return {word[index:index + 3] for index in range(len(word) - 2)}
+
+
+def document_grams(document: Dict) -> List[str]:
+    """
+    Terms a product is indexed under: trigrams of every word padded with spaces,
+    plus one- and two-letter word prefixes so very short queries still match.
+    """
+    grams = set()
+    for field in SEARCHABLE_FIELDS:
+        for word in words(document.get(field)):
+            grams |= trigrams(f" {word} ")
+            grams |= {f"^{word[:length]}" for length in (1, 2)}
+    return sorted(grams)
+
+
+def query_grams(search_term: str) -> List[str]:
+    """
+    Terms a search is matched on. Words are padded only at the front so a partly typed word
+    matches as a prefix, and words shorter than three letters match on their prefix term.
+    """
+    grams = set()
+    for word in words(search_term):
+        if len(word) < 3:
+            grams.add(f"^{word}")
+        else:
+            grams |= trigrams(f" {word}")
+    return sorted(grams)
+
+
+def with_search_grams(document: Dict) -> Dict:
+    """Return a copy of a product document carrying its search terms."""
+    indexed = dict(document)
+    indexed[SEARCH_FIELD] = document_grams(document)
+    return indexed
+
+
+class GramFrequencies:
+    """
+    How many products carry each search term, refreshed every few minutes.
+    Terms found in most of the catalog, such as the brand name, say nothing about which product
+    was meant and would pull every product into scoring, so they are left out of searches.
+    """
+    def __init__(self, counts: Dict[str, int] | None = None, total: int = 0):
+        self.counts = counts or {}
+        self.total = total
+        self.loaded_at = time.monotonic() if counts is not None else None
+
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > GRAM_FREQUENCY_TTL_SECONDS
+
+
+    def prune(self, grams: List[str]) -> List[str]:
+        """Drop terms carried by more than COMMON_GRAM_SHARE of the products, unless every term is that common."""
+        threshold = self.total * COMMON_GRAM_SHARE
+        selective = [gram for gram in grams if self.counts.get(gram, 0) <= threshold]
+        return selective or grams
+
+
+    def candidates(self, grams: List[str]) -> List[str]:
+        """
+        The rarest terms a product must share at least one of to reach MIN_SCORE.
+        A product needs ceil(MIN_SCORE * n) of the n query terms, so it always holds
+        one of the n - ceil(MIN_SCORE * n) + 1 rarest ones.
+        """
+        required = max(1, math.ceil(MIN_SCORE * len(grams)))
+        ranked = sorted(grams, key=lambda gram: (self.counts.get(gram, 0), gram))
+        return ranked[:len(grams) - required + 1]
+
+
+gram_frequencies = GramFrequencies()
+gram_frequencies_lock = threading.Lock()
+
+
+def gram_frequencies_from(rows: List[Dict], total: int) -> GramFrequencies:
+    global gram_frequencies
+    with gram_frequencies_lock:
+        gram_frequencies = GramFrequencies({row["_id"]: row["count"] for row in rows}, total)
+        return gram_frequencies
+
+
+def load_gram_frequencies(collection) -> GramFrequencies:
+    """Return the term counts of the product catalog, counting them again once they are stale."""
+    if not gram_frequencies.is_stale():
+        return gram_frequencies
+    try:
+        return gram_frequencies_from(
+            list(collection.aggregate(GRAM_FREQUENCY_PIPELINE)), collection.estimated_document_count()
+        )
+    except Exception as e:
+        logger.warning(f"Could not count search terms, searching on every term: {e}")
+        return gram_frequencies
+
+
+async def load_gram_frequencies_async(collection) -> GramFrequencies:
+    """Async variant of load_gram_frequencies."""
+    if not gram_frequencies.is_stale():
+        return gram_frequencies
+    try:
+        cursor = await collection.aggregate(GRAM_FREQUENCY_PIPELINE)
+        return gram_frequencies_from(await cursor.to_list(None), await collection.estimated_document_count())
+    except Exception as e:
+        logger.warning(f"Could not count search terms, searching on every term: {e}")
+        return gram_frequencies
+
+
+def search_pipeline(grams: List[str], skip: int, limit: int, frequencies: GramFrequencies) -> List[Dict]:
+    """
+    Build the pipeline that finds products sharing terms with the query through the multikey index,
+    scores them by the share of query terms they contain and returns them best match first.
+    Only the rarest terms go to the index, enough that no product reaching MIN_SCORE is missed.
+    """
+    return [
+        {"$match": {SEARCH_FIELD: {"$in": frequencies.candidates(grams)}}},
+        {"$addFields": {"score": {"$divide": [
+            {"$size": {"$setIntersection": [f"${SEARCH_FIELD}", grams]}}, len(grams)
+        ]}}},
+        {"$match": {"score": {"$gte": MIN_SCORE}}},
+        {"$sort": {"score": -1, "product_name": 1, "_id": 1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": {SEARCH_FIELD: 0}}
+    ]
+
+
+def backfill_search_grams(collection) -> int:
+    """Add search terms to every product that does not have them yet."""
+    updated = 0
+    operations = []
+    for document in collection.find({SEARCH_FIELD: {"$exists": False}}, {field: 1 for field in SEARCHABLE_FIELDS}):
+        operations.append(UpdateOne({"_id": document["_id"]}, {"$set": {SEARCH_FIELD: document_grams(document)}}))
+        if len(operations) >= BACKFILL_BATCH_SIZE:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    return updated
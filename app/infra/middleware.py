@@ -12,6 +12,7 @@ class ExceptionMiddleware(BaseHTTPMiddleware):
         ParsingError: status.HTTP_500_INTERNAL_SERVER_ERROR,
         PriceLoggingError: status.HTTP_500_INTERNAL_SERVER_ERROR,
         FailedRequestError: status.HTTP_400_BAD_REQUEST,
+        CircuitOpenError: status.HTTP_503_SERVICE_UNAVAILABLE,
         NotFailedTaskError: status.HTTP_400_BAD_REQUEST,
         URLNotFoundError: status.HTTP_400_BAD_REQUEST,
         DocNotFoundError: status.HTTP_404_NOT_FOUND,
@@ -19,6 +20,8 @@ class ExceptionMiddleware(BaseHTTPMiddleware):
         DuplicateEntityError: status.HTTP_409_CONFLICT,
         EmptySearchError: status.HTTP_400_BAD_REQUEST,
         InvalidIdError: status.HTTP_400_BAD_REQUEST,
+        InvalidCursorError: status.HTTP_400_BAD_REQUEST,
+        InvalidDateRangeError: status.HTTP_400_BAD_REQUEST,
         ExistingSubscriptionError: status.HTTP_409_CONFLICT,
         NotSubscribedError: status.HTTP_409_CONFLICT,
         EmailFailedError: status.HTTP_500_INTERNAL_SERVER_ERROR,
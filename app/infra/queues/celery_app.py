@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 from app.infra.config import settings
 
 
@@ -20,6 +21,7 @@ celery_app.conf.update(
     result_extended=True,
     include=['app.domain.products.services.notification_service.tasks',
              'app.domain.price_logs.services.notification_service.tasks',
+             'app.domain.price_logs.services.tasks',
              'app.domain.subscribers.services.notification_service.tasks']
 )
 
@@ -27,9 +29,24 @@ celery_app.conf.update(
 celery_app.conf.task_routes = {
     "send_product_email_notification": {"queue": "default"},
     "send_price_email_notification": {"queue": "default"},
-    "send_subscription_email_notification": {"queue": "default"}
+    "send_price_email_batch": {"queue": "default"},
+    "send_subscription_email_notification": {"queue": "default"},
+    "rollup_daily_prices": {"queue": "default"},
+    "delete_old_price_logs": {"queue": "default"}
 
 }
 
 
+celery_app.conf.beat_schedule = {
+    "rollup-daily-prices": {
+        "task": "rollup_daily_prices",
+        "schedule": crontab(minute=10)
+    },
+    "delete-old-price-logs": {
+        "task": "delete_old_price_logs",
+        "schedule": crontab(minute=40, hour=0)
+    }
+}
+
+
 
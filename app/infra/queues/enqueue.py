@@ -2,12 +2,50 @@ from app.domain.price_logs.services.notification_service import tasks as price_t
 from app.domain.products.services.notification_service import tasks as product_tasks
 from app.domain.subscribers.services.notification_service import tasks as subscriber_tasks
 from app.infra.db.adapters.task_adapter import TaskAdapter
+from app.infra.queues.celery_app import celery_app
+from app.infra.config import settings
+from app.shared.batching import chunked
 from datetime import datetime,timezone
+from typing import Dict, Iterable, List, Tuple
 from app.infra.log_service import logger
 
-db = TaskAdapter()
+db = TaskAdapter.instance()
 
-now = datetime.now(timezone.utc)
+
+def enqueue_many(task, name: str, jobs: Iterable[Tuple[Dict, Dict]]) -> List[str]:
+    """
+    Queue many calls of one task, publishing each group of WRITE_BATCH_SIZE over a single broker
+    connection and recording the group's audit entries with one insert_many.
+
+    Args:
+        task: Celery task to queue
+        name (str): Audit name of the queued tasks
+        jobs: (task kwargs, audit payload) pairs
+
+    Returns:
+        list: Task IDs of the queued tasks, in job order
+    """
+    task_ids = []
+    for group in chunked(jobs, settings.WRITE_BATCH_SIZE):
+        with celery_app.producer_or_acquire() as producer:
+            results = [task.apply_async(kwargs=kwargs, producer=producer) for kwargs, _ in group]
+
+        queued_at = datetime.now(timezone.utc)
+        db.insert_task_audits([
+            {
+                "task_id": result.id,
+                "name": name,
+                "payload": payload,
+                "status": "QUEUED",
+                "created_at": queued_at,
+                "created_at_date": datetime.combine(queued_at.date(), datetime.min.time())
+            }
+            for result, (_, payload) in zip(results, group)
+        ])
+        task_ids.extend(result.id for result in results)
+
+    logger.info(f"Enqueue + audit log recorded for {len(task_ids)} {name} tasks")
+    return task_ids
 
 
 def queue_subscription_confirmation(to_email, name, product_name, unsubscribe_link):
@@ -33,6 +71,7 @@ def queue_subscription_confirmation(to_email, name, product_name, unsubscribe_li
         }
     )
 
+    queued_at = datetime.now(timezone.utc)
     task_info = {
         "task_id": task.id,
         "name": "subscription_notification",
@@ -44,8 +83,8 @@ def queue_subscription_confirmation(to_email, name, product_name, unsubscribe_li
             "unsubscribe_link": unsubscribe_link
         },
         "status": "QUEUED",
-        "created_at": now,
-        "created_at_date": datetime.combine(now.date(), datetime.min.time())
+        "created_at": queued_at,
+        "created_at_date": datetime.combine(queued_at.date(), datetime.min.time())
     }
 
     db.insert_task_audit(task_info)
@@ -75,6 +114,7 @@ def queue_unsubscribed_confirmation(to_email, name, product_name, subscription_l
         "subscription_link":subscription_link
     }
     )
+    queued_at = datetime.now(timezone.utc)
     db.insert_task_audit({
         "task_id": task.id,
         "name": "unsubscribed_confirmation",
@@ -86,8 +126,8 @@ def queue_unsubscribed_confirmation(to_email, name, product_name, subscription_l
             "subscription_link": subscription_link
         },
         "status": "QUEUED",
-        "created_at": now,
-        "created_at_date": datetime.combine(now.date(), datetime.min.time())
+        "created_at": queued_at,
+        "created_at_date": datetime.combine(queued_at.date(), datetime.min.time())
     })
 
     logger.info("Enqueue + audit log recorded")
@@ -127,6 +167,7 @@ def queue_price_change_notification(to_email, name, product_name, previous_price
             "product_link":product_link
         }
     )
+    queued_at = datetime.now(timezone.utc)
     db.insert_task_audit({
         "task_id": task.id,
         "name": "price_change",
@@ -142,8 +183,8 @@ def queue_price_change_notification(to_email, name, product_name, previous_price
             "product_link":product_link
         },
         "status": "QUEUED",
-        "created_at": now,
-        "created_at_date": datetime.combine(now.date(), datetime.min.time())
+        "created_at": queued_at,
+        "created_at_date": datetime.combine(queued_at.date(), datetime.min.time())
     })
 
     logger.info("Enqueue + audit log recorded")
@@ -171,6 +212,7 @@ def queue_product_removed_notification(to_email, name, product_name):
         }
 
     )
+    queued_at = datetime.now(timezone.utc)
     db.insert_task_audit({
         "task_id": task.id,
         "name": "product_removed",
@@ -180,10 +222,80 @@ def queue_product_removed_notification(to_email, name, product_name):
             "product_name": product_name
         },
         "status": "QUEUED",
-        "created_at": now,
-        "created_at_date": datetime.combine(now.date(), datetime.min.time())
+        "created_at": queued_at,
+        "created_at_date": datetime.combine(queued_at.date(), datetime.min.time())
     })
 
     logger.info("Enqueue + audit log recorded")
     return task.id
 
+
+
+def queue_price_change_batches(batches, product_name, previous_price, new_price,
+                               price_diff, change_type, date_checked, product_link):
+    """
+    Queue one price change email task per chunk of subscribers, publishing and auditing them in bulk.
+
+    Args:
+        batches (iterable): Lists of dictionaries with each subscriber's 'to_email' and 'name'
+        product_name (str): Name of the product with price change
+        previous_price (float): Previous price
+        new_price (float): New price
+        price_diff (float): Price difference
+        change_type (str): Type of change ('drop' or 'increase')
+        date_checked (str): Date when the price was checked
+        product_link (str): Link to the product
+
+    Returns:
+        list: Task IDs of the queued tasks
+    """
+    change = {
+        "product_name": product_name,
+        "previous_price": previous_price,
+        "new_price": new_price,
+        "price_diff": price_diff,
+        "change_type": change_type,
+        "date_checked": date_checked,
+        "product_link": product_link
+    }
+    jobs = (
+        (
+            {**change, "recipients": recipients},
+            {
+                **change,
+                "recipients": [recipient["to_email"] for recipient in recipients],
+                "recipient_count": len(recipients)
+            }
+        )
+        for recipients in batches
+    )
+    return enqueue_many(price_tasks.send_price_email_batch, "price_change_batch", jobs)
+
+
+def queue_product_removed_notifications(notifications):
+    """
+    Queue product removed notification emails for many subscribers, publishing and auditing them in bulk.
+
+    Args:
+        notifications (iterable): Dictionaries with each subscriber's 'to_email', 'name' and 'product_name'
+
+    Returns:
+        list: Task IDs of the queued tasks
+    """
+    jobs = (
+        (
+            {
+                "notification_type": "product_removed",
+                "to_email": notification["to_email"],
+                "name": notification["name"],
+                "product_name": notification["product_name"]
+            },
+            {
+                "to_email": notification["to_email"],
+                "name": notification["name"],
+                "product_name": notification["product_name"]
+            }
+        )
+        for notification in notifications
+    )
+    return enqueue_many(product_tasks.send_product_email_notification, "product_removed", jobs)
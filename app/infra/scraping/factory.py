@@ -0,0 +1,22 @@
+from app.infra.config import settings
+from app.infra.scraping.kitchenaid_scraper import Scraper
+from app.infra.scraping.throttle import get_shared_throttle
+
+
+def build_scraper(**overrides) -> Scraper:
+    """Build a Scraper configured from settings, sharing the process-wide host throttle."""
+    config = {
+        "concurrency": settings.SCRAPER_CONCURRENCY,
+        "per_host_limit": settings.SCRAPER_PER_HOST_LIMIT,
+        "parser": settings.SCRAPER_PARSER,
+        "parse_processes": settings.SCRAPER_PARSE_PROCESSES,
+        "max_retry_wait": settings.SCRAPER_MAX_RETRY_WAIT,
+        "throttle": get_shared_throttle(
+            rate=settings.SCRAPER_RATE_PER_HOST,
+            burst=settings.SCRAPER_BURST_PER_HOST,
+            failure_threshold=settings.SCRAPER_CIRCUIT_THRESHOLD,
+            reset_timeout=settings.SCRAPER_CIRCUIT_RESET_SECONDS
+        )
+    }
+    config.update(overrides)
+    return Scraper(**config)
@@ -1,16 +1,75 @@
 from datetime import timezone, datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+import threading
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from typing import Dict, Any, List
+from itertools import islice
+from typing import Dict, Any, List, Iterable, Iterator, Tuple
 from requests.exceptions import RequestException
-from app.shared.exceptions import FailedRequestError, ParsingError
+from app.shared.exceptions import FailedRequestError, ParsingError, CircuitOpenError
+from app.infra.scraping.validator_cache import ValidatorCache
+from app.infra.scraping.throttle import HostThrottle, get_shared_throttle
+from app.infra.scraping.parsers import (
+    StrainedProductSoup, ProductPageStreamParser, SelectolaxParser, extract_with_selectolax
+)
 from app.infra.log_service import logger
 
 
+PARSER_BACKENDS = ('html.parser', 'lxml', 'strainer', 'selectolax', 'stream')
+THROTTLE_STATUSES = (429, 503)
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that keeps the request and connection counts of the pools urllib3 discards.
+    The pool manager only holds pool_connections host pools and drops the least recently used one,
+    taking its counters with it, so totals read from the live pools alone would undercount.
+    """
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.counts_lock = threading.Lock()
+        self.retired_requests = 0
+        self.retired_connections = 0
+
+        pools = self.poolmanager.pools
+        dispose = pools.dispose_func
+
+        def retire(pool):
+            with self.counts_lock:
+                self.retired_requests += pool.num_requests
+                self.retired_connections += pool.num_connections
+            if dispose is not None:
+                dispose(pool)
+
+        pools.dispose_func = retire
+
+
+    def counts(self) -> Tuple[int, int]:
+        """Return requests sent and connections opened by every pool this adapter has used."""
+        with self.counts_lock:
+            requests_sent, connections_opened = self.retired_requests, self.retired_connections
+
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+        return requests_sent, connections_opened
+
+
 class Scraper:
     """Scraper for extracting product information"""
-    def __init__(self, timeout: int = 10, max_retries: int = 3):
+    def __init__(
+        self, timeout: int = 10, max_retries: int = 3, concurrency: int = 8,
+        per_host_limit: int = 4, pool_size: int | None = None,
+        validator_cache: ValidatorCache | None = None, parser: str = 'html.parser',
+        parse_processes: int = 0, throttle: HostThrottle | None = None, max_retry_wait: float = 30.0
+    ):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9',
@@ -19,35 +78,158 @@ class Scraper:
         }
         self.timeout = timeout
         self.max_retries = max_retries
+        self.concurrency = max(1, concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self.host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self.host_slots_lock = threading.Lock()
+        self.session = self.build_session(pool_size or self.concurrency)
+        self.validators = validator_cache
+        self.parser = self.validate_parser(parser)
+        self.parse_processes = max(0, parse_processes)
+        self.throttle = throttle or get_shared_throttle()
+        self.max_retry_wait = max_retry_wait
+
 
+    @staticmethod
+    def validate_parser(parser: str) -> str:
+        """Check that a parser backend is known and its library is installed."""
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend: {parser}. Choose from {', '.join(PARSER_BACKENDS)}")
+
+        if parser == 'selectolax' and SelectolaxParser is None:
+            raise ValueError("Parser backend 'selectolax' requires the selectolax package")
+
+        if parser == 'lxml':
+            try:
+                import lxml  # noqa: F401
+            except ImportError:
+                raise ValueError("Parser backend 'lxml' requires the lxml package")
+
+        return parser
 
 
-    def make_request(self, url: str) -> requests.Response:
+    def build_session(self, pool_size: int) -> requests.Session:
         """
-        Make HTTP request with retries.
+        Build the long-lived session shared by every request this scraper makes.
+        Connections are kept alive and pooled per host so repeat fetches skip the TCP/TLS handshake.
+        requests speaks HTTP/1.1 only, so keep-alive reuse is what replaces HTTP/2 multiplexing here.
+        Args:
+            pool_size: Maximum number of connections kept open per host
+        Returns:
+            Configured requests session
+        """
+        adapter = CountingHTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Return counts of requests sent and connections opened by the session, including discarded pools."""
+        requests_sent = connections_opened = 0
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+
+        for adapter in adapters.values():
+            if not isinstance(adapter, CountingHTTPAdapter):
+                continue
+            adapter_requests, adapter_connections = adapter.counts()
+            requests_sent += adapter_requests
+            connections_opened += adapter_connections
+
+        return {
+            "requests": requests_sent,
+            "connections_opened": connections_opened,
+            "connections_reused": max(requests_sent - connections_opened, 0)
+        }
+
+
+    def confirm_validators(self, url: str) -> None:
+        """Use a page's validators for later conditional requests, once the data scraped from it is stored."""
+        if self.validators:
+            self.validators.confirm(url)
+
+
+    def close(self) -> None:
+        """Close the pooled session and release its connections."""
+        self.session.close()
+
+
+    def host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Return the semaphore capping in-flight requests to the host of the given URL."""
+        host = urlparse(url).netloc
+        with self.host_slots_lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self.host_slots[host]
+
+
+    def make_request(self, url: str, conditional: bool = False) -> requests.Response:
+        """
+        Make HTTP request with retries, paced by the host's rate limiter and guarded by its circuit breaker.
         Args:
             url: The URL to request
+            conditional: Send cached validators so an unchanged page comes back as a bodiless 304.
+                The validators of a full response are held until confirm_validators is called
         Returns:
-            Response object or None if all attempts fail
+            Response object
+        Raises:
+            CircuitOpenError: The host's circuit is open, so no request was sent
+            FailedRequestError: Every attempt failed, or retrying would not help
         """
+        headers = {}
+        if conditional and self.validators:
+            headers = self.validators.conditional_headers(url)
+
+        host = urlparse(url).netloc
+        breaker = self.throttle.breaker(host)
+
         for attempt in range(self.max_retries):
+            if not breaker.allow():
+                raise CircuitOpenError(host=host, retry_in=breaker.retry_in())
+
             try:
-                session = requests.Session()
-                response = session.get(url, headers=self.headers, timeout=self.timeout)
+                self.throttle.bucket(host).acquire()
+                with self.host_slot(url):
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
 
-                if response.status_code == 200:
-                    return response
+            except RequestException as e:
+                self.throttle.record_failure(host)
+                logger.warning(f"Request exception on attempt {attempt + 1}/{self.max_retries}: {e}")
+                continue
 
-                logger.warning(f"Attempt {attempt + 1}/{self.max_retries} failed with status {response.status_code}")
+            if response.status_code == 200:
+                self.throttle.record_success(host)
+                if conditional and self.validators:
+                    self.validators.hold(url, response)
+                return response
 
-                if attempt < self.max_retries - 1:
-                    sleep_time = 2 ** attempt
-                    logger.info(f"Waiting {sleep_time} seconds before retrying...")
-                    time.sleep(sleep_time)
+            if response.status_code == 304 and headers:
+                self.throttle.record_success(host)
+                return response
 
+            logger.warning(f"Attempt {attempt + 1}/{self.max_retries} failed with status {response.status_code}")
 
-            except RequestException as e:
-                logger.warning(f"Request exception on attempt {attempt + 1}/{self.max_retries}: {e}")
+            if response.status_code in THROTTLE_STATUSES:
+                retry_after = self.throttle.parse_retry_after(response.headers.get("Retry-After"))
+                wait_time = self.throttle.record_throttled(host, retry_after)
+            elif response.status_code >= 500 or response.status_code == 408:
+                self.throttle.record_failure(host)
+                wait_time = 2 ** attempt
+            else:
+                self.throttle.record_success(host)
+                break
+
+            if attempt == self.max_retries - 1:
+                break
+
+            if wait_time > self.max_retry_wait:
+                logger.warning(f"Not retrying {url}: {host} needs {wait_time:.0f} seconds to recover")
+                break
+
+            logger.info(f"Waiting {wait_time:.1f} seconds before retrying...")
+            time.sleep(wait_time)
 
         raise FailedRequestError(
             detail=f"All {self.max_retries} attempts failed for URL: {url}",
@@ -76,8 +258,13 @@ class Scraper:
 
 
     @staticmethod
-    def check_availability(soup: BeautifulSoup) -> int|None:
-        """Check product availability based on button text."""
+    def check_availability(soup: BeautifulSoup, page_text: str | None = None) -> int|None:
+        """
+        Check product availability based on button text, falling back to the text of the whole page.
+        Args:
+            soup: Parsed page
+            page_text: The page's text when the soup does not hold all of it. Defaults to soup.get_text()
+        """
         unavailable_btn = soup.find(
             'button',
             class_='c-CKPQg c-CKPQg-hnGDME-size-lg c-CKPQg-ijEYedS-css',
@@ -89,7 +276,7 @@ class Scraper:
             class_='c-CKPQg c-CKPQg-hnGDME-size-lg c-CKPQg-fTYkTT-leftIcon-true c-CKPQg-iUsihs-css',
             string=lambda text: text and "Add to cart" in text
             )
-        page_text = soup.get_text().lower()
+        page_text = (soup.get_text() if page_text is None else page_text).lower()
 
         if available_btn or 'add to cart' in page_text:
             return True
@@ -111,77 +298,230 @@ class Scraper:
         return None
 
 
-    def scrape_product(self, product: dict) -> dict:
+    @staticmethod
+    def parse_page(content: bytes, parser: str = 'html.parser') -> Dict[str, Any]:
+        """
+        Extract the product fields from a raw page with the chosen parser backend.
+        Args:
+            content: Raw HTML bytes
+            parser: One of PARSER_BACKENDS.
+                'html.parser' and 'lxml' build a full soup,
+                'strainer' only builds the tags the extractors read,
+                'selectolax' uses its CSS engine,
+                'stream' stops reading once every field is found
+        Returns:
+            Dictionary of product_name, price, img_url and is_available
+        """
+        if parser == 'stream':
+            return ProductPageStreamParser().parse(content)
+
+        if parser == 'selectolax':
+            return extract_with_selectolax(content)
+
+        if parser == 'strainer':
+            soup = StrainedProductSoup(content)
+            page_text = soup.page_text
+        else:
+            soup = BeautifulSoup(content, parser)
+            page_text = None
+
+        return {
+            'product_name': Scraper.extract_product_name(soup),
+            'price': Scraper.extract_price(soup),
+            'img_url': Scraper.extract_image_url(soup),
+            'is_available': Scraper.check_availability(soup, page_text)
+        }
+
+
+    def scrape_product(self, product: dict, conditional: bool = False) -> dict:
         """
         Scrape product information from the given URL.
         Args:
             product: Dictionary of the product name and  URL
+            conditional: Skip parsing when the page is unchanged since it was last fetched
         Returns:
-            Dictionary containing product data or error status
+            Dictionary containing product data or error status.
+            An unchanged page returns status 'not_modified' with no extracted fields.
         """
         name , url = product['name'], product['url']
         logger.info(f"Scraping for {name}")
-        response=self.make_request(url)
+        response=self.make_request(url, conditional=conditional)
+
+        if response.status_code == 304:
+            return self.build_not_modified_data(name, url)
 
         try:
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            product_name = self.extract_product_name(soup)
-            price = self.extract_price(soup)
-            image_url = self.extract_image_url(soup)
-            availability = self.check_availability(soup)
-            data = {
-                'name': name,
-                'product_name': product_name,
-                'url': url,
-                'price': price,
-                'img_url': image_url,
-                'is_available': availability,
-                'date_checked': datetime.now(timezone.utc),
-                'status': 'success'
-            }
-            missing_data = [field for field, value in data.items()
-                            if value is None and field != 'status'
-                    ]
-            if missing_data:
-                logger.info(f"Missing data fields: {', '.join(missing_data)}")
+            fields = self.parse_page(response.content, self.parser)
+            return self.build_product_data(name, url, fields)
+
+        except Exception as e:
+            raise ParsingError(url = url, error = str(e))
+
+
+    @staticmethod
+    def build_not_modified_data(name: str, url: str) -> dict:
+        """Assemble the result for a page that is unchanged since it was last fetched."""
+        logger.info(f"{name} unchanged since last fetch")
+        return {
+            'name': name,
+            'product_name': None,
+            'url': url,
+            'price': None,
+            'img_url': None,
+            'is_available': None,
+            'date_checked': datetime.now(timezone.utc),
+            'status': 'not_modified'
+        }
 
 
-            return data
+    @staticmethod
+    def build_product_data(name: str, url: str, fields: Dict[str, Any]) -> dict:
+        """Assemble the scraped product dictionary from the extracted page fields."""
+        data = {
+            'name': name,
+            'product_name': fields['product_name'],
+            'url': url,
+            'price': fields['price'],
+            'img_url': fields['img_url'],
+            'is_available': fields['is_available'],
+            'date_checked': datetime.now(timezone.utc),
+            'status': 'success'
+        }
+        missing_data = [field for field, value in data.items()
+                        if value is None and field != 'status'
+                ]
+        if missing_data:
+            logger.info(f"Missing data fields: {', '.join(missing_data)}")
+
+        return data
+
+
+    def scrape_product_safely(self, product: Dict[str, str], conditional: bool = False) -> Dict[str, Any] | None:
+        """Scrape a single product, logging and swallowing failures so a batch can carry on."""
+        name = product['name']
+        try:
+            return self.scrape_product(product, conditional=conditional)
+
+        except FailedRequestError as e:
+            logger.error(f"Failed to request {name}: {str(e)}")
+
+        except CircuitOpenError as e:
+            logger.error(f"Skipped {name}: {e.log}")
+
+        except ParsingError as e:
+            logger.error(f"Failed to parse {name}: {str(e)}")
 
         except Exception as e:
-            raise ParsingError(url = url, error = str(e))
+            logger.error(f"Unexpected error processing {name}: {str(e)}")
+
+        return None
 
 
-    def scrape_products(self, product_list: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    def scrape_products(self, product_list: List[Dict[str, str]], concurrency: int | None = None) -> List[Dict[str, Any]]:
         """
-        Scrape multiple products and return their data.
+        Scrape multiple products concurrently and return their data.
         Args:
             product_list: List of product dictionaries with 'name' and 'url' keys
+            concurrency: Maximum number of products scraped at once. Defaults to the scraper's limit
         Returns:
-            List of product data dictionaries
+            List of product data dictionaries, in the order of product_list.
+            When parse_processes is set, pages are parsed in a process pool and the list is in arrival order
         """
-        results = []
-        for product in product_list:
-            name, url = product['name'], product['url']
-            logger.info(f"Scraping for {product['name']}")
-            try:
-                data = self.scrape_product(product)
-                results.append(data)
+        if not product_list:
+            return []
 
-            except FailedRequestError as e:
-                logger.error(f"Failed to request {name}: {str(e)}")
+        if self.parse_processes:
+            return list(self.pipeline_scrape_products(product_list, concurrency=concurrency))
 
-            except ParsingError as e:
-                logger.error(f"Failed to parse {name}: {str(e)}")
-                continue
+        workers = min(concurrency or self.concurrency, len(product_list))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+            results = executor.map(self.scrape_product_safely, product_list)
+            return [data for data in results if data is not None]
 
-            except Exception as e:
-                logger.error(f"Unexpected error processing {name}: {str(e)}")
-                continue
 
+    def iter_scrape_products(
+        self, product_list: Iterable[Dict[str, str]], concurrency: int | None = None, conditional: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Scrape products concurrently, yielding each one as soon as it completes.
+        Only a bounded window of products is in flight, so memory stays flat however long the input is.
+        Args:
+            product_list: Iterable of product dictionaries with 'name' and 'url' keys
+            concurrency: Maximum number of products scraped at once. Defaults to the scraper's limit
+            conditional: Skip parsing pages that are unchanged since they were last fetched
+        Yields:
+            Product data dictionaries in completion order
+        """
+        if self.parse_processes:
+            yield from self.pipeline_scrape_products(list(product_list), concurrency=concurrency, conditional=conditional)
+            return
 
-        return results
+        workers = concurrency or self.concurrency
+        products = iter(product_list)
 
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+            pending = {executor.submit(self.scrape_product_safely, product, conditional) for product in islice(products, workers * 2)}
 
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for product in islice(products, len(done)):
+                    pending.add(executor.submit(self.scrape_product_safely, product, conditional))
+
+                for future in done:
+                    data = future.result()
+                    if data is not None:
+                        yield data
+
+
+    def pipeline_scrape_products(
+        self, product_list: List[Dict[str, str]], concurrency: int | None = None,
+        processes: int | None = None, conditional: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch pages on a thread pool and parse them on a process pool, so parsing never blocks fetching.
+        Args:
+            product_list: List of product dictionaries with 'name' and 'url' keys
+            concurrency: Maximum number of pages fetched at once. Defaults to the scraper's limit
+            processes: Number of parser processes. Defaults to parse_processes, or one per core
+            conditional: Skip parsing pages that are unchanged since they were last fetched
+        Yields:
+            Product data dictionaries in the order their parsing completes
+        """
+        if not product_list:
+            return
+
+        workers = min(concurrency or self.concurrency, len(product_list))
+        processes = processes or self.parse_processes or None
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as io_pool, \
+                ProcessPoolExecutor(max_workers=processes) as parse_pool:
+
+            jobs = {
+                io_pool.submit(self.make_request, product['url'], conditional): ('fetch', product)
+                for product in product_list
+            }
 
+            while jobs:
+                done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, product = jobs.pop(future)
+                    name, url = product['name'], product['url']
+
+                    try:
+                        if stage == 'fetch':
+                            response = future.result()
+                            if response.status_code == 304:
+                                yield self.build_not_modified_data(name, url)
+                                continue
+                            jobs[parse_pool.submit(Scraper.parse_page, response.content, self.parser)] = ('parse', product)
+                        else:
+                            yield self.build_product_data(name, url, future.result())
+
+                    except FailedRequestError as e:
+                        logger.error(f"Failed to request {name}: {str(e)}")
+
+                    except CircuitOpenError as e:
+                        logger.error(f"Skipped {name}: {e.log}")
+
+                    except Exception as e:
+                        logger.error(f"Failed to parse {name}: {str(e)}")
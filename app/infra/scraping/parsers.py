@@ -0,0 +1,221 @@
+from html.parser import HTMLParser
+from typing import Dict, Any, List
+from bs4 import BeautifulSoup, CData, SoupStrainer
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+
+NAME_CLASS = 'c-dZSbvE'
+PRICE_CLASS = 'c-bULnVn c-bULnVn-icWEoxs-css'
+IMAGE_CONTAINER_CLASS = 'c-dvzBLj'
+AVAILABLE_TEXT = 'add to cart'
+UNAVAILABLE_TEXT = 'e-mail me when available'
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Tags whose text BeautifulSoup's get_text leaves out, so no backend counts it as page text
+TEXTLESS_TAGS = ('script', 'style', 'template', 'rt', 'rp')
+
+
+def class_string(attrs: Dict[str, Any]) -> str:
+    """Return the class attribute as a single string, whether it arrives split or not."""
+    classes = attrs.get('class') or ''
+    if isinstance(classes, (list, tuple)):
+        return ' '.join(classes)
+    return classes
+
+
+def is_product_field(name: str, attrs: Dict[str, Any]) -> bool:
+    """Match only the tags the extractors read, so everything else is skipped while parsing."""
+    if name in ('h1', 'button'):
+        return True
+    if name == 'div':
+        classes = class_string(attrs)
+        return classes == PRICE_CLASS or IMAGE_CONTAINER_CLASS in classes.split()
+    return False
+
+
+PRODUCT_FIELDS_STRAINER = SoupStrainer(is_product_field)
+
+
+class StrainedProductSoup(BeautifulSoup):
+    """
+    Soup that only builds the tags the extractors read, while still collecting the page text
+    get_text would return on a full soup, for the page-wide availability check.
+    """
+    def __init__(self, content: bytes):
+        super().__init__(content, 'html.parser', parse_only=PRODUCT_FIELDS_STRAINER)
+
+
+    def reset(self):
+        super().reset()
+        self.page_text_parts: List[str] = []
+        self.textless_tags: List[str] = []
+
+
+    def handle_starttag(self, name, *args, **kwargs):
+        if name in TEXTLESS_TAGS:
+            self.textless_tags.append(name)
+        return super().handle_starttag(name, *args, **kwargs)
+
+
+    def handle_endtag(self, name, nsprefix=None):
+        super().handle_endtag(name, nsprefix)
+        if name in self.textless_tags:
+            del self.textless_tags[len(self.textless_tags) - 1 - self.textless_tags[::-1].index(name):]
+
+
+    def endData(self, containerClass=None):
+        if self.current_data and containerClass in (None, CData) and not self.textless_tags:
+            self.page_text_parts.append(''.join(self.current_data))
+        return super().endData(containerClass)
+
+
+    @property
+    def page_text(self) -> str:
+        return ''.join(self.page_text_parts)
+
+
+class ProductPageStreamParser(HTMLParser):
+    """
+    Incremental parser that extracts the product fields from raw HTML and
+    stops as soon as the name, price, image and an available marker have been seen.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.fields = {'product_name': None, 'price': None, 'img_url': None, 'is_available': None}
+        self.seen = set()
+        self.capture_field = None
+        self.capture_tag = None
+        self.capture_depth = 0
+        self.buffer = []
+        self.image_container_depth = 0
+        self.text_tail = ''
+        self.saw_unavailable = False
+        self.textless_depth = 0
+
+
+    @property
+    def done(self) -> bool:
+        """Whether every field is settled and the rest of the page can be skipped."""
+        return self.seen >= {'product_name', 'price', 'img_url'} and self.fields['is_available'] is True
+
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in TEXTLESS_TAGS:
+            self.textless_depth += 1
+
+        if self.capture_field and tag == self.capture_tag:
+            self.capture_depth += 1
+
+        if self.image_container_depth:
+            if tag == 'div':
+                self.image_container_depth += 1
+            elif tag == 'img' and 'img_url' not in self.seen:
+                self.seen.add('img_url')
+                self.fields['img_url'] = attrs.get('src') or None
+                self.image_container_depth = 0
+
+        if self.capture_field:
+            return
+
+        classes = class_string(attrs)
+        if tag == 'h1' and 'product_name' not in self.seen and NAME_CLASS in classes.split():
+            self.start_capture('product_name', tag)
+        elif tag == 'div' and 'price' not in self.seen and classes == PRICE_CLASS:
+            self.start_capture('price', tag)
+        elif (tag == 'div' and 'img_url' not in self.seen and not self.image_container_depth
+              and IMAGE_CONTAINER_CLASS in classes.split()):
+            self.image_container_depth = 1
+
+
+    def handle_endtag(self, tag):
+        if tag in TEXTLESS_TAGS and self.textless_depth:
+            self.textless_depth -= 1
+
+        if self.image_container_depth and tag == 'div':
+            self.image_container_depth -= 1
+            if not self.image_container_depth:
+                self.seen.add('img_url')
+
+        if self.capture_field and tag == self.capture_tag:
+            self.capture_depth -= 1
+            if not self.capture_depth:
+                text = ''.join(self.buffer).strip()
+                self.fields[self.capture_field] = text or None
+                self.seen.add(self.capture_field)
+                self.capture_field = None
+                self.buffer = []
+
+
+    def handle_data(self, data):
+        if self.capture_field:
+            self.buffer.append(data)
+
+        if self.textless_depth:
+            return
+        text = self.text_tail + data.lower()
+        if AVAILABLE_TEXT in text:
+            self.fields['is_available'] = True
+        elif UNAVAILABLE_TEXT in text:
+            self.saw_unavailable = True
+        self.text_tail = text[-len(UNAVAILABLE_TEXT):]
+
+
+    def start_capture(self, field: str, tag: str) -> None:
+        self.capture_field = field
+        self.capture_tag = tag
+        self.capture_depth = 1
+        self.buffer = []
+
+
+    def parse(self, content: bytes) -> Dict[str, Any]:
+        """Feed the page in chunks until every field is found or the page ends."""
+        markup = content.decode('utf-8', errors='replace')
+        for start in range(0, len(markup), STREAM_CHUNK_SIZE):
+            self.feed(markup[start:start + STREAM_CHUNK_SIZE])
+            if self.done:
+                break
+        else:
+            self.close()
+
+        if self.fields['is_available'] is None and self.saw_unavailable:
+            self.fields['is_available'] = False
+        return self.fields
+
+
+def extract_with_selectolax(content: bytes) -> Dict[str, Any]:
+    """Extract the product fields with selectolax's CSS engine."""
+    tree = SelectolaxParser(content)
+
+    def node_text(node):
+        if node is None:
+            return None
+        return node.text().strip() or None
+
+    image_url = None
+    image_container = tree.css_first(f'div.{IMAGE_CONTAINER_CLASS}')
+    if image_container is not None:
+        img_tag = image_container.css_first('img')
+        if img_tag is not None:
+            image_url = img_tag.attributes.get('src') or None
+
+    tree.strip_tags(list(TEXTLESS_TAGS))
+    page_text = tree.root.text().lower() if tree.root is not None else ''
+    if AVAILABLE_TEXT in page_text:
+        availability = True
+    elif UNAVAILABLE_TEXT in page_text:
+        availability = False
+    else:
+        availability = None
+
+    return {
+        'product_name': node_text(tree.css_first(f'h1.{NAME_CLASS}')),
+        'price': node_text(tree.css_first(f'div[class="{PRICE_CLASS}"]')),
+        'img_url': image_url,
+        'is_available': availability
+    }
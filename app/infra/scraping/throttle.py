@@ -0,0 +1,192 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict
+
+from app.infra.log_service import logger
+
+
+class TokenBucket:
+    """Token bucket whose refill rate backs off when the host throttles us and recovers on success."""
+    def __init__(self, rate: float, capacity: int, min_rate: float):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+    def acquire(self) -> None:
+        """Take a token, waiting only as long as the current rate requires."""
+        while True:
+            with self.lock:
+                self.refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+    def slow_down(self) -> None:
+        """Halve the rate after a throttling response."""
+        with self.lock:
+            self.refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+
+
+    def speed_up(self) -> None:
+        """Recover the rate gradually after a successful response."""
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.refill()
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single host.
+    Opens after consecutive failures (or on Retry-After) and rejects requests until the reset time,
+    then lets a single trial request through before closing again.
+    """
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_until = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self.lock:
+            if not self.opened_until:
+                return True
+            if time.monotonic() < self.opened_until or self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+            return True
+
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a request through again."""
+        with self.lock:
+            return max(0.0, self.opened_until - time.monotonic())
+
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_until = 0.0
+            self.trial_in_flight = False
+
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.opened_until or self.failures >= self.failure_threshold:
+                self.opened_until = time.monotonic() + self.reset_timeout
+
+
+    def open_for(self, seconds: float) -> None:
+        """Open the circuit for at least the given number of seconds, e.g. from a Retry-After header."""
+        with self.lock:
+            self.trial_in_flight = False
+            self.opened_until = max(self.opened_until, time.monotonic() + seconds)
+
+
+class HostThrottle:
+    """Per-host registry of rate limiters and circuit breakers shared by every scraper in the process."""
+    def __init__(
+        self, rate: float = 2.0, burst: int = 4, min_rate: float = 0.1,
+        failure_threshold: int = 5, reset_timeout: float = 60.0
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.lock = threading.Lock()
+
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst, self.min_rate)
+            return self.buckets[host]
+
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[host]
+
+
+    def record_success(self, host: str) -> None:
+        self.breaker(host).record_success()
+        self.bucket(host).speed_up()
+
+
+    def record_failure(self, host: str) -> None:
+        self.breaker(host).record_failure()
+
+
+    def record_throttled(self, host: str, retry_after: float | None) -> float:
+        """
+        Back off after a 429/503 response.
+        Returns:
+            Seconds to wait before the host should be contacted again
+        """
+        self.bucket(host).slow_down()
+        breaker = self.breaker(host)
+        if retry_after is not None:
+            logger.warning(f"{host} asked us to retry after {retry_after:.0f} seconds")
+            breaker.open_for(retry_after)
+        else:
+            breaker.record_failure()
+        return max(retry_after or 0.0, 1 / self.bucket(host).rate)
+
+
+    @staticmethod
+    def parse_retry_after(value: str | None) -> float | None:
+        """Parse a Retry-After header given either in seconds or as an HTTP date."""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+shared_throttle: HostThrottle | None = None
+shared_throttle_lock = threading.Lock()
+
+
+def get_shared_throttle(**config) -> HostThrottle:
+    """Return the process-wide HostThrottle, creating it with the given config on first use."""
+    global shared_throttle
+    with shared_throttle_lock:
+        if shared_throttle is None:
+            shared_throttle = HostThrottle(**config)
+        return shared_throttle
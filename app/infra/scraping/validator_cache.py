@@ -0,0 +1,134 @@
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+import requests
+
+from app.infra.log_service import logger
+
+
+class ValidatorCache:
+    """
+    Per-URL cache of HTTP validators (ETag / Last-Modified) used to make conditional requests.
+    Entries are evicted least-recently-used first and optionally persisted to a JSON file.
+    Validators of a fetched page can be held back until the caller has stored what it parsed from it,
+    so a page is never reported unchanged against data that was not saved.
+    """
+    def __init__(self, path: str | None = None, max_entries: int = 5000, flush_every: int = 50):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.flush_every = max(1, flush_every)
+        self.entries: OrderedDict[str, Dict[str, str]] = OrderedDict()
+        self.held: OrderedDict[str, Dict[str, str | None]] = OrderedDict()
+        self.pending_writes = 0
+        self.lock = threading.Lock()
+
+        if self.path:
+            self.load()
+            atexit.register(self.save)
+
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for a URL, if validators are cached."""
+        with self.lock:
+            validators = self.entries.get(url)
+            if not validators:
+                return {}
+            self.entries.move_to_end(url)
+
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+
+    @staticmethod
+    def validators_from(response: requests.Response) -> Dict[str, str | None]:
+        return {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """Record the validators from a full (200) response, dropping the entry if it has none."""
+        self.store_validators(url, self.validators_from(response))
+
+
+    def store_validators(self, url: str, validators: Dict[str, str | None]) -> None:
+        etag = validators.get("etag")
+        last_modified = validators.get("last_modified")
+
+        with self.lock:
+            if not etag and not last_modified:
+                if self.entries.pop(url, None) is None:
+                    return
+            else:
+                self.entries[url] = {"etag": etag, "last_modified": last_modified}
+                self.entries.move_to_end(url)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+
+            self.pending_writes += 1
+            should_flush = self.pending_writes >= self.flush_every
+
+        if should_flush:
+            self.save()
+
+
+    def hold(self, url: str, response: requests.Response) -> None:
+        """Keep the validators of a full (200) response aside until confirm is called for the URL."""
+        with self.lock:
+            self.held[url] = self.validators_from(response)
+            self.held.move_to_end(url)
+            while len(self.held) > self.max_entries:
+                self.held.popitem(last=False)
+
+
+    def confirm(self, url: str) -> None:
+        """Start using the held validators of a URL, once the data parsed from its page has been stored."""
+        with self.lock:
+            validators = self.held.pop(url, None)
+        if validators is not None:
+            self.store_validators(url, validators)
+
+
+    def load(self) -> None:
+        """Load persisted validators from disk, ignoring a missing or unreadable file."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as cache_file:
+                entries = json.load(cache_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load validator cache from {self.path}: {e}")
+            return
+
+        with self.lock:
+            self.entries = OrderedDict(list(entries.items())[-self.max_entries:])
+        logger.info(f"Loaded {len(self.entries)} cached validators")
+
+
+    def save(self) -> None:
+        """Persist validators to disk atomically."""
+        if not self.path:
+            return
+
+        with self.lock:
+            if not self.pending_writes:
+                return
+            snapshot = dict(self.entries)
+            self.pending_writes = 0
+
+        temp_path = f"{self.path}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(snapshot, cache_file)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save validator cache to {self.path}: {e}")
@@ -1,7 +1,9 @@
 from datetime import datetime, timezone, timedelta, date
 from typing import List
 
-from app.domain.price_logs.services.notification_service.tasks import send_price_email_notification
+from app.domain.price_logs.services.notification_service.tasks import (
+    send_price_email_notification, send_price_email_batch
+)
 from app.domain.products.services.notification_service.tasks import send_product_email_notification
 from app.domain.subscribers.services.notification_service.tasks import send_subscription_email_notification
 
@@ -11,19 +13,17 @@ from app.infra.services.monitoring.schemas import TaskStatus, MergedTaskRecord
 from app.shared.exceptions import NotFailedTaskError, DocNotFoundError
 from app.shared.serializer import Serializer
 
-now = datetime.now(timezone.utc)
-
-
 TASK_MAP = {
     "send_product_email_notification": send_product_email_notification,
     "send_price_email_notification": send_price_email_notification,
+    "send_price_email_batch": send_price_email_batch,
     "send_subscription_email_notification": send_subscription_email_notification,
 
 }
 class TaskMonitoringService:
     def __init__(self):
         """Service for monitoring and managing Celery task results."""
-        self.db = TaskAdapter()
+        self.db = TaskAdapter.instance()
         self.serializer = Serializer()
 
     def get_task_detail(self, task_id: str) -> MergedTaskRecord:
@@ -120,6 +120,7 @@ class TaskMonitoringService:
         kwargs = task.get('kwargs', {})
         retry_result = func.apply_async(kwargs=kwargs)
 
+        now = datetime.now(timezone.utc)
         self.db.insert_task_audit({
             "task_id": retry_result.id,
             "retry_of": task_id,
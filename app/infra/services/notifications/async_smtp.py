@@ -0,0 +1,248 @@
+import asyncio
+import atexit
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+
+import aiosmtplib
+
+from app.infra.config import settings
+from app.infra.log_service import logger
+
+RECONNECT_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, aiosmtplib.SMTPTimeoutError,
+    ConnectionError, OSError
+)
+REJECTED_ERRORS = (
+    aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPRecipientRefused, aiosmtplib.SMTPSenderRefused,
+    aiosmtplib.SMTPDataError
+)
+
+
+class AsyncConnection:
+    """An authenticated aiosmtplib session and how much it has been used."""
+    def __init__(self, smtp: aiosmtplib.SMTP):
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+    async def close(self) -> None:
+        try:
+            await self.smtp.quit()
+        except Exception:
+            self.smtp.close()
+
+
+class AsyncSMTPSender:
+    """
+    Sends messages over several SMTP sessions at once from an event loop running in a background thread,
+    so a synchronous Celery task can hand over a whole batch and wait for it.
+    At most max_in_flight sessions are open, each carrying one message at a time; sessions are kept
+    between batches and recycled after max_messages messages or when the server drops them.
+    """
+    def __init__(
+        self, server: str, port: int, username: str, password: str, use_tls: bool = True,
+        use_ssl: bool = False, max_in_flight: int = 10, max_messages: int = 100,
+        max_idle_seconds: float = 60.0, timeout: float = 30.0
+    ):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_messages = max(1, max_messages)
+        self.max_idle_seconds = max_idle_seconds
+        self.timeout = timeout
+        self.idle: List[AsyncConnection] = []
+        self.slots: asyncio.Semaphore | None = None
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="smtp-sender", daemon=True)
+        self.thread.start()
+
+
+    async def connect(self) -> AsyncConnection:
+        """Open a new SMTP session, upgrade it to TLS if configured and log in."""
+        smtp = aiosmtplib.SMTP(
+            hostname=self.server, port=self.port, use_tls=self.use_ssl,
+            start_tls=self.use_tls and not self.use_ssl, timeout=self.timeout
+        )
+        await smtp.connect()
+        await smtp.login(self.username, self.password)
+        logger.info(f"Opened async SMTP connection to {self.server}")
+        return AsyncConnection(smtp)
+
+
+    async def is_usable(self, connection: AsyncConnection) -> bool:
+        """Whether an idle session can be reused, probing it with NOOP if it has been idle for a while."""
+        if not connection.smtp.is_connected or connection.messages_sent >= self.max_messages:
+            return False
+        if time.monotonic() - connection.last_used < self.max_idle_seconds:
+            return True
+        try:
+            return (await connection.smtp.noop()).code == 250
+        except RECONNECT_ERRORS + (aiosmtplib.SMTPException,):
+            return False
+
+
+    async def acquire(self) -> AsyncConnection:
+        """Take an idle session, or open a new one if none can be reused."""
+        while self.idle:
+            connection = self.idle.pop()
+            if await self.is_usable(connection):
+                return connection
+            await connection.close()
+        return await self.connect()
+
+
+    async def release(self, connection: AsyncConnection) -> None:
+        connection.last_used = time.monotonic()
+        if connection.messages_sent >= self.max_messages:
+            await connection.close()
+        else:
+            self.idle.append(connection)
+
+
+    async def drain(
+        self, sender: str, pending: asyncio.Queue, outcomes: Dict[str, str | None], unsent: List[str]
+    ) -> None:
+        """
+        Send queued messages one after another over a single session until the queue is empty.
+        A message is taken off the queue before the session is opened, since other workers may empty
+        the queue while this one connects. A message whose session was lost is queued again once.
+        If no session can be opened, because the server is unreachable or refuses the login,
+        the message goes back on the queue and this worker stops, leaving the rest to the others
+        or to be reported unsent.
+        """
+        async with self.slots:
+            connection = None
+            try:
+                while True:
+                    try:
+                        recipient, message, attempts = pending.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+
+                    if connection is None:
+                        try:
+                            connection = await self.acquire()
+                        except RECONNECT_ERRORS as e:
+                            pending.put_nowait((recipient, message, attempts))
+                            logger.warning(f"Could not reach SMTP server: {e}")
+                            return
+                        except aiosmtplib.SMTPException as e:
+                            pending.put_nowait((recipient, message, attempts))
+                            logger.error(f"SMTP server refused the session: {e}")
+                            return
+
+                    try:
+                        await connection.smtp.sendmail(sender, [recipient], message)
+                        connection.messages_sent += 1
+                        outcomes[recipient] = None
+                    except REJECTED_ERRORS as e:
+                        outcomes[recipient] = str(e)
+                    except RECONNECT_ERRORS + (aiosmtplib.SMTPException,) as e:
+                        connection.smtp.close()
+                        connection = None
+                        if attempts:
+                            unsent.append(recipient)
+                        else:
+                            pending.put_nowait((recipient, message, attempts + 1))
+                        logger.warning(f"SMTP connection lost, reconnecting: {e}")
+
+                    if connection is not None and connection.messages_sent >= self.max_messages:
+                        await self.release(connection)
+                        connection = None
+            finally:
+                if connection is not None:
+                    await self.release(connection)
+
+
+    async def send_batch(
+        self, sender: str, messages: Iterable[Tuple[str, str]]
+    ) -> Tuple[Dict[str, str | None], List[str]]:
+        """Send a batch with up to max_in_flight messages in flight. Runs on the sender's event loop."""
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.max_in_flight)
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for recipient, message in messages:
+            pending.put_nowait((recipient, message, 0))
+
+        outcomes: Dict[str, str | None] = {}
+        unsent: List[str] = []
+        workers = min(self.max_in_flight, pending.qsize())
+        await asyncio.gather(*(self.drain(sender, pending, outcomes, unsent) for _ in range(workers)))
+
+        while not pending.empty():
+            unsent.append(pending.get_nowait()[0])
+        if unsent:
+            logger.error(f"{len(unsent)} messages left unsent")
+        return outcomes, unsent
+
+
+    def send_many(self, sender: str, messages: Iterable[Tuple[str, str]]) -> Tuple[Dict[str, str | None], List[str]]:
+        """
+        Send many messages concurrently and wait for the batch to finish.
+        Args:
+            sender: Envelope sender.
+            messages: (recipient, message) pairs.
+        Returns:
+            Outcome per attempted recipient (None when sent, or the server's rejection),
+            and the recipients left unsent because the server could not be reached.
+        """
+        return asyncio.run_coroutine_threadsafe(self.send_batch(sender, list(messages)), self.loop).result()
+
+
+    def send(self, sender: str, recipient: str, message: str) -> None:
+        """Send a single message, raising if it was rejected or could not be delivered."""
+        outcomes, unsent = self.send_many(sender, [(recipient, message)])
+        if unsent:
+            raise ConnectionError(f"Could not reach SMTP server {self.server}")
+        if outcomes.get(recipient):
+            raise aiosmtplib.SMTPException(outcomes[recipient])
+
+
+    async def close_idle(self) -> None:
+        while self.idle:
+            await self.idle.pop().close()
+
+
+    def close(self) -> None:
+        """Close every idle session and stop the event loop."""
+        if self.loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.close_idle(), self.loop).result(timeout=self.timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=self.timeout)
+        self.loop.close()
+
+
+async_smtp_sender: AsyncSMTPSender | None = None
+async_smtp_sender_pid: int | None = None
+async_smtp_sender_lock = threading.Lock()
+
+
+def get_async_smtp_sender() -> AsyncSMTPSender:
+    """
+    Return this worker process's async SMTP sender, creating it on first use.
+    A forked worker gets its own sender, since the parent's event loop thread does not survive the fork.
+    """
+    global async_smtp_sender, async_smtp_sender_pid
+
+    with async_smtp_sender_lock:
+        if async_smtp_sender is not None and async_smtp_sender_pid == os.getpid():
+            return async_smtp_sender
+
+        async_smtp_sender = AsyncSMTPSender(
+            settings.MAIL_SERVER, settings.MAIL_PORT, settings.MAIL_USERNAME, settings.MAIL_PASSWORD,
+            use_tls=settings.MAIL_TLS, use_ssl=settings.MAIL_SSL, max_in_flight=settings.SMTP_MAX_IN_FLIGHT,
+            max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+            max_idle_seconds=settings.SMTP_MAX_IDLE_SECONDS
+        )
+        async_smtp_sender_pid = os.getpid()
+        atexit.register(async_smtp_sender.close)
+        return async_smtp_sender
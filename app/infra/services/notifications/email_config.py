@@ -1,8 +1,10 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Dict, Iterable, List, Tuple
 from app.shared.exceptions import EmailFailedError
 from app.infra.config import settings
+from app.infra.services.notifications.async_smtp import AsyncSMTPSender, get_async_smtp_sender
+from app.infra.services.notifications.smtp_pool import SMTPConnectionPool, get_smtp_pool
 
 class EmailService:
     def __init__(self):
@@ -15,9 +17,19 @@ class EmailService:
         self.use_ssl = settings.MAIL_SSL
 
 
-    def send_email(self, recipient: str, subject: str, body_html: str,
-                            body_text: str = None) -> bool:
-        """Send email_service to a recipient with a given subject and body."""
+    @staticmethod
+    def sender_backend() -> SMTPConnectionPool | AsyncSMTPSender:
+        """
+        Return the process's SMTP sender for the configured SMTP_SENDER_MODE: the blocking connection pool,
+        or the async sender that keeps several messages in flight at once.
+        """
+        if settings.SMTP_SENDER_MODE == "async":
+            return get_async_smtp_sender()
+        return get_smtp_pool()
+
+
+    def build_message(self, recipient: str, subject: str, body_html: str, body_text: str = None) -> str:
+        """Build the MIME message for one recipient."""
         message = MIMEMultipart("alternative")
         message["Subject"] = subject
         message["From"] = self.sender
@@ -27,13 +39,32 @@ class EmailService:
             message.attach(MIMEText(body_text, "plain"))
 
         message.attach(MIMEText(body_html, "html"))
+        return message.as_string()
+
+
+    def send_email(self, recipient: str, subject: str, body_html: str,
+                            body_text: str = None) -> bool:
+        """Send email_service to a recipient with a given subject and body."""
         try:
-            with smtplib.SMTP(self.server, self.port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.username, self.password)
-                server.sendmail(self.sender, recipient, message.as_string())
-                return True
+            self.sender_backend().send(self.sender, recipient, self.build_message(recipient, subject, body_html, body_text))
+            return True
 
         except Exception as e:
-            raise EmailFailedError(detail = str(e))
\ No newline at end of file
+            raise EmailFailedError(detail = str(e))
+
+
+    def send_emails(
+        self, emails: Iterable[Tuple[str, str, str, str | None]]
+    ) -> Tuple[Dict[str, str | None], List[str]]:
+        """
+        Send many emails over pooled SMTP sessions.
+        Args:
+            emails: (recipient, subject, body_html, body_text) tuples.
+        Returns:
+            Outcome per attempted recipient (None when sent, or the error), and the recipients left unsent.
+        """
+        messages = (
+            (recipient, self.build_message(recipient, subject, body_html, body_text))
+            for recipient, subject, body_html, body_text in emails
+        )
+        return self.sender_backend().send_many(self.sender, messages)
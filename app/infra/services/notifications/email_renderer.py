@@ -0,0 +1,77 @@
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template, select_autoescape
+from markupsafe import escape
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+NOTIFICATION_TYPES = ("subscription_confirmation", "unsubscribed_confirmation", "price_change", "product_removed")
+RECIPIENT_NAME = "{{recipient_name}}"
+
+
+class PersonalisedEmail:
+    """
+    An email rendered once for a whole batch, split around the recipient's name
+    so each message only needs the name joined back in.
+    """
+    def __init__(self, subject: str, html_body: str, text_body: str):
+        self.subject = subject
+        self.html_parts = html_body.split(RECIPIENT_NAME)
+        self.text_parts = text_body.split(RECIPIENT_NAME)
+
+
+    def for_recipient(self, name: str) -> Tuple[str, str, str]:
+        """Return the subject, HTML and text bodies addressed to one recipient."""
+        return self.subject, str(escape(name)).join(self.html_parts), name.join(self.text_parts)
+
+
+class EmailRenderer:
+    """
+    Compiles the HTML and text template of every notification type once per process.
+    HTML templates are autoescaped, and template files are not re-read when they change.
+    """
+    def __init__(self, template_dir: Path = TEMPLATE_DIR):
+        self.environment = Environment(
+            loader=FileSystemLoader(template_dir), autoescape=select_autoescape(["html"]),
+            undefined=StrictUndefined, auto_reload=False
+        )
+        self.templates: Dict[str, Tuple[Template, Template]] = {
+            notification: (
+                self.environment.get_template(f"{notification}.html"),
+                self.environment.get_template(f"{notification}.txt")
+            )
+            for notification in NOTIFICATION_TYPES
+        }
+
+
+    def render(self, notification: str, **context) -> Tuple[str, str]:
+        """
+        Render a notification's bodies.
+        Args:
+            notification: One of NOTIFICATION_TYPES.
+            context: Values for the template's fields.
+        Returns:
+            The HTML and text bodies.
+        """
+        html_template, text_template = self.templates[notification]
+        return html_template.render(**context), text_template.render(**context)
+
+
+    def render_personalised(self, notification: str, subject: str, **context) -> PersonalisedEmail:
+        """Render a notification once for many recipients, leaving their name to be filled in per message."""
+        html_body, text_body = self.render(notification, name=RECIPIENT_NAME, **context)
+        return PersonalisedEmail(subject, html_body, text_body)
+
+
+email_renderer: EmailRenderer | None = None
+email_renderer_lock = threading.Lock()
+
+
+def get_email_renderer() -> EmailRenderer:
+    """Return the process-wide renderer, compiling the templates on first use."""
+    global email_renderer
+    with email_renderer_lock:
+        if email_renderer is None:
+            email_renderer = EmailRenderer()
+        return email_renderer
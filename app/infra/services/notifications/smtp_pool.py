@@ -0,0 +1,236 @@
+import atexit
+import os
+import queue
+import smtplib
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from app.infra.config import settings
+from app.infra.log_service import logger
+
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, socket.timeout)
+REJECTED_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+class PooledConnection:
+    """An authenticated SMTP session and how much it has been used."""
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+    def close(self) -> None:
+        try:
+            self.smtp.quit()
+        except Exception:
+            self.smtp.close()
+
+
+class SMTPConnectionPool:
+    """
+    Pool of logged-in SMTP sessions kept open between messages.
+    Sessions are recycled after max_messages messages, checked with NOOP after max_idle_seconds
+    of inactivity, and replaced transparently when the server drops them.
+    """
+    def __init__(
+        self, server: str, port: int, username: str, password: str, use_tls: bool = True,
+        use_ssl: bool = False, size: int = 2, max_messages: int = 100, max_idle_seconds: float = 60.0,
+        timeout: float = 30.0
+    ):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.size = max(1, size)
+        self.max_messages = max(1, max_messages)
+        self.max_idle_seconds = max_idle_seconds
+        self.timeout = timeout
+        self.idle: queue.LifoQueue[PooledConnection] = queue.LifoQueue()
+        self.open_connections = 0
+        self.lock = threading.Lock()
+
+
+    def connect(self) -> PooledConnection:
+        """Open a new SMTP session, upgrade it to TLS if configured and log in."""
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(self.server, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+            if self.use_tls:
+                smtp.starttls()
+        smtp.login(self.username, self.password)
+        logger.info(f"Opened SMTP connection to {self.server}")
+        return PooledConnection(smtp)
+
+
+    def is_usable(self, connection: PooledConnection) -> bool:
+        """Whether an idle session can be reused, probing it with NOOP if it has been idle for a while."""
+        if connection.messages_sent >= self.max_messages:
+            return False
+        if time.monotonic() - connection.last_used < self.max_idle_seconds:
+            return True
+        try:
+            return connection.smtp.noop()[0] == 250
+        except RECONNECT_ERRORS + (smtplib.SMTPException,):
+            return False
+
+
+    def acquire(self) -> PooledConnection:
+        """Take an idle session, open a new one if the pool has room, or wait for one to be released."""
+        while True:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                with self.lock:
+                    can_open = self.open_connections < self.size
+                    if can_open:
+                        self.open_connections += 1
+                if can_open:
+                    try:
+                        return self.connect()
+                    except Exception:
+                        with self.lock:
+                            self.open_connections -= 1
+                        raise
+                try:
+                    connection = self.idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise ConnectionError(f"No SMTP connection to {self.server} became free within {self.timeout}s")
+
+            if self.is_usable(connection):
+                return connection
+            self.discard(connection)
+
+
+    def release(self, connection: PooledConnection) -> None:
+        connection.last_used = time.monotonic()
+        if connection.messages_sent >= self.max_messages:
+            self.discard(connection)
+        else:
+            self.idle.put(connection)
+
+
+    def discard(self, connection: PooledConnection) -> None:
+        connection.close()
+        with self.lock:
+            self.open_connections -= 1
+
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Borrow a session, discarding it instead of returning it if the server dropped it."""
+        connection = self.acquire()
+        try:
+            yield connection
+        except REJECTED_ERRORS:
+            self.release(connection)
+            raise
+        except RECONNECT_ERRORS:
+            self.discard(connection)
+            raise
+        except Exception:
+            self.release(connection)
+            raise
+        else:
+            self.release(connection)
+
+
+    def send(self, sender: str, recipient: str, message: str) -> None:
+        """Send a message over a pooled session, reconnecting once if the session turns out to be dead."""
+        for attempt in (1, 2):
+            try:
+                with self.connection() as connection:
+                    connection.smtp.sendmail(sender, recipient, message)
+                    connection.messages_sent += 1
+                    return
+            except REJECTED_ERRORS:
+                raise
+            except RECONNECT_ERRORS as e:
+                if attempt == 2:
+                    raise
+                logger.warning(f"SMTP connection lost, reconnecting: {e}")
+
+
+    def send_many(self, sender: str, messages: Iterable[Tuple[str, str]]) -> Tuple[Dict[str, str | None], List[str]]:
+        """
+        Send many messages back to back over as few sessions as possible.
+        Args:
+            sender: Envelope sender.
+            messages: (recipient, message) pairs.
+        Returns:
+            Outcome per attempted recipient (None when sent, or the server's rejection),
+            and the recipients left unsent because the server could not be reached or refused the session.
+        """
+        pending = list(messages)
+        outcomes: Dict[str, str | None] = {}
+        position = 0
+        failed_reconnects = 0
+
+        while position < len(pending):
+            try:
+                with self.connection() as connection:
+                    while position < len(pending):
+                        recipient, message = pending[position]
+                        try:
+                            connection.smtp.sendmail(sender, recipient, message)
+                            connection.messages_sent += 1
+                            outcomes[recipient] = None
+                        except REJECTED_ERRORS as e:
+                            outcomes[recipient] = str(e)
+                        position += 1
+                        failed_reconnects = 0
+                        if connection.messages_sent >= self.max_messages:
+                            break
+            except RECONNECT_ERRORS as e:
+                failed_reconnects += 1
+                if failed_reconnects > 1:
+                    logger.error(f"Could not reach SMTP server, {len(pending) - position} messages left unsent: {e}")
+                    break
+                logger.warning(f"SMTP connection lost, reconnecting: {e}")
+            except smtplib.SMTPException as e:
+                logger.error(f"SMTP server refused the session, {len(pending) - position} messages left unsent: {e}")
+                break
+
+        return outcomes, [recipient for recipient, _ in pending[position:]]
+
+
+    def close(self) -> None:
+        """Close every idle session."""
+        while True:
+            try:
+                self.discard(self.idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+smtp_pool: SMTPConnectionPool | None = None
+smtp_pool_pid: int | None = None
+smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """
+    Return this worker process's SMTP pool, creating it on first use.
+    A forked worker gets its own pool rather than sharing its parent's sockets.
+    """
+    global smtp_pool, smtp_pool_pid
+
+    with smtp_pool_lock:
+        if smtp_pool is not None and smtp_pool_pid == os.getpid():
+            return smtp_pool
+
+        smtp_pool = SMTPConnectionPool(
+            settings.MAIL_SERVER, settings.MAIL_PORT, settings.MAIL_USERNAME, settings.MAIL_PASSWORD,
+            use_tls=settings.MAIL_TLS, use_ssl=settings.MAIL_SSL, size=settings.SMTP_POOL_SIZE,
+            max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+            max_idle_seconds=settings.SMTP_MAX_IDLE_SECONDS
+        )
+        smtp_pool_pid = os.getpid()
+        atexit.register(smtp_pool.close)
+        return smtp_pool
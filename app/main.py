@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from pathlib import Path
 from dotenv import load_dotenv
 current_dir = Path(__file__).resolve().parent
@@ -12,7 +13,8 @@ from app.api import products, prices, subscription, tasks
 version = "v1"
 app = FastAPI(
     version = version,
-    title = "Kitchnspy"
+    title = "Kitchnspy",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(ExceptionMiddleware)
@@ -68,12 +68,30 @@ class FailedRequestError(KitchnSpyExceptions):
         self.display = "Failed HTTP request"
         self.log = f"Request failed: {attempt}/{tries}. DETAIL:{detail}"
 
+class CircuitOpenError(KitchnSpyExceptions):
+    def __init__(self, host: str, retry_in: float):
+        super().__init__()
+        self.display = "Retailer is temporarily unavailable. Please try again later"
+        self.log = f"Circuit open for {host}. Retrying in {retry_in:.0f}s"
+
+class InvalidDateRangeError(KitchnSpyExceptions):
+    def __init__(self, start: str, end: str):
+        super().__init__()
+        self.display = "Start date must be before end date"
+        self.log = f"Invalid date range requested: {start} to {end}"
+
 class ParsingError(KitchnSpyExceptions):
     def __init__(self, error: str, url: str):
         super().__init__()
         self.display = "Error parsing url"
         self.log = f"Error parsing {url}: Detail: {error}"
 
+class InvalidCursorError(KitchnSpyExceptions):
+    def __init__(self, token: str, detail: str):
+        super().__init__()
+        self.display = "Invalid pagination cursor"
+        self.log = f"Invalid pagination cursor {token}. Detail: {detail}"
+
 class URIConnectionError(KitchnSpyExceptions):
     def __init__(self):
         super().__init__()
@@ -1,5 +1,9 @@
 import re
 from datetime import datetime
+from typing import Any
+
+import orjson
+from bson import ObjectId
 
 class Serializer:
     def __init__(self):
@@ -26,3 +30,21 @@ class Serializer:
         """Convert _id field to string for each document in a list."""
         return [Serializer.json_serialize_doc(doc) for doc in documents if doc is not None]
 
+
+    @staticmethod
+    def encode_default(value: Any) -> str:
+        """Encode the BSON types orjson does not handle natively."""
+        if isinstance(value, ObjectId):
+            return str(value)
+        raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+    @staticmethod
+    def dumps(document: Any) -> bytes:
+        """
+        Encode a raw MongoDB document (or any JSON-like value) straight to JSON bytes.
+        Datetimes are written in ISO format and ObjectIds as strings, matching json_serialize_doc
+        without copying the document first.
+        """
+        return orjson.dumps(document, default=Serializer.encode_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
@@ -0,0 +1,64 @@
+"""
+Measure how many price change emails per second are rendered for a batch of subscribers.
+
+Run with `python -m tests.benchmarks.email_templates`. Compares rendering the template once per
+message with rendering it once per batch and only filling in each recipient's name, with and
+without building the MIME message that goes to the SMTP server.
+"""
+import argparse
+import time
+
+from app.infra.services.notifications.email_config import EmailService
+from app.infra.services.notifications.email_renderer import get_email_renderer
+from app.infra.services.notifications.email_templates import EmailTemplateService
+
+CHANGE = dict(
+    product_name="KitchenAid Artisan Stand Mixer 4.8L & Bowl", previous_price=449.0, new_price=399.0,
+    price_diff=50.0, change_type="Drop", date_checked="2024-03-13 09:30",
+    product_link="https://www.kitchenaid.co.uk/p/5KSM175"
+)
+
+
+def per_message(templates: EmailTemplateService, names: list[str]) -> None:
+    for name in names:
+        templates.render_price_change(**CHANGE).for_recipient(name)
+
+
+def per_batch(templates: EmailTemplateService, names: list[str]) -> None:
+    email = templates.render_price_change(**CHANGE)
+    for name in names:
+        email.for_recipient(name)
+
+
+def per_batch_with_mime(templates: EmailTemplateService, names: list[str]) -> None:
+    email = templates.render_price_change(**CHANGE)
+    for index, name in enumerate(names):
+        templates.email_service.build_message(f"subscriber{index}@example.com", *email.for_recipient(name))
+
+
+RENDERERS = {"per message": per_message, "per batch": per_batch, "per batch + MIME": per_batch_with_mime}
+
+
+def benchmark(render, templates: EmailTemplateService, names: list[str], rounds: int) -> float:
+    """Return messages rendered per second, after one untimed warm-up round."""
+    render(templates, names)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        render(templates, names)
+    return rounds * len(names) / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark price change email rendering.")
+    parser.add_argument("--recipients", type=int, default=1_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    get_email_renderer()
+    print(f"{'compile templates':>18}: {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+    templates = EmailTemplateService()
+    names = [f"Subscriber {index}" for index in range(args.recipients)]
+    for name, render in RENDERERS.items():
+        print(f"{name:>18}: {benchmark(render, templates, names, args.rounds):8.0f} messages/s")
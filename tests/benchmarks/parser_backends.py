@@ -0,0 +1,50 @@
+"""
+Measure how many product pages per second each parser backend extracts.
+
+Run with `python -m tests.benchmarks.parser_backends`. Each saved fixture is padded with
+filler markup to the size of a real product page before timing.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from app.infra.scraping.kitchenaid_scraper import Scraper, PARSER_BACKENDS
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "product_pages"
+FILLER = b'<div class="c-tile"><a href="/p/1"><span>Related product</span><span>&pound; 99.00</span></a></div>\n'
+
+
+def padded_pages(target_bytes: int) -> list[bytes]:
+    """Fixtures with filler inserted after <main> until each is about target_bytes long."""
+    pages = []
+    for path in sorted(FIXTURES.glob("*.html")):
+        content = path.read_bytes()
+        repeats = max(0, (target_bytes - len(content)) // len(FILLER))
+        head, marker, tail = content.partition(b"</main>")
+        pages.append(head + marker + FILLER * repeats + tail)
+    return pages
+
+
+def benchmark(backend: str, pages: list[bytes], rounds: int) -> float:
+    """Return pages parsed per second."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            Scraper.parse_page(page, backend)
+    return rounds * len(pages) / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the product page parser backends.")
+    parser.add_argument("--page-kb", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = padded_pages(args.page_kb * 1024)
+    for backend in PARSER_BACKENDS:
+        try:
+            Scraper.validate_parser(backend)
+        except ValueError as e:
+            print(f"{backend:>12}: skipped ({e})")
+            continue
+        print(f"{backend:>12}: {benchmark(backend, pages, args.rounds):8.1f} pages/s")
@@ -0,0 +1,73 @@
+"""
+Measure how many Mongo documents per second each response encoding turns into JSON bytes.
+
+Run with `python -m tests.benchmarks.serializer`. Compares the copy-and-convert path
+(json_serialize_docs, then the standard library's json), a plain dict returned from a route
+(jsonable_encoder, then ORJSONResponse) and Serializer.dumps on the raw documents.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+import orjson
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from app.shared.serializer import Serializer
+
+
+def price_logs(count: int) -> list[dict]:
+    """Price log documents shaped like the ones the history and export routes return."""
+    checked = datetime(2024, 1, 1)
+    product_id = str(ObjectId())
+    return [
+        {
+            "_id": ObjectId(),
+            "product_id": product_id,
+            "product_name": "KitchenAid Artisan Stand Mixer 4.8L & Bowl",
+            "price": 449.0 - index % 50,
+            "date_checked": checked + timedelta(hours=index),
+            "is_available": index % 7 != 0,
+        }
+        for index in range(count)
+    ]
+
+
+def stdlib_json(documents: list[dict]) -> bytes:
+    return json.dumps(Serializer.json_serialize_docs(documents)).encode()
+
+
+def route_dict(documents: list[dict]) -> bytes:
+    return orjson.dumps(jsonable_encoder(Serializer.json_serialize_docs(documents)))
+
+
+def orjson_dumps(documents: list[dict]) -> bytes:
+    return Serializer.dumps(documents)
+
+
+ENCODERS = {
+    "json_serialize_docs + json": stdlib_json,
+    "jsonable_encoder + orjson": route_dict,
+    "Serializer.dumps": orjson_dumps,
+}
+
+
+def benchmark(encoder, documents: list[dict], rounds: int) -> float:
+    """Return documents encoded per second, after one untimed warm-up round."""
+    encoder(documents)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        encoder(documents)
+    return rounds * len(documents) / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoding of Mongo documents.")
+    parser.add_argument("--documents", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    documents = price_logs(args.documents)
+    for name, encoder in ENCODERS.items():
+        print(f"{name:>26}: {benchmark(encoder, documents, args.rounds):12.0f} docs/s")
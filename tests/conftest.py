@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+# Settings are read at import time; give the required ones throwaway values when no .env is present.
+for name, value in {
+    "DB_URI": "mongodb://localhost:27017",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "MAIL_USERNAME": "kitchnspy",
+    "MAIL_PASSWORD": "secret",
+    "MAIL_FROM": "alerts@example.com",
+    "MAIL_PORT": "25",
+    "MAIL_SERVER": "localhost",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """Point the shared MongoClient at an in-memory mongomock database and start with fresh adapters."""
+    mongomock = pytest.importorskip("mongomock")
+    from app.infra.db import client
+    from app.infra.db.adapters.base_adapter import BaseAdapter
+
+    mongo_client = mongomock.MongoClient()
+    monkeypatch.setattr(client, "shared_client", mongo_client)
+    monkeypatch.setattr(client, "shared_client_pid", os.getpid())
+    monkeypatch.setattr(BaseAdapter, "registry", {})
+    monkeypatch.setattr(BaseAdapter, "indexes_checked", False)
+    return mongo_client[client.DB_NAME]
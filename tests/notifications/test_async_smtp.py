@@ -0,0 +1,163 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from app.infra.services.notifications.async_smtp import AsyncSMTPSender
+
+USERNAME = "kitchnspy"
+PASSWORD = "secret"
+SENDER = "alerts@kitchnspy.test"
+DELIVERY_SECONDS = 0.2
+
+
+class RecordingHandler:
+    """
+    Accepts every message after a short delay, except for recipients starting with 'rejected'.
+    Each new session waits for the next of connect_delays before answering EHLO.
+    """
+    def __init__(self, connect_delays=()):
+        self.connect_delays = list(connect_delays)
+        self.delivered = []
+        self.login_sessions = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        if self.connect_delays:
+            await asyncio.sleep(self.connect_delays.pop(0))
+        session.host_name = hostname
+        return responses
+
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("rejected"):
+            return "550 5.1.1 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+
+    async def handle_DATA(self, server, session, envelope):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(DELIVERY_SECONDS)
+        self.in_flight -= 1
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 OK"
+
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data):
+        self.login_sessions.add(id(session))
+        valid = auth_data.login == USERNAME.encode() and auth_data.password == PASSWORD.encode()
+        return AuthResult(success=valid, handled=False)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(handler: RecordingHandler) -> Controller:
+    controller = Controller(
+        handler, hostname="127.0.0.1", port=free_port(), authenticator=handler.authenticate,
+        auth_require_tls=False
+    )
+    controller.start()
+    return controller
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = start_server(handler)
+    yield controller, handler
+    controller.stop()
+
+
+def make_sender(port: int, password: str = PASSWORD, max_in_flight: int = 10) -> AsyncSMTPSender:
+    return AsyncSMTPSender(
+        "127.0.0.1", port, USERNAME, password, use_tls=False, max_in_flight=max_in_flight, timeout=5
+    )
+
+
+def test_sends_messages_concurrently(smtp_server):
+    controller, handler = smtp_server
+    sender = make_sender(controller.port, max_in_flight=5)
+    recipients = [f"subscriber{index}@kitchnspy.test" for index in range(20)]
+
+    started = time.perf_counter()
+    outcomes, unsent = sender.send_many(SENDER, [(recipient, "Subject: Price drop\n\nHi") for recipient in recipients])
+    elapsed = time.perf_counter() - started
+    sender.close()
+
+    assert outcomes == {recipient: None for recipient in recipients}
+    assert unsent == []
+    assert sorted(handler.delivered) == sorted(recipients)
+    assert handler.max_in_flight == 5
+    assert elapsed < len(recipients) * DELIVERY_SECONDS / 2
+
+
+def test_reports_rejected_recipients_without_retrying(smtp_server):
+    controller, handler = smtp_server
+    sender = make_sender(controller.port)
+    messages = [(recipient, "Subject: Price drop\n\nHi") for recipient in ("ok@kitchnspy.test", "rejected@kitchnspy.test")]
+
+    outcomes, unsent = sender.send_many(SENDER, messages)
+    sender.close()
+
+    assert outcomes["ok@kitchnspy.test"] is None
+    assert "No such user" in outcomes["rejected@kitchnspy.test"]
+    assert unsent == []
+    assert handler.delivered == ["ok@kitchnspy.test"]
+
+
+def test_slow_sessions_do_not_lose_the_batch_when_the_queue_runs_dry():
+    handler = RecordingHandler(connect_delays=[0, 1.0, 1.0])
+    controller = start_server(handler)
+    sender = make_sender(controller.port, max_in_flight=3)
+    recipients = [f"subscriber{index}@kitchnspy.test" for index in range(3)]
+
+    try:
+        outcomes, unsent = sender.send_many(
+            SENDER, [(recipient, "Subject: Price drop\n\nHi") for recipient in recipients]
+        )
+    finally:
+        sender.close()
+        controller.stop()
+
+    assert outcomes == {recipient: None for recipient in recipients}
+    assert unsent == []
+    assert sorted(handler.delivered) == sorted(recipients)
+
+
+def test_failed_login_leaves_recipients_unsent(smtp_server):
+    controller, handler = smtp_server
+    sender = make_sender(controller.port, password="wrong", max_in_flight=2)
+    recipients = [f"subscriber{index}@kitchnspy.test" for index in range(10)]
+
+    outcomes, unsent = sender.send_many(SENDER, [(recipient, "Subject: Price drop\n\nHi") for recipient in recipients])
+    sender.close()
+
+    assert outcomes == {}
+    assert sorted(unsent) == sorted(recipients)
+    assert handler.delivered == []
+    assert len(handler.login_sessions) == 2
+
+
+def test_unreachable_server_leaves_recipients_unsent():
+    sender = make_sender(free_port())
+    recipients = ["one@kitchnspy.test", "two@kitchnspy.test"]
+
+    outcomes, unsent = sender.send_many(SENDER, [(recipient, "Subject: Price drop\n\nHi") for recipient in recipients])
+    sender.close()
+
+    assert outcomes == {}
+    assert sorted(unsent) == sorted(recipients)
@@ -0,0 +1,74 @@
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from app.infra.services.notifications.email_templates import EmailTemplateService
+
+# Bodies produced by the f-string templates the Jinja2 ones replaced. The text body of the
+# unsubscribe email now title-cases the name like its HTML body, and a price drop reads "less".
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "emails"
+
+PRODUCT = "KitchenAid Artisan Stand Mixer"
+LINK = "https://www.kitchenaid.co.uk/p/5KSM175"
+PRICE_DROP = dict(
+    product_name=PRODUCT, previous_price=449.0, new_price=399.0, price_diff=50.0, change_type="Drop",
+    date_checked="2024-03-13 09:30", product_link=LINK
+)
+PRICE_RISE = dict(PRICE_DROP, previous_price=399.0, new_price=449.0, change_type="Rise")
+
+CASES = {
+    "subscription_confirmation": ("send_subscription_confirmation", dict(
+        product_name=PRODUCT, unsubscribe_link="https://kitchnspy.example/unsubscribe?id=1"
+    )),
+    "unsubscribed_confirmation": ("send_unsubscribed_confirmation", dict(
+        product_name=PRODUCT, subscription_link="https://kitchnspy.example/subscribe?id=1"
+    )),
+    "price_change_drop": ("send_price_change_notification", PRICE_DROP),
+    "price_change_rise": ("send_price_change_notification", PRICE_RISE),
+    "product_removed": ("send_product_removed_notification", dict(product_name=PRODUCT)),
+}
+
+
+def normalised(body: str) -> str:
+    """Collapse whitespace, since only the source indentation of the bodies changed."""
+    return " ".join(body.split())
+
+
+@pytest.fixture
+def templates():
+    service = EmailTemplateService()
+    service.email_service = mock.Mock()
+    return service
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_templates_render_the_previous_bodies(templates, case):
+    method, context = CASES[case]
+    getattr(templates, method)(to_email="ada@example.com", name="ada lovelace", **context)
+
+    _, subject, html_body, text_body = templates.email_service.send_email.call_args[0]
+    assert normalised(html_body) == normalised((FIXTURES / f"{case}.html").read_text(encoding="utf-8"))
+    assert normalised(text_body) == normalised((FIXTURES / f"{case}.txt").read_text(encoding="utf-8"))
+
+
+def test_price_drop_reads_less_and_rise_reads_more(templates):
+    assert "Change: £50.00 less" in templates.render_price_change(**PRICE_DROP).for_recipient("Ada")[1]
+    assert "Change: £50.00 more" in templates.render_price_change(**PRICE_RISE).for_recipient("Ada")[1]
+
+
+def test_batch_messages_match_single_messages(templates):
+    templates.send_price_change_notification(to_email="ada@example.com", name="ada lovelace", **PRICE_DROP)
+    single = templates.email_service.send_email.call_args[0]
+
+    templates.email_service.send_emails.side_effect = lambda emails: list(emails)
+    batch = templates.send_price_change_batch([{"to_email": "ada@example.com", "name": "ada lovelace"}], **PRICE_DROP)
+
+    assert batch == [single]
+
+
+def test_recipient_name_is_escaped_in_html_only(templates):
+    subject, html_body, text_body = templates.render_price_change(**PRICE_DROP).for_recipient("<b>Ada</b>")
+
+    assert "&lt;b&gt;Ada&lt;/b&gt;" in html_body
+    assert "<b>Ada</b>" in text_body
@@ -0,0 +1,73 @@
+from unittest import mock
+
+import pytest
+from bson import ObjectId
+
+from app.infra.config import settings
+
+
+@pytest.fixture
+def service(mongo, monkeypatch):
+    """A ProductService over mongomock with its notifier, cache and subscriber index mocked out."""
+    from app.domain.products.services.product_service import ProductService
+    from app.infra.cache.subscriber_index import SubscriberIndex
+    from app.infra.db.adapters.product_adapter import ProductAdapter
+    from app.shared.serializer import Serializer
+
+    monkeypatch.setattr(settings, "WRITE_BATCH_SIZE", 2)
+    monkeypatch.setattr(SubscriberIndex, "drop_product", mock.Mock())
+
+    service = ProductService.__new__(ProductService)
+    service.db = ProductAdapter.instance()
+    service.serializer = Serializer()
+    service.notifier = mock.Mock()
+    service.notified = []
+    service.notifier.send_product_removed_notifications.side_effect = service.notified.extend
+    service.cache = mock.Mock()
+    return service
+
+
+@pytest.fixture
+def product_id(service, mongo):
+    product = ObjectId()
+    mongo.products.insert_one({"_id": product, "product_name": "Mixer", "url": "https://example.com/mixer"})
+    service.db.price_logs.insert_many([{"product_id": product, "price": price} for price in (449.0, 399.0)])
+    mongo.subscribers.insert_many(
+        [
+            {"product_id": str(product), "email_address": f"{index}@example.com", "name": "ada", "product_name": "Mixer"}
+            for index in range(5)
+        ]
+        + [{"product_id": str(ObjectId()), "email_address": "other@example.com", "name": "alan", "product_name": "Kettle"}]
+    )
+    return str(product)
+
+
+def test_subscribers_are_notified_and_deleted_one_group_at_a_time(service, mongo, product_id):
+    with mock.patch.object(
+        service.db.subscribers, "delete_many", wraps=service.db.subscribers.delete_many
+    ) as delete_many:
+        service.delete_product(product_id)
+
+    assert [len(call.args[0]["_id"]["$in"]) for call in delete_many.call_args_list] == [2, 2, 1]
+    assert service.notifier.send_product_removed_notifications.call_count == 3
+    assert sorted(notification["to_email"] for notification in service.notified) == [
+        f"{index}@example.com" for index in range(5)
+    ]
+
+    assert mongo.products.count_documents({}) == 0
+    assert service.db.price_logs.count_documents({}) == 0
+    assert [subscriber["email_address"] for subscriber in mongo.subscribers.find()] == ["other@example.com"]
+    service.cache.invalidate.assert_called_once_with(product_id)
+
+
+def test_a_failed_group_stops_the_delete_before_the_product_goes(service, mongo, product_id):
+    notify = service.notifier.send_product_removed_notifications
+    notify.side_effect = [None, ConnectionError("Broker connection lost")]
+
+    with pytest.raises(ConnectionError):
+        service.delete_product(product_id)
+
+    assert mongo.products.count_documents({}) == 1
+    assert service.db.price_logs.count_documents({}) == 2
+    assert mongo.subscribers.count_documents({"product_id": product_id}) == 3
+    service.cache.invalidate.assert_not_called()
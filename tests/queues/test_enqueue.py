@@ -0,0 +1,98 @@
+import itertools
+from unittest import mock
+
+import pytest
+
+from app.infra.config import settings
+
+
+@pytest.fixture
+def enqueue(mongo, monkeypatch):
+    """The enqueue module with its task audits in mongomock, groups of three and no broker."""
+    from app.infra.db.adapters.task_adapter import TaskAdapter
+    from app.infra.queues import enqueue
+
+    monkeypatch.setattr(enqueue, "db", TaskAdapter.instance())
+    monkeypatch.setattr(settings, "WRITE_BATCH_SIZE", 3)
+    monkeypatch.setattr(enqueue.celery_app, "producer_or_acquire", mock.MagicMock())
+    return enqueue
+
+
+def published(task, fail_on: int | None = None) -> mock.Mock:
+    """Replace a task's apply_async with one that hands out sequential task IDs, failing on one call."""
+    task_ids = itertools.count(1)
+
+    def apply_async(kwargs, producer):
+        task_id = next(task_ids)
+        if task_id == fail_on:
+            raise ConnectionError("Broker connection lost")
+        return mock.Mock(id=f"task-{task_id}")
+
+    return mock.patch.object(task, "apply_async", side_effect=apply_async)
+
+
+def test_each_group_is_published_over_one_producer_and_audited_with_one_insert(enqueue, mongo):
+    task = enqueue.product_tasks.send_product_email_notification
+    jobs = [({"to_email": f"{index}@example.com"}, {"to_email": f"{index}@example.com"}) for index in range(7)]
+
+    with published(task) as apply_async, mock.patch.object(
+        enqueue.db.tasks, "insert_many", wraps=enqueue.db.tasks.insert_many
+    ) as insert_many:
+        task_ids = enqueue.enqueue_many(task, "product_removed", jobs)
+
+    assert task_ids == [f"task-{index}" for index in range(1, 8)]
+    assert apply_async.call_count == 7
+    assert enqueue.celery_app.producer_or_acquire.call_count == 3
+    assert [len(call.args[0]) for call in insert_many.call_args_list] == [3, 3, 1]
+
+    audits = list(mongo.task_audit.find({}, {"_id": 0, "task_id": 1, "status": 1, "payload": 1}))
+    assert [audit["task_id"] for audit in audits] == task_ids
+    assert {audit["status"] for audit in audits} == {"QUEUED"}
+    assert audits[4]["payload"] == {"to_email": "4@example.com"}
+
+
+def test_a_group_that_fails_to_publish_is_not_audited_as_queued(enqueue, mongo):
+    task = enqueue.product_tasks.send_product_email_notification
+    jobs = [({"to_email": f"{index}@example.com"}, {"to_email": f"{index}@example.com"}) for index in range(7)]
+
+    with published(task, fail_on=5), pytest.raises(ConnectionError):
+        enqueue.enqueue_many(task, "product_removed", jobs)
+
+    assert [audit["task_id"] for audit in mongo.task_audit.find({"status": "QUEUED"})] == ["task-1", "task-2", "task-3"]
+
+
+def test_price_change_batches_queue_one_task_per_batch(enqueue, mongo):
+    task = enqueue.price_tasks.send_price_email_batch
+    batches = [
+        [{"to_email": "ada@example.com", "name": "ada"}, {"to_email": "alan@example.com", "name": "alan"}],
+        [{"to_email": "grace@example.com", "name": "grace"}],
+    ]
+    change = dict(
+        product_name="Mixer", previous_price=449.0, new_price=399.0, price_diff=50.0, change_type="Drop",
+        date_checked="2024-03-13", product_link="https://www.kitchenaid.co.uk/p/5KSM175"
+    )
+
+    with published(task) as apply_async:
+        task_ids = enqueue.queue_price_change_batches(batches, **change)
+
+    assert task_ids == ["task-1", "task-2"]
+    assert [call.kwargs["kwargs"]["recipients"] for call in apply_async.call_args_list] == batches
+
+    audit = mongo.task_audit.find_one({"task_id": "task-1"})
+    assert audit["name"] == "price_change_batch"
+    assert audit["payload"]["recipients"] == ["ada@example.com", "alan@example.com"]
+    assert audit["payload"]["recipient_count"] == 2
+
+
+def test_product_removed_notifications_queue_one_task_per_subscriber(enqueue, mongo):
+    task = enqueue.product_tasks.send_product_email_notification
+    notifications = [
+        {"to_email": f"{index}@example.com", "name": "ada", "product_name": "Mixer"} for index in range(4)
+    ]
+
+    with published(task) as apply_async:
+        task_ids = enqueue.queue_product_removed_notifications(iter(notifications))
+
+    assert len(task_ids) == 4
+    assert apply_async.call_args_list[0].kwargs["kwargs"] == {"notification_type": "product_removed", **notifications[0]}
+    assert mongo.task_audit.count_documents({"name": "product_removed", "status": "QUEUED"}) == 4
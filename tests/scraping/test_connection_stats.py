@@ -0,0 +1,51 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.infra.scraping.kitchenaid_scraper import Scraper
+from app.infra.scraping.throttle import HostThrottle
+
+HOSTS = 6
+REQUESTS_PER_HOST = 3
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"<html><h1>Mixer</h1></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def servers():
+    started = []
+    for _ in range(HOSTS):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        started.append(server)
+    yield [f"http://127.0.0.1:{server.server_address[1]}/p" for server in started]
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+def test_connection_stats_keep_counts_of_evicted_pools(servers):
+    scraper = Scraper(throttle=HostThrottle())
+
+    for _ in range(REQUESTS_PER_HOST):
+        for url in servers:
+            scraper.session.get(url, timeout=5).raise_for_status()
+    stats = scraper.connection_stats()
+    scraper.close()
+
+    assert stats["requests"] == HOSTS * REQUESTS_PER_HOST
+    assert stats["connections_opened"] >= HOSTS
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from app.infra.scraping.kitchenaid_scraper import Scraper, PARSER_BACKENDS
+from app.infra.scraping.parsers import SelectolaxParser
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "product_pages"
+
+NAME = "KitchenAid Artisan Stand Mixer 4.8L & Bowl"
+PRICE = "£ 449.00"
+IMAGE = "https://www.kitchenaid.co.uk/images/5KSM175PS.jpg"
+
+EXPECTED = {
+    "available.html": {"product_name": NAME, "price": PRICE, "img_url": IMAGE, "is_available": True},
+    "unavailable.html": {"product_name": NAME, "price": PRICE, "img_url": IMAGE, "is_available": False},
+    "available_text_only.html": {"product_name": NAME, "price": PRICE, "img_url": IMAGE, "is_available": True},
+    "available_split_text.html": {"product_name": NAME, "price": PRICE, "img_url": IMAGE, "is_available": True},
+    "unavailable_button_available_text.html": {
+        "product_name": NAME, "price": PRICE, "img_url": IMAGE, "is_available": True
+    },
+    "missing_price.html": {"product_name": NAME, "price": None, "img_url": IMAGE, "is_available": None},
+    "no_fields.html": {"product_name": None, "price": None, "img_url": None, "is_available": None},
+}
+
+
+def available_backends():
+    backends = []
+    for backend in PARSER_BACKENDS:
+        try:
+            Scraper.validate_parser(backend)
+        except ValueError:
+            backends.append(pytest.param(backend, marks=pytest.mark.skip(reason=f"{backend} is not installed")))
+            continue
+        backends.append(backend)
+    return backends
+
+
+def test_every_fixture_has_expectations():
+    assert sorted(path.name for path in FIXTURES.glob("*.html")) == sorted(EXPECTED)
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("fixture", sorted(EXPECTED))
+def test_backend_extracts_expected_fields(backend, fixture):
+    content = (FIXTURES / fixture).read_bytes()
+    assert Scraper.parse_page(content, backend) == EXPECTED[fixture]
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("fixture", sorted(EXPECTED))
+def test_backend_matches_full_soup(backend, fixture):
+    content = (FIXTURES / fixture).read_bytes()
+    assert Scraper.parse_page(content, backend) == Scraper.parse_page(content, "html.parser")
+
+
+@pytest.mark.skipif(SelectolaxParser is None, reason="selectolax is not installed")
+def test_selectolax_ignores_script_text():
+    content = b"<html><head><script>var label = 'Add to cart';</script></head><body><p>Sold out</p></body></html>"
+    assert Scraper.parse_page(content, "selectolax")["is_available"] is None
@@ -0,0 +1,39 @@
+import json
+from datetime import datetime, timezone
+
+import orjson
+from bson import ObjectId
+
+from app.shared.serializer import Serializer
+
+DOCUMENTS = [
+    {
+        "_id": ObjectId("65f1c2a9e4b0a1b2c3d4e5f6"),
+        "product_id": "65f1c2a9e4b0a1b2c3d4e5f7",
+        "price": 449.0,
+        "date_checked": datetime(2024, 3, 13, 9, 30, 5, 123000),
+        "is_available": True,
+    },
+    {
+        "_id": ObjectId("65f1c2a9e4b0a1b2c3d4e5f8"),
+        "product_name": "KitchenAid Artisan Stand Mixer 4.8L & Bowl",
+        "subscribed_on": datetime(2024, 3, 13, 9, 30, tzinfo=timezone.utc),
+        "last_notified": None,
+        "tags": ["mixer", "artisan"],
+    },
+]
+
+
+def test_dumps_matches_json_serialize_doc():
+    for document in DOCUMENTS:
+        assert orjson.loads(Serializer.dumps(document)) == json.loads(json.dumps(Serializer.json_serialize_doc(document)))
+
+
+def test_dumps_matches_json_serialize_docs_for_a_list():
+    assert orjson.loads(Serializer.dumps(DOCUMENTS)) == json.loads(json.dumps(Serializer.json_serialize_docs(DOCUMENTS)))
+
+
+def test_dumps_writes_datetimes_in_iso_format():
+    encoded = orjson.loads(Serializer.dumps(DOCUMENTS[0]))
+    assert encoded["_id"] == "65f1c2a9e4b0a1b2c3d4e5f6"
+    assert encoded["date_checked"] == "2024-03-13T09:30:05.123000"